@@ -5,6 +5,12 @@ from pathlib import Path
 
 import pandas as pd
 
+try:
+    from kep.sidecar import load_sidecar
+except ImportError:
+    # kep package is not importable, dataframes are read from CSV files
+    load_sidecar = None
+
 FOLDER = Path(__file__).parents[2] / 'data' / 'processed' / 'latest'
 
 
@@ -39,6 +45,10 @@ def proxy(path):
 def get_dataframe(freq):
     """Read dataframe from local folder"""
     path = locate(freq)
+    # binary sidecar of CSV file is used if it is fresh, see kep.sidecar
+    df = load_sidecar(path) if load_sidecar else None
+    if df is not None:
+        return df
     filelike = proxy(path)
     return read_csv(filelike)
 
@@ -0,0 +1,12 @@
+"""Benchmarks on real interim CSV files.
+
+Run from *src* folder, for example:
+
+    python -m benchmarks.bench_header_matcher
+
+benchmarks.suite times all hot paths, saves results to JSON file and
+compares two runs:
+
+    python -m benchmarks.suite run
+    python -m benchmarks.suite compare old.json new.json
+"""
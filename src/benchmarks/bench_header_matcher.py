@@ -0,0 +1,56 @@
+"""Compare per-key regex loop and compiled HeaderMatcher in Row.get_varname().
+
+    python -m benchmarks.bench_header_matcher
+"""
+import re
+import time
+
+from kep.parsing_definition import DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT
+from kep.pipeline.parser.row_model import Row
+from kep.pipeline.reader.popper import text_to_list
+
+from benchmarks.corpus import interim_texts
+
+
+def per_key_loop(name, mapper):
+    """Former Row.get_varname() lookup: one regex search per mapper key."""
+    varnames = []
+    for k in mapper.keys():
+        if re.search(r"\b{}".format(k), name):
+            varnames.append(mapper[k])
+    return varnames
+
+
+def compiled(name, matcher):
+    return matcher.findall(name)
+
+
+def header_names():
+    names = []
+    for _, text in interim_texts():
+        names.extend(row[0] for row in text_to_list(text)
+                     if not Row(row).is_datarow())
+    return names
+
+
+def timeit(func, names, mappers):
+    start = time.perf_counter()
+    result = [func(name, m) for m in mappers for name in names]
+    return time.perf_counter() - start, result
+
+
+def main():
+    names = header_names()
+    mappers = [DEFINITION_DEFAULT.mapper] + \
+              [pdef.mapper for pdef in DEFINITIONS_BY_SEGMENT]
+    t_loop, expected = timeit(per_key_loop, names, mappers)
+    t_compiled, result = timeit(compiled, names, mappers)
+    assert result == expected, "Matcher results differ from per-key loop"
+    print(f"Header rows: {len(names)}, mappers: {len(mappers)}")
+    print(f"Per-key loop:     {t_loop:.3f} sec")
+    print(f"Compiled matcher: {t_compiled:.3f} sec")
+    print(f"Speedup: {t_loop / t_compiled:.1f}x")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
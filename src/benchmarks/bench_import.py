@@ -0,0 +1,64 @@
+"""Time imports of project modules in fresh interpreters.
+
+    python -m benchmarks.bench_import
+
+Each import runs in a new process, best of several runs is reported.
+Compiling parsing definitions from YAML is compared to compiling them
+from JSON snapshot, which is done on import.
+"""
+import subprocess
+import sys
+import time
+
+MODULES = ['kep.helper.path',
+           'kep.parsing_definition',
+           'kep.pipeline',
+           'kep.vintage',
+           'manage']
+REPEAT = 5
+
+
+def import_time(statement: str):
+    """Seconds to run *statement* in a new interpreter."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-W', 'ignore', '-c', statement],
+                   check=True)
+    return time.perf_counter() - start
+
+
+def best_import_time(module: str, repeat: int = REPEAT):
+    return min(import_time('import ' + module) for _ in range(repeat))
+
+
+def loaded_modules(module: str):
+    """Names of heavy modules loaded by import of *module*."""
+    statement = ("import sys, {}; print(' '.join(m for m in "
+                 "('pandas', 'yaml') if m in sys.modules))".format(module))
+    output = subprocess.run([sys.executable, '-W', 'ignore', '-c', statement],
+                            check=True, stdout=subprocess.PIPE,
+                            universal_newlines=True)
+    return output.stdout.strip() or '-'
+
+
+def definitions_time(use_snapshot: bool, repeat: int = REPEAT):
+    from kep.parsing_definition.parsing_definition import load_definitions
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load_definitions(use_snapshot=use_snapshot)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    print("Interpreter startup: {:.3f} sec".format(best_import_time('sys')))
+    for module in MODULES:
+        print("{:<24} {:.3f} sec, loads: {}".format(
+            module, best_import_time(module), loaded_modules(module)))
+    print("Parsing definitions: {:.1f} ms from YAML, {:.1f} ms from "
+          "snapshot".format(1000 * definitions_time(False),
+                            1000 * definitions_time(True)))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,53 @@
+"""Compare serial and concurrent evaluation of parsing jobs on latest
+interim CSV file.
+
+    python -m benchmarks.bench_parallel [max_workers]
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import sys
+import time
+
+from kep.parsing_definition import DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT
+from kep.pipeline.pipeline import extract_datapoints, yield_parsing_jobs
+
+from benchmarks.corpus import interim_files
+
+DEFINITIONS = DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT
+REPEAT = 5
+
+
+def best_time(func):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main(max_workers=4):
+    path = interim_files()[-1]
+    csv_text = path.read_text(encoding='utf-8')
+    n_jobs = len(list(yield_parsing_jobs(csv_text, *DEFINITIONS)))
+    print(f"File: {path}, {n_jobs} parsing jobs, "
+          f"{os.cpu_count()} CPU, {max_workers} workers")
+
+    def serial():
+        return extract_datapoints(csv_text, *DEFINITIONS)
+
+    t_serial, expected = best_time(serial)
+    print(f"{'serial:':<10} {t_serial:.3f} sec")
+    for title, pool in [('threads', ThreadPoolExecutor),
+                        ('processes', ProcessPoolExecutor)]:
+        with pool(max_workers) as executor:
+            # start workers before timing
+            list(executor.map(abs, range(max_workers)))
+            t, result = best_time(lambda: extract_datapoints(
+                csv_text, *DEFINITIONS, executor=executor))
+        assert list(result) == list(expected), "Datapoints differ"
+        print(f"{title + ':':<10} {t:.3f} sec, speedup {t_serial / t:.2f}x")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,65 @@
+"""Compare csv.reader based reading and streaming tab-split reader.
+
+    python -m benchmarks.bench_reader
+"""
+import time
+
+from kep.pipeline.reader.popper import (is_valid_row, yield_csv_rows,
+                                        text_to_list, stream_rows)
+
+from benchmarks.corpus import interim_files
+
+
+def csv_reader(path):
+    """Former text_to_list(): csv.reader over whole text, then filter."""
+    csv_text = path.read_text(encoding='utf-8')
+    return list(filter(is_valid_row, yield_csv_rows(csv_text)))
+
+
+def from_text(path):
+    return text_to_list(path.read_text(encoding='utf-8'))
+
+
+def from_file(path):
+    return list(stream_rows(path))
+
+
+def from_mmap(path):
+    return list(stream_rows(path, use_mmap=True))
+
+
+READERS = [("csv.reader and filter", csv_reader),
+           ("text_to_list()", from_text),
+           ("stream_rows()", from_file),
+           ("stream_rows(mmap)", from_mmap)]
+
+
+def timed(func, path):
+    start = time.perf_counter()
+    result = func(path)
+    return time.perf_counter() - start, result
+
+
+def main():
+    paths = interim_files()
+    times = dict.fromkeys([title for title, _ in READERS], 0)
+    n_rows = 0
+    # rows of one file are kept at a time, so that garbage collection
+    # does not slow down readers that run later
+    for path in paths:
+        expected = None
+        for title, func in READERS:
+            t, result = timed(func, path)
+            times[title] += t
+            if expected is None:
+                expected = result
+            assert result == expected, f"Rows differ from csv.reader: {path}"
+        n_rows += len(expected)
+    print(f"Files: {len(paths)}, rows: {n_rows}")
+    t_csv = times[READERS[0][0]]
+    for title, t in times.items():
+        print(f"{title + ':':<22} {t:.3f} sec, speedup {t_csv / t:.1f}x")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
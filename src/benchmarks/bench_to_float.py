@@ -0,0 +1,80 @@
+"""Compare per-cell to_float() and batch to_float_array() on table blocks.
+
+    python -m benchmarks.bench_to_float
+"""
+import time
+
+import numpy as np
+
+from kep.pipeline.parser.extract_tables import split_to_tables
+from kep.pipeline.parser.row_model import Row
+from kep.pipeline.parser import to_float as to_float_module
+from kep.pipeline.parser.to_float import to_float, to_float_array
+from kep.pipeline.reader.popper import text_to_list
+
+from benchmarks.corpus import interim_texts
+
+
+def per_cell(block):
+    converted = [to_float(text) for row in block for text in row]
+    return ([np.nan if x is None else x for x in converted],
+            [x is not None for x in converted])
+
+
+def batch(block):
+    values, defined = to_float_array(block)
+    return values.ravel(), defined.ravel()
+
+
+def rectangular(data):
+    width = max(map(len, data))
+    return [row + [''] * (width - len(row)) for row in data]
+
+
+def table_blocks():
+    """Data cells of every table as rectangular blocks of strings."""
+    blocks = []
+    for _, text in interim_texts():
+        for table in split_to_tables(text_to_list(text)):
+            blocks.append(rectangular([Row(row).data 
+                                       for row in table.datarows]))
+    return blocks
+
+
+def file_blocks():
+    """Data cells of every file as one rectangular block of strings."""
+    blocks = []
+    for _, text in interim_texts():
+        blocks.append(rectangular([Row(row).data 
+                                   for table in split_to_tables(text_to_list(text))
+                                   for row in table.datarows]))
+    return blocks
+
+
+def timeit(func, blocks):
+    start = time.perf_counter()
+    result = [func(block) for block in blocks]
+    return time.perf_counter() - start, result
+
+
+def compare(title, blocks):
+    t_loop, expected = timeit(per_cell, blocks)
+    # distinct cell texts are converted anew, as on first parse in a process
+    to_float_module._converted.clear()
+    t_batch, result = timeit(batch, blocks)
+    for (ev, ed), (rv, rd) in zip(expected, result):
+        assert ed == rd.tolist(), "Batch conversion differs from to_float()"
+        np.testing.assert_array_equal(ev, rv)
+    print(f"{title}: {len(blocks)}, cells: {sum(map(np.size, blocks))}")
+    print(f"    Per-cell to_float(): {t_loop:.3f} sec")
+    print(f"    to_float_array():    {t_batch:.3f} sec")
+    print(f"    Speedup: {t_loop / t_batch:.1f}x")
+
+
+def main():
+    compare("Blocks by table", table_blocks())
+    compare("Blocks by file", file_blocks())
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
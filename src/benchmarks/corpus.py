@@ -0,0 +1,13 @@
+"""Interim CSV files used as benchmark corpus."""
+from kep.helper.path import DataFolderBase
+
+
+def interim_files():
+    """Return sorted list of paths to all *data/interim/*/*/tab.csv* files."""
+    return sorted(DataFolderBase().interim_folder.glob('*/*/tab.csv'))
+
+
+def interim_texts():
+    """Yield (path, text) for every interim CSV file."""
+    for path in interim_files():
+        yield path, path.read_text(encoding='utf-8')
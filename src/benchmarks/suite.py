@@ -0,0 +1,292 @@
+"""Time hot paths of parsing on all interim CSV files.
+
+Run all benchmarks or some of them and save results to JSON file:
+
+    python -m benchmarks.suite run
+    python -m benchmarks.suite run --only text_to_list --only to_float
+
+Compare two runs, exit code is 1 if some benchmark is slower by more
+than threshold (10% by default):
+
+    python -m benchmarks.suite compare old.json new.json --threshold 0.1
+
+Best time of repeated runs is compared, it is least affected by other
+processes on the machine.
+"""
+import argparse
+import contextlib
+from datetime import datetime
+import io
+import json
+import os
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from kep.parsing_definition import DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT
+from kep.parsing_definition.checkpoints import ValidationError, verify
+from kep.pipeline import create_dataframe
+from kep.pipeline.parser import extract_tables
+from kep.pipeline.parser.extract_tables import split_to_tables
+from kep.pipeline.parser.header_cache import HeaderCache
+from kep.pipeline.parser.row_model import make_rows
+from kep.pipeline.parser.to_float import to_float
+from kep.pipeline.pipeline import extract_datapoints
+from kep.pipeline.reader.popper import text_to_list
+from kep.pipeline.reader.segmenter import Segmenter, boundary_lines
+from kep.vintage import Vintage
+
+from benchmarks.corpus import interim_texts
+
+RESULTS_FOLDER = Path(__file__).parent / 'results'
+REPEAT = 3
+THRESHOLD = 0.1
+
+
+class Corpus:
+    """Interim CSV files and intermediate parsing results for benchmarks.
+       Files that fail to parse are used only in stages before failure.
+    """
+
+    def __init__(self):
+        self.texts, self.dates = [], []
+        self.rows, self.jobs, self.tables = [], [], []
+        self.cells, self.datapoints, self.dataframes = [], [], []
+        lines = boundary_lines(DEFINITIONS_BY_SEGMENT)
+        for path, text in interim_texts():
+            self.texts.append(text)
+            rows = make_rows(text_to_list(text))
+            self.rows.append(rows)
+            try:
+                jobs = list(Segmenter(rows, lines).jobs(
+                    DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT))
+                datapoints = extract_datapoints(text, DEFINITION_DEFAULT,
+                                                DEFINITIONS_BY_SEGMENT)
+            except ValueError:
+                continue
+            self.dates.append((int(path.parent.parent.name),
+                               int(path.parent.name)))
+            self.jobs.extend(jobs)
+            for job_rows, pdef in jobs:
+                tables = list(split_to_tables(job_rows))
+                self.tables.append((tables, pdef))
+                self.cells.extend(cell for t in tables
+                                  for row in t.datarows for cell in row.data)
+            self.datapoints.append(datapoints)
+            self.dataframes.append({freq: create_dataframe(datapoints, freq)
+                                    for freq in 'aqm'})
+
+
+def bench_text_to_list(corpus):
+    for text in corpus.texts:
+        text_to_list(text)
+    return len(corpus.texts)
+
+
+def bench_segmentation(corpus):
+    lines = boundary_lines(DEFINITIONS_BY_SEGMENT)
+    for rows in corpus.rows:
+        segmenter = Segmenter(rows, lines)
+        try:
+            list(segmenter.jobs(DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT))
+        except ValueError:
+            pass
+    return len(corpus.rows)
+
+
+def bench_split_to_tables(corpus):
+    for rows, _ in corpus.jobs:
+        list(split_to_tables(rows))
+    return len(corpus.jobs)
+
+
+def bench_set_label(corpus):
+    # empty cache, so that every header line is resolved once
+    cache = HeaderCache()
+    n = 0
+    for tables, pdef in corpus.tables:
+        for table in tables:
+            table.header.set_label(pdef.mapper, pdef.units, cache=cache)
+            n += 1
+    return n
+
+
+def bench_to_float(corpus):
+    for text in corpus.cells:
+        to_float(text)
+    return len(corpus.cells)
+
+
+def bench_create_dataframe(corpus):
+    for datapoints in corpus.datapoints:
+        for freq in 'aqm':
+            create_dataframe(datapoints, freq)
+    return len(corpus.datapoints)
+
+
+def bench_verify(corpus):
+    for dfs in corpus.dataframes:
+        try:
+            verify(**dfs)
+        except ValidationError:
+            pass
+    return len(corpus.dataframes)
+
+
+def bench_vintage(corpus):
+    # no parsing results from earlier runs
+    extract_tables.HEADER_CACHE.clear()
+    for year, month in corpus.dates:
+        try:
+            Vintage(year, month, use_cache=False)
+        except ValidationError:
+            pass
+    return len(corpus.dates)
+
+
+BENCHMARKS = [('text_to_list', bench_text_to_list),
+              ('segmentation', bench_segmentation),
+              ('split_to_tables', bench_split_to_tables),
+              ('set_label', bench_set_label),
+              ('to_float', bench_to_float),
+              ('create_dataframe', bench_create_dataframe),
+              ('verify', bench_verify),
+              ('vintage', bench_vintage)]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                       cwd=str(Path(__file__).parent),
+                                       stderr=subprocess.DEVNULL,
+                                       universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine_info():
+    return dict(platform=platform.platform(),
+                machine=platform.machine(),
+                processor=platform.processor(),
+                cpu_count=os.cpu_count(),
+                python=platform.python_version(),
+                numpy=np.__version__,
+                pandas=pd.__version__,
+                commit=git_commit(),
+                date=datetime.now().isoformat(timespec='seconds'))
+
+
+def measure(func, corpus, repeat: int = REPEAT):
+    times = []
+    for _ in range(repeat):
+        # parsing messages are not part of benchmark output
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            items = func(corpus)
+            times.append(time.perf_counter() - start)
+    return dict(best=min(times), median=statistics.median(times),
+                times=times, items=items)
+
+
+def run(names=None, repeat: int = REPEAT):
+    """Return dictionary with machine info and times by benchmark name."""
+    selected = [(name, func) for name, func in BENCHMARKS
+                if not names or name in names]
+    unknown = set(names or []).difference(name for name, _ in BENCHMARKS)
+    if unknown:
+        raise ValueError("Unknown benchmarks: {}".format(sorted(unknown)))
+    with contextlib.redirect_stdout(io.StringIO()):
+        corpus = Corpus()
+    results = {}
+    for name, func in selected:
+        results[name] = measure(func, corpus, repeat)
+        print("{:<20}{:>10.4f} sec".format(name, results[name]['best']))
+    return dict(machine=machine_info(), repeat=repeat, results=results)
+
+
+def save(run_result, path=None):
+    if path is None:
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = RESULTS_FOLDER / '{}.json'.format(stamp)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(run_result, indent=2))
+    return path
+
+
+def load(path):
+    return json.loads(Path(path).read_text())
+
+
+def compare(old, new, threshold: float = THRESHOLD):
+    """Return list of (name, old_best, new_best, change, is_regression)
+       for benchmarks present in both *old* and *new* runs. Change is
+       relative, 0.25 means 25% slower. Change equal to *threshold* is
+       not a regression.
+    """
+    rows = []
+    for name, new_result in new['results'].items():
+        if name not in old['results']:
+            continue
+        old_best = old['results'][name]['best']
+        new_best = new_result['best']
+        change = new_best / old_best - 1
+        # compared without division, so that 1.1 / 1.0 - 1 > 0.1 does not
+        # count as regression
+        is_regression = new_best > old_best * (1 + threshold)
+        rows.append((name, old_best, new_best, change, is_regression))
+    return rows
+
+
+def format_comparison(rows, old, new):
+    lines = []
+    keys = ['machine', 'processor', 'cpu_count', 'python', 'numpy', 'pandas']
+    differ = [key for key in keys
+              if old['machine'].get(key) != new['machine'].get(key)]
+    if differ:
+        lines.append("Warning: runs are from different machines, "
+                     "differ in {}".format(', '.join(differ)))
+    lines.append("{:<20}{:>10}{:>10}{:>9}".format('benchmark', 'old', 'new',
+                                                   'change'))
+    for name, old_best, new_best, change, is_regression in rows:
+        lines.append("{:<20}{:>10.4f}{:>10.4f}{:>+8.1%}{}".format(
+            name, old_best, new_best, change,
+            '  REGRESSION' if is_regression else ''))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command')
+    run_parser = commands.add_parser('run', help='run benchmarks')
+    run_parser.add_argument('--only', action='append', metavar='NAME',
+                            choices=[name for name, _ in BENCHMARKS],
+                            help='run only this benchmark, can be repeated')
+    run_parser.add_argument('--repeat', type=int, default=REPEAT)
+    run_parser.add_argument('--output', help='path to JSON file')
+    compare_parser = commands.add_parser('compare', help='compare two runs')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        path = save(run(args.only, args.repeat), args.output)
+        print("Saved results to", path)
+        return 0
+    if args.command == 'compare':
+        old, new = load(args.old), load(args.new)
+        rows = compare(old, new, args.threshold)
+        print(format_comparison(rows, old, new))
+        return 1 if any(row[-1] for row in rows) else 0
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from benchmarks.suite import compare, main
+
+MACHINE = dict(machine='x86_64', processor='', cpu_count=4, python='3.6.5',
+               numpy='1.14.5', pandas='0.23.1')
+
+
+def make_run(**best):
+    results = {name: dict(best=value, median=value, times=[value], items=1)
+               for name, value in best.items()}
+    return dict(machine=MACHINE, repeat=1, results=results)
+
+
+def regressions(rows):
+    return {name: is_regression for name, *_, is_regression in rows}
+
+
+class Test_compare:
+
+    @pytest.mark.parametrize('new_best, expected', [(1.1, False),
+                                                    (0.5, False),
+                                                    (1.05, False),
+                                                    (1.11, True)])
+    def test_regression_is_change_above_threshold(self, new_best, expected):
+        rows = compare(make_run(vintage=1.0), make_run(vintage=new_best),
+                       threshold=0.1)
+        assert regressions(rows) == {'vintage': expected}
+
+    def test_change_is_relative(self):
+        [(name, old_best, new_best, change, _)] = compare(
+            make_run(vintage=2.0), make_run(vintage=2.5))
+        assert (name, old_best, new_best) == ('vintage', 2.0, 2.5)
+        assert change == pytest.approx(0.25)
+
+    def test_skips_benchmarks_missing_in_either_run(self):
+        rows = compare(make_run(vintage=1.0, verify=1.0),
+                       make_run(vintage=1.0, to_float=9.0))
+        assert [row[0] for row in rows] == ['vintage']
+
+
+class Test_main:
+
+    @pytest.fixture
+    def paths(self, tmp_path):
+        def write(name, run):
+            path = tmp_path / name
+            path.write_text(json.dumps(run))
+            return str(path)
+        return write
+
+    def test_compare_exits_with_1_on_regression(self, paths, capsys):
+        old = paths('old.json', make_run(vintage=1.0, verify=1.0))
+        new = paths('new.json', make_run(vintage=2.0, verify=1.0))
+        assert main(['compare', old, new]) == 1
+        assert 'REGRESSION' in capsys.readouterr().out
+
+    def test_compare_exits_with_0_without_regression(self, paths):
+        old = paths('old.json', make_run(vintage=1.0))
+        new = paths('new.json', make_run(vintage=1.1, verify=5.0))
+        assert main(['compare', old, new, '--threshold', '0.1']) == 0
+
+    def test_without_command_exits_with_2(self, capsys):
+        assert main([]) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
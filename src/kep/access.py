@@ -0,0 +1,110 @@
+"""Read processed dataframes.
+
+   Get all variables or some of them, optionally for a range of dates:
+
+       dfm = get_dataframe('m')
+       df = get_dataframe('m', labels=['CPI_rog', 'RUR_USD_eop'],
+                          start='2015-01', end='2017-12')
+
+   Dataframes are read from *latest* folder by default or from processed
+   folder for given year and month. A file is read once and kept in
+   memory until it changes on disk, later calls select columns and rows
+   from the kept dataframe. When *labels* are given, only these columns 
+   are read and kept, together with columns kept before.
+"""
+from collections import OrderedDict
+from pathlib import Path
+
+from kep.helper.path import DataFolderBase, ProcessedCSV
+from kep.sidecar import read_dataframe
+
+# number of dataframes kept in memory
+MAXSIZE = 16
+
+
+def locate(freq: str, year: int = None, month: int = None):
+    """Path to CSV file for *freq* in *latest* folder or in processed
+       folder for *year* and *month*."""
+    if year and month:
+        return ProcessedCSV(year, month).path(freq)
+    return DataFolderBase().latest / ProcessedCSV.make_filename(freq)
+
+
+class DataframeCache:
+    """Dataframes by file path, least recently used dropped over *maxsize*.
+
+       A dataframe is read again when size or modification time of its
+       file changes or when it lacks requested columns. .hits and .misses
+       count lookups.
+    """
+
+    def __init__(self, maxsize: int = MAXSIZE):
+        self.maxsize = maxsize
+        # (stamp, dataframe, has all columns of file) by path
+        self.frames = OrderedDict()
+        self.hits, self.misses = 0, 0
+
+    def get(self, path, labels=None):
+        """Return dataframe read from file at *path*, with *labels* 
+           columns found in file or with all columns if *labels* is None.
+           Returned dataframe may have more columns than *labels*.
+        """
+        path = Path(path)
+        stat = path.stat()
+        stamp = stat.st_mtime_ns, stat.st_size
+        cached_stamp, df, complete = self.frames.get(path, (None, None, False))
+        if cached_stamp == stamp and (complete or labels is not None and 
+                                      set(labels) <= set(df.columns)):
+            self.hits += 1
+            self.frames.move_to_end(path)
+            return df
+        self.misses += 1
+        if labels is not None and cached_stamp == stamp:
+            # keep columns read before for this file
+            labels = list(df.columns) + list(labels)
+        df = read_dataframe(path, labels)
+        self.frames[path] = stamp, df, labels is None
+        self.frames.move_to_end(path)
+        if len(self.frames) > self.maxsize:
+            self.frames.popitem(last=False)
+        return df
+
+    def clear(self):
+        self.frames.clear()
+        self.hits, self.misses = 0, 0
+
+
+DATAFRAMES = DataframeCache()
+
+
+def select(df, labels=None, start=None, end=None):
+    """Return copy of *df* with *labels* columns and rows between *start*
+       and *end* dates, inclusive. Dates can be partial, like '2017-05'.
+
+       Raises:
+           KeyError: if some of *labels* are not in *df*.
+    """
+    if labels is not None:
+        missing = [label for label in labels if label not in df.columns]
+        if missing:
+            raise KeyError("Labels not found: {}".format(missing))
+        df = df[list(labels)]
+    if start is not None or end is not None:
+        df = df.loc[start:end]
+    return df.copy()
+
+
+def get_dataframe(freq: str, labels=None, start=None, end=None,
+                  year: int = None, month: int = None):
+    """Return dataframe for *freq* with *labels* columns between *start*
+       and *end* dates. All columns and dates are returned by default.
+
+       Args:
+           freq - 'a', 'q' or 'm'
+           labels - list of column names, like ['GDP_yoy', 'CPI_rog']
+           start, end - dates as strings, like '2017' or '2017-05-31'
+           year, month - read processed dataframe for this date instead
+                         of latest one
+    """
+    df = DATAFRAMES.get(locate(freq, year, month), labels)
+    return select(df, labels, start, end)
@@ -0,0 +1,174 @@
+"""Re-parse many vintages in parallel.
+
+    summary = reparse()
+    print(summary)
+
+Vintages are processed in a pool of worker processes, largest interim
+CSV files first. Parsing definitions and parse cache are passed to
+workers once, on worker start. Workers started by spawn import parsing
+definitions from JSON snapshot and do not parse YAML. Each vintage is
+parsed, validated and saved same way as in sequential run:
+
+    Vintage(year, month).save()
+
+Saved vintages are added to store of all vintages once after the batch,
+see kep.revisions. To skip the store:
+
+    summary = reparse(revisions=False)
+
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import io
+import time
+
+from kep.helper.date import supported_dates
+from kep.helper.path import InterimCSV
+from kep.helper.timing import combine
+from kep.parsing_definition import DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT
+from kep.parsing_definition.checkpoints import ValidationError
+from kep.revisions import RevisionStore
+import kep.vintage
+from kep.vintage import Vintage
+
+OK, INVALID, ERROR = 'ok', 'invalid', 'error'
+
+Result = namedtuple('Result',
+                    'year month status message seconds output timings')
+# timings is report from kep.helper.timing, None if not recorded
+Result.__new__.__defaults__ = (None,)
+
+
+# parsing definitions of a worker process, set by init_worker()
+_DEFINITIONS = None
+
+
+def init_worker(definitions, cache=None):
+    global _DEFINITIONS
+    _DEFINITIONS = definitions
+    if cache is not None:
+        kep.vintage.PARSE_CACHE = cache
+
+
+def process(year: int, month: int, save: bool = True,
+            timings: bool = False):
+    """Parse, validate and save vintage for *year* and *month*.
+
+       Returns:
+           Result() with status OK, INVALID if validation failed or
+           ERROR if any other exception was raised. Result.timings is
+           time by parsing stage if *timings* is True and vintage was
+           parsed.
+    """
+    start = time.perf_counter()
+    status, message, report = OK, '', None
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            vintage = Vintage(year, month, _DEFINITIONS, timings=timings)
+            if timings:
+                report = vintage.timings.report()
+            if save:
+                # saved vintages are added to revision store by reparse()
+                vintage.save(revisions=False)
+        except ValidationError as e:
+            status, message = INVALID, str(e)
+        except Exception as e:
+            status, message = ERROR, repr(e)
+    return Result(year, month, status, message,
+                  time.perf_counter() - start, output.getvalue(), report)
+
+
+def file_size(year: int, month: int):
+    """Size of interim CSV file, 0 if file not found or date not supported."""
+    try:
+        path = InterimCSV(year, month).path
+    except ValueError:
+        return 0
+    return path.stat().st_size if path.exists() else 0
+
+
+def largest_first(dates):
+    """Sort *dates* by size of interim CSV file, largest first."""
+    return sorted(dates, key=lambda date: file_size(*date), reverse=True)
+
+
+class Summary:
+    """Results of batch re-parse, sorted by date."""
+
+    def __init__(self, results):
+        self.results = sorted(results, key=lambda r: (r.year, r.month))
+
+    def by_status(self, status: str):
+        return [r for r in self.results if r.status == status]
+
+    @property
+    def ok(self):
+        return self.by_status(OK)
+
+    @property
+    def invalid(self):
+        return self.by_status(INVALID)
+
+    @property
+    def errors(self):
+        return self.by_status(ERROR)
+
+    def timings(self):
+        """Time by parsing stage summed over all vintages."""
+        return combine(r.timings for r in self.results if r.timings)
+
+    def __str__(self):
+        lines = ["Vintages: {}, ok: {}, invalid: {}, errors: {}".format(
+                 len(self.results), len(self.ok), len(self.invalid),
+                 len(self.errors))]
+        for r in self.invalid + self.errors:
+            lines.append("{}-{:02d} {}: {}".format(r.year, r.month,
+                                                   r.status, r.message))
+        return '\n'.join(lines)
+
+
+def reparse(dates=None, max_workers=None, save=True, definitions=None,
+            timings=False, revisions=True, cache=None):
+    """Parse, validate and save vintages for *dates* in worker processes.
+
+       Args:
+           dates - list of (year, month) tuples, defaults to
+                   supported_dates()
+           max_workers - number of processes, defaults to number of CPUs
+           save - write processed CSV files if True
+           definitions - (definition_default, definitions_by_segment)
+                         tuple, defaults to DEFINITION_DEFAULT and
+                         DEFINITIONS_BY_SEGMENT
+           timings - record time by parsing stage for each vintage
+           revisions - add saved vintages to store of all vintages after
+                       all workers finish, so that workers do not wait
+                       for database lock
+           cache - kep.cache.ParseCache() used by workers, defaults to 
+                   kep.vintage.PARSE_CACHE
+
+       Returns:
+           Summary()
+    """
+    if dates is None:
+        dates = supported_dates()
+    definitions = definitions or (DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT)
+    cache = cache or kep.vintage.PARSE_CACHE
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=init_worker,
+                             initargs=(definitions, cache)) as executor:
+        futures = [executor.submit(process, year, month, save, timings)
+                   for year, month in largest_first(dates)]
+        results = [future.result() for future in futures]
+    if save and revisions:
+        store = RevisionStore()
+        for r in results:
+            if r.status == OK:
+                store.ingest(r.year, r.month)
+        store.close()
+    return Summary(results)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print(reparse())
@@ -0,0 +1,204 @@
+"""On-disk cache of parsing results.
+
+    cache = ParseCache()
+    datapoints = cache.parse(csv_text, definitions)
+    datapoints = cache.parse(InterimCSV(year, month).path, definitions)
+
+Parsing result for CSV text or file is stored in *data/cache* folder under
+a key made of CSV content hash and fingerprint of parsing definitions, units of
+measurement and source code of parser, label and matcher modules. Any
+change to definitions or parser code gives a new key, old entries are
+never read again and are evicted when cache grows over its size limit,
+least recently used first. Damaged entries are deleted on read.
+
+To delete all cached results:
+
+    ParseCache().purge()
+
+"""
+import hashlib
+import os
+from pathlib import Path, PurePath
+import zipfile
+
+import numpy as np
+
+from kep.helper.identity import IdentityCache
+from kep.helper.path import DataFolderBase, atomic_write, md
+from kep.helper.timing import stage
+from kep.parsing_definition.units import UNITS
+from kep.pipeline import create_parser
+from kep.pipeline.datapoints import Columns, Datapoints
+
+# default cache size limit, bytes
+MAX_BYTES = 100 * 2**20
+
+# block size to hash CSV file, bytes
+BLOCK_SIZE = 2**20
+
+PARSER_FOLDER = Path(__file__).parent / 'pipeline'
+# helper modules used by parsing definitions to match headers and units
+HELPER_MODULES = [Path(__file__).parent / 'helper' / name
+                  for name in ('label.py', 'matcher.py')]
+
+
+def sha256(text: str):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def content_hash(source):
+    """Hash of CSV text or of file at path *source*, file is read by blocks.
+       UTF-8 file with '\\n' line breaks has same hash as its text.
+    """
+    if not isinstance(source, PurePath):
+        return sha256(source)
+    sha = hashlib.sha256()
+    with open(str(source), 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def parser_source():
+    """Source code of parser and helper modules, joined in stable order."""
+    paths = sorted(p for p in PARSER_FOLDER.glob('**/*.py')
+                   if 'tests' not in p.parts)
+    paths += HELPER_MODULES
+    return ''.join(p.read_text(encoding='utf-8') for p in paths)
+
+
+def fingerprint(definitions, units=UNITS):
+    """Hash of parsing *definitions*, *units* and parser source code.
+
+       Args:
+           definitions - (definition_default, definitions_by_segment) tuple
+    """
+    default, by_segment = definitions
+    parts = [repr(default), repr(list(by_segment)), repr(list(units.items())),
+             parser_source()]
+    return sha256('\n'.join(parts))
+
+
+def remove(path):
+    """Delete file at *path*, unless it is deleted already."""
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class ParseCache:
+    """Parsing results stored as .npz files in *folder*."""
+
+    def __init__(self, folder=None, max_bytes: int = MAX_BYTES):
+        self.folder = Path(folder or DataFolderBase().cache_folder)
+        self.max_bytes = max_bytes
+        self.hits, self.misses = 0, 0
+        # definitions are not hashable, fingerprint is kept by object ids
+        self._fingerprint = IdentityCache(
+            lambda default, by_segment: fingerprint((default, by_segment)))
+
+    def key(self, source, definitions):
+        """Key for *source*, CSV text or path to CSV file."""
+        return sha256(content_hash(source) + self._fingerprint(*definitions))
+
+    def path(self, key: str):
+        return self.folder / '{}.npz'.format(key)
+
+    def load(self, key: str):
+        """Return Datapoints() stored under *key* or None."""
+        path = self.path(key)
+        try:
+            with np.load(str(path)) as npz:
+                labels = list(npz['labels'])
+                columns = Columns(*(npz[name] for name in Columns._fields))
+        except OSError:
+            return None
+        except (zipfile.BadZipFile, EOFError, KeyError, ValueError):
+            # damaged entry, result is parsed and saved again
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            return None
+        # mark as recently used, entry may be evicted by other process
+        # meanwhile
+        try:
+            os.utime(str(path))
+        except FileNotFoundError:
+            pass
+        return Datapoints.from_columns(labels, columns)
+
+    def save(self, key: str, datapoints):
+        md(self.folder)
+        columns = datapoints.columns
+        with atomic_write(self.path(key)) as f:
+            np.savez(f, labels=np.array(datapoints.labels, dtype=str),
+                     **columns._asdict())
+        self.evict()
+
+    def parse(self, source, definitions):
+        """Return Datapoints() for *source* from cache or parse and
+           store them.
+
+           Args:
+               source - CSV text or path to CSV file, file is streamed
+                        and not read to memory as whole
+               definitions - (definition_default, definitions_by_segment)
+        """
+        with stage('cache') as counter:
+            key = self.key(source, definitions)
+            datapoints = self.load(key)
+            if datapoints is not None:
+                counter.rows = len(datapoints)
+        if datapoints is not None:
+            self.hits += 1
+            return datapoints
+        self.misses += 1
+        datapoints = create_parser(*definitions)(source)
+        with stage('cache'):
+            self.save(key, datapoints)
+        return datapoints
+
+    def stats(self):
+        """(path, os.stat_result) pairs of cached files, least recently
+           used first. Files deleted meanwhile by other processes sharing
+           the folder are skipped.
+        """
+        if not self.folder.exists():
+            return []
+        result = []
+        for path in self.folder.glob('*.npz'):
+            try:
+                result.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        return sorted(result, key=lambda x: x[1].st_mtime)
+
+    def entries(self):
+        """Cached files, least recently used first."""
+        return [path for path, _ in self.stats()]
+
+    def size(self):
+        return sum(stat.st_size for _, stat in self.stats())
+
+    def evict(self):
+        """Delete least recently used entries until cache fits max_bytes."""
+        stats = self.stats()
+        total = sum(stat.st_size for _, stat in stats)
+        for path, stat in stats:
+            if total <= self.max_bytes:
+                break
+            total -= stat.st_size
+            remove(path)
+
+    def purge(self):
+        """Delete all cached entries."""
+        for path in self.entries():
+            remove(path)
+        for path in self.folder.glob('*.tmp'):
+            remove(path)
+
+    def __repr__(self):
+        return "ParseCache({!r}, max_bytes={})".format(str(self.folder),
+                                                       self.max_bytes)
@@ -0,0 +1,109 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+import threading
+
+import pytest
+
+import kep.vintage
+from kep.cache import ParseCache
+
+
+@pytest.fixture(scope="session", autouse=True)
+def parse_cache(tmp_path_factory):
+    """Keep parsing results of test runs out of data/cache folder."""
+    saved = kep.vintage.PARSE_CACHE
+    kep.vintage.PARSE_CACHE = ParseCache(tmp_path_factory.mktemp('cache'))
+    yield kep.vintage.PARSE_CACHE
+    kep.vintage.PARSE_CACHE = saved
+
+
+def make_etag(data):
+    return '"{}"'.format(hash(data))
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves server.files with Range and If-Range support, HEAD request
+       gets same status and headers as GET. Next responses for a path can
+       be replaced by server.failures[path] list of actions: 'drop' sends
+       half of file and closes connection, 'whole' sends whole file with
+       206 status, a number is an error status. Responds with 304 to
+       request with current ETag in If-None-Match header, unless
+       server.ignore_conditions is True.
+    """
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def respond(self, send_body):
+        server = self.server
+        server.log.append((self.path, self.headers.get('Range')))
+        data = server.files.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        etag = make_etag(data)
+        if self.headers.get('If-None-Match') == etag and \
+           not server.ignore_conditions:
+            self.send_response(304)
+            self.end_headers()
+            return
+        actions = server.failures.get(self.path)
+        action = actions.pop(0) if actions else None
+        if isinstance(action, int):
+            self.send_error(action)
+            return
+        start = 0
+        if_range = self.headers.get('If-Range')
+        if self.headers.get('Range') and if_range in (None, etag):
+            start = int(self.headers['Range'][len('bytes='):-1])
+            if action == 'whole':
+                start = 0
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header('Content-Range',
+                                 'bytes */{}'.format(len(data)))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {}-{}/{}'.format(
+                start, len(data) - 1, len(data)))
+        else:
+            self.send_response(200)
+        body = data[start:]
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not send_body:
+            return
+        if action == 'drop':
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def server():
+    """Local HTTP server with no files, see Handler. Requests are logged
+       as (path, Range header) in server.log."""
+    server = Server(('127.0.0.1', 0), Handler)
+    server.files, server.failures, server.log = {}, {}, []
+    server.ignore_conditions = False
+    server.etag = make_etag
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+    yield server
+    server.shutdown()
+    server.server_close()
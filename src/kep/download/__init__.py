@@ -1,2 +1,3 @@
 from .download import RemoteFile
 from .word import word2csv
+from .ooxml import docx2csv
@@ -1,20 +1,373 @@
-"""Download and unpack Word files from Rosstat web site."""
+"""Download and unpack Word files from Rosstat web site.
 
+   Archives for many months are downloaded concurrently:
+
+       manager = DownloadManager(max_workers=4)
+       results = manager.download_months([(2017, 1), (2017, 2)])
+
+   A file is written to *path.part* first and renamed to *path* when
+   complete. Download of existing *path.part* file is resumed with HTTP
+   Range request, its ETag or Last-Modified is sent in If-Range header,
+   so that a file changed on server is downloaded from start. Failed
+   requests are retried with exponential backoff.
+
+   Manifest() keeps ETag, Last-Modified, size and hash of downloaded
+   files, with a manifest files not modified on server are not
+   downloaded again:
+
+       RemoteFile(2018, 4).download()  # False if archive not modified
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
 import os
+from pathlib import Path
+import re
 import subprocess
+import threading
+import time
 import requests
 from datetime import date
 
-from kep.helper.path import UNPACK_RAR_EXE, LocalRarFile
+from kep.helper.path import (UNPACK_RAR_EXE, DataFolderBase, LocalRarFile,
+                             atomic_write)
+
+CHUNK_SIZE = 64 * 1024
+BUFFER_SIZE = 1024 * 1024
+TIMEOUT = 60
+RETRIES = 4
+BACKOFF = 1.0
+
+
+class IncompleteDownload(IOError):
+    pass
+
+
+def partial_path(path):
+    return '{}.part'.format(path)
+
+
+def validator_path(path):
+    """File with If-Range validator of *path.part* file."""
+    return '{}.part.validator'.format(path)
+
+
+def remove(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def is_transient(error):
+    """True for errors that a retry can fix: connection errors, timeouts,
+       incomplete files and server errors."""
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and \
+               error.response.status_code >= 500
+    return isinstance(error, (requests.RequestException, IncompleteDownload))
+
+
+def make_session(pool_size: int = 10):
+    """Session that keeps up to *pool_size* connections to a host."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size,
+                                            pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def total_size(response, offset: int):
+    """Expected file size from response headers or None if unknown."""
+    content_range = response.headers.get('Content-Range', '')
+    match = re.search(r'/(\d+)$', content_range)
+    if match:
+        return int(match.group(1))
+    length = response.headers.get('Content-Length')
+    if length is not None:
+        return offset + int(length)
+    return None
+
+
+def range_start(response):
+    """First byte position in Content-Range header or None."""
+    content_range = response.headers.get('Content-Range', '')
+    match = re.match(r'bytes (\d+)-', content_range)
+    return int(match.group(1)) if match else None
+
+
+def range_validator(response):
+    """Strong ETag or Last-Modified for If-Range header or None."""
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.headers.get('Last-Modified')
+
+
+def read_validator(path):
+    try:
+        with open(validator_path(path), encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_validator(path, validator):
+    if validator:
+        with open(validator_path(path), 'w', encoding='utf-8') as f:
+            f.write(validator)
+    else:
+        remove(validator_path(path))
+
+
+def fetch_once(session, url, path, timeout=TIMEOUT, conditions=None):
+    """Download *url* to *path*, resume from *path.part* if it exists.
+
+       Args:
+           conditions - If-None-Match and If-Modified-Since headers,
+                        not used when download is resumed
+
+       Returns:
+           response, its status is 304 if file was not modified and
+           nothing was written
 
+       Raises:
+           IncompleteDownload: if connection closed before end of file
+                               or partial file was discarded
+           requests.HTTPError: on error status
+    """
+    part = partial_path(path)
+    offset = os.path.getsize(part) if os.path.exists(part) else 0
+    validator = read_validator(path) if offset else None
+    if offset and not validator:
+        # partial file cannot be checked to be same version as remote
+        # file, so it is downloaded from start
+        offset = 0
+    # no compression, so that sizes in headers are sizes of file
+    headers = {'Accept-Encoding': 'identity'}
+    if offset:
+        headers['Range'] = 'bytes={}-'.format(offset)
+        # server sends whole file if it changed since partial download
+        headers['If-Range'] = validator
+    elif conditions:
+        headers.update(conditions)
+    with session.get(url, headers=headers, stream=True,
+                     timeout=timeout) as r:
+        if r.status_code == 304:
+            return r
+        if r.status_code == 416:
+            # partial file is complete or larger than remote file
+            if total_size(r, 0) != offset:
+                discard(path)
+                raise IncompleteDownload('Partial file discarded: ' + part)
+        else:
+            r.raise_for_status()
+            if r.status_code == 206:
+                if range_start(r) != offset:
+                    discard(path)
+                    raise IncompleteDownload(
+                        'Range does not start at {}: {}'.format(offset, url))
+            else:
+                # server sent whole file
+                offset = 0
+                write_validator(path, range_validator(r))
+            expected = total_size(r, offset)
+            mode = 'ab' if offset else 'wb'
+            with open(part, mode, buffering=BUFFER_SIZE) as f:
+                for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+            size = os.path.getsize(part)
+            if expected is not None and size != expected:
+                raise IncompleteDownload(
+                    '{} of {} bytes: {}'.format(size, expected, url))
+    os.replace(part, path)
+    remove(validator_path(path))
+    return r
 
-def download(url, path):
-    r = requests.get(url.strip(), stream=True)
-    with open(path, 'wb') as f:
-        for chunk in r.iter_content(chunk_size=1024):
-            # filter out keep-alive new chunks
-            if chunk:
-                f.write(chunk)
+
+def discard(path):
+    """Delete partial file of *path* and its validator."""
+    remove(partial_path(path))
+    remove(validator_path(path))
+
+
+def fetch(session, url, path, retries=RETRIES, backoff=BACKOFF,
+          timeout=TIMEOUT, sleep=time.sleep, conditions=None):
+    """Download *url* to *path* with *retries* after transient errors,
+       waiting *backoff*, 2 * *backoff*, 4 * *backoff*... seconds.
+       Returns response same as fetch_once().
+    """
+    for attempt in range(retries + 1):
+        try:
+            return fetch_once(session, url, path, timeout, conditions)
+        except (requests.RequestException, IncompleteDownload) as e:
+            if attempt == retries or not is_transient(e):
+                raise
+            sleep(backoff * 2 ** attempt)
+
+
+def file_hash(path):
+    sha = hashlib.sha256()
+    with open(str(path), 'rb') as f:
+        for block in iter(lambda: f.read(BUFFER_SIZE), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class Manifest:
+    """ETag, Last-Modified, size and content hash of downloaded files
+       by URL, kept in JSON file at *path*.
+
+       A request for a file listed in manifest is conditional, if local
+       file is same as downloaded.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or DataFolderBase().cache_folder /
+                         'downloads.json')
+        self.entries = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text(encoding='utf-8'))
+
+    def conditions(self, url, path):
+        """Conditional request headers for *url* or None if *path* is
+           missing or changed after download."""
+        entry = self.entries.get(url)
+        if not entry or not os.path.exists(path):
+            return None
+        if os.path.getsize(path) != entry['size'] or \
+           file_hash(path) != entry['sha256']:
+            return None
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers or None
+
+    def update(self, url, path, response):
+        """Record file at *path* downloaded from *url* with *response*,
+           return previous entry or None."""
+        entry = dict(etag=response.headers.get('ETag'),
+                     last_modified=response.headers.get('Last-Modified'),
+                     size=os.path.getsize(path),
+                     sha256=file_hash(path))
+        with self._lock:
+            previous = self.entries.get(url)
+            self.entries[url] = entry
+        return previous
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            with atomic_write(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=1)
+
+
+def fetch_if_changed(session, url, path, manifest, **kwargs):
+    """Download *url* to *path* unless it is not modified since download
+       recorded in *manifest*.
+
+       Returns:
+           True if file was downloaded, False if it was not modified or
+           downloaded file has same content as recorded in *manifest*
+    """
+    response = fetch(session, url, path,
+                     conditions=manifest.conditions(url, path), **kwargs)
+    if response.status_code == 304:
+        return False
+    previous = manifest.update(url, path, response)
+    # server may ignore conditional request and send same file again
+    return previous is None or \
+        previous['sha256'] != manifest.entries[url]['sha256']
+
+
+def download(url, path, manifest=None):
+    """Download *url* to *path*, if *manifest* is given, skip file not
+       modified since last download.
+
+       Returns:
+           True if file was downloaded, False if it was not modified
+           or has same content as before
+    """
+    with make_session(1) as session:
+        if manifest is None:
+            fetch(session, url.strip(), path)
+            return True
+        changed = fetch_if_changed(session, url.strip(), path, manifest)
+        manifest.save()
+        return changed
+
+
+# changed is False if file was not modified since last download
+Download = namedtuple('Download', 'year month path error changed')
+
+
+class DownloadManager:
+    """Download many files concurrently over one session. Files not
+       modified since download recorded in *manifest* are skipped.
+    """
+
+    def __init__(self, max_workers: int = 4, retries: int = RETRIES,
+                 backoff: float = BACKOFF, timeout: float = TIMEOUT,
+                 manifest=None):
+        self.max_workers = max_workers
+        self.retries, self.backoff, self.timeout = retries, backoff, timeout
+        self.manifest = manifest
+        self.session = make_session(max_workers)
+
+    def fetch(self, url, path):
+        """Download *url* to *path*, return True if file was downloaded,
+           False if it was not modified."""
+        kwargs = dict(retries=self.retries, backoff=self.backoff,
+                      timeout=self.timeout)
+        if self.manifest is None:
+            fetch(self.session, url, path, **kwargs)
+            return True
+        return fetch_if_changed(self.session, url, path, self.manifest,
+                                **kwargs)
+
+    def download_all(self, urls_and_paths):
+        """Download (url, path) pairs, return list of True for downloaded
+           file, False for file not modified or exception in same order.
+        """
+        def safe_fetch(pair):
+            try:
+                return self.fetch(*pair)
+            except (requests.RequestException, IncompleteDownload,
+                    OSError) as e:
+                return e
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(safe_fetch, urls_and_paths))
+        if self.manifest is not None:
+            self.manifest.save()
+        return results
+
+    def download_months(self, dates):
+        """Download archives for (year, month) *dates*.
+
+           Returns:
+               list of Download(year, month, path, error, changed),
+               error is None if there was no error
+        """
+        remote_files = [RemoteFile(year, month) for year, month in dates]
+        for remote_file in remote_files:
+            remote_file.check_date()
+        results = self.download_all([(f.url, f.path) for f in remote_files])
+        downloads = []
+        for f, result in zip(remote_files, results):
+            if isinstance(result, Exception):
+                downloads.append(Download(f.year, f.month, f.path, result,
+                                          False))
+            else:
+                downloads.append(Download(f.year, f.month, f.path, None,
+                                          result))
+        return downloads
+
+    def close(self):
+        self.session.close()
 
 
 def make_url(year, month):
@@ -47,10 +400,20 @@ class RemoteFile():
         if date(self.year, self.month, 1) < date(2016, 12, 1):
             raise ValueError('No web files before 2016-12')
 
-    def download(self):
+    def download(self, manifest=None):
+        """Download archive unless it is not modified since last download.
+           Returns True if archive content changed.
+
+           Args:
+               manifest - Manifest(), defaults to one in cache folder
+        """
         self.check_date()
-        download(self.url, self.path)
-        print('Downloaded', self.path)
+        changed = download(self.url, self.path, manifest or Manifest())
+        if changed:
+            print('Downloaded', self.path)
+        else:
+            print('Not modified since last download', self.path)
+        return changed
 
     def unrar(self):
         res = unrar(self.path, self.folder)
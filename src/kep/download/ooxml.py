@@ -0,0 +1,158 @@
+"""Dump tables from .docx files to csv file without MS Word.
+
+   folder_to_csv(folder, csv_filename) reads same five files as
+   kep.download.word.folder_to_csv() and writes same *tab.csv* layout,
+   but files must be in Office Open XML format (.docx). Older binary .doc
+   files are skipped, they can be converted to .docx with Word or
+   LibreOffice, for example:
+
+       soffice --headless --convert-to docx tab1.doc
+
+   Rows are streamed from *word/document.xml* with an incremental XML
+   parser, files are read in parallel processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+from xml.etree.ElementTree import iterparse
+import zipfile
+
+from kep.download.word import filter_cell_contents, make_file_list, to_csv
+from kep.helper.path import DataFolder, InterimCSV
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+TABLE, GRID_COLUMN, ROW, CELL = W + 'tbl', W + 'gridCol', W + 'tr', W + 'tc'
+PARAGRAPH, TEXT, TAB, BREAK, CARRIAGE_RETURN = (W + 'p', W + 't', W + 'tab',
+                                                W + 'br', W + 'cr')
+DOCUMENT = 'word/document.xml'
+
+# characters Word puts in range text for tabs and breaks, same
+# characters are handled by filter_cell_contents()
+TAB_CHAR = '\t'
+LINE_BREAK = '\x0b'
+PAGE_BREAK = '\x0c'
+PARAGRAPH_END = '\r'
+
+
+def is_ooxml(path):
+    return zipfile.is_zipfile(str(path))
+
+
+def yield_tables(xml_file):
+    """Yield tables from *word/document.xml* stream as lists of rows.
+
+       Rows are padded with empty values to number of columns in table
+       grid, as MS Word does for rows with merged cells. Text of nested
+       tables is part of cell in outer table.
+    """
+    depth = 0
+    n_columns = 0
+    rows, cells, paragraphs, chars = [], [], [], []
+    for event, elem in iterparse(xml_file, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == TABLE:
+                depth += 1
+                if depth == 1:
+                    n_columns, rows = 0, []
+            continue
+        if depth == 0:
+            # free memory taken by paragraphs outside of tables
+            if tag == PARAGRAPH:
+                elem.clear()
+            continue
+        if tag == TEXT:
+            chars.append(elem.text or '')
+        elif tag == TAB:
+            chars.append(TAB_CHAR)
+        elif tag == BREAK:
+            is_page = elem.get(W + 'type') == 'page'
+            chars.append(PAGE_BREAK if is_page else LINE_BREAK)
+        elif tag == CARRIAGE_RETURN:
+            chars.append(LINE_BREAK)
+        elif tag == PARAGRAPH:
+            paragraphs.append(''.join(chars))
+            chars = []
+        elif tag == GRID_COLUMN and depth == 1:
+            n_columns += 1
+        elif tag == CELL and depth == 1:
+            text = PARAGRAPH_END.join(paragraphs)
+            cells.append(filter_cell_contents(text))
+            paragraphs = []
+        elif tag == ROW and depth == 1:
+            rows.append(cells)
+            cells = []
+            elem.clear()
+        elif tag == TABLE:
+            depth -= 1
+            if depth == 0:
+                width = max([n_columns] + [len(row) for row in rows])
+                yield [row + [''] * (width - len(row)) for row in rows]
+                elem.clear()
+
+
+def yield_rows(path):
+    """Yield rows of all tables in .docx file at *path*."""
+    with zipfile.ZipFile(str(path)) as archive:
+        with archive.open(DOCUMENT) as xml_file:
+            for table in yield_tables(xml_file):
+                yield from table
+
+
+def read_rows(path):
+    return list(yield_rows(path))
+
+
+def existing_files(file_list):
+    """Return paths from *file_list* that can be read, .docx file is used
+       instead of .doc file with same name if it exists.
+    """
+    paths = []
+    for p in file_list:
+        docx = os.path.splitext(p)[0] + '.docx'
+        for candidate in (docx, p):
+            if os.path.exists(candidate) and is_ooxml(candidate):
+                print("File:", candidate)
+                paths.append(candidate)
+                break
+        else:
+            print("File does not exist or is not .docx:", p)
+    return paths
+
+
+def yield_rows_from_many_files(file_list, max_workers=None):
+    """Iterate by row over files in *file_list*, files are read in
+       parallel, rows come in order of *file_list*.
+    """
+    print("Starting reading .docx files...")
+    paths = existing_files(file_list)
+    if not paths:
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for rows in executor.map(read_rows, paths):
+            yield from rows
+
+
+def dump_doc_files_to_csv(file_list, csv_path, max_workers=None):
+    """Write tables from files in *file_list* into one *csv_path* file."""
+    to_csv(yield_rows_from_many_files(file_list, max_workers), csv_path)
+
+
+def folder_to_csv(folder, csv_filename, max_workers=None):
+    """Make single csv based on 5 .docx files in *folder*."""
+    print()
+    print("Folder:\n    ", folder)
+    file_list = make_file_list(folder)
+    dump_doc_files_to_csv(file_list, csv_filename, max_workers)
+    print("Finished creating raw CSV file:", csv_filename)
+    return True
+
+
+def docx2csv(year, month, force=False):
+    interim_csv = InterimCSV(year, month)
+    if force or not interim_csv.exists():
+        raw_folder = DataFolder(year, month).raw
+        folder_to_csv(folder=raw_folder, csv_filename=interim_csv.path)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,181 @@
+"""DownloadManager tested against local HTTP server, see kep/conftest.py."""
+import pytest
+import requests
+
+from kep.download.download import (DownloadManager, Manifest, fetch,
+                                   fetch_if_changed, make_session,
+                                   partial_path, validator_path)
+
+FILES = {'/ind01.rar': bytes(range(256)) * 1000,
+         '/ind02.rar': b'rar' * 5000,
+         '/ind03.rar': b'x' * 10}
+
+
+@pytest.fixture
+def server(server):
+    server.files.update(FILES)
+    return server
+
+
+@pytest.fixture
+def manager():
+    manager = DownloadManager(max_workers=3, retries=2, backoff=0)
+    yield manager
+    manager.close()
+
+
+def get(server, tmp_path, name, **kwargs):
+    path = str(tmp_path / name[1:])
+    with make_session() as session:
+        fetch(session, server.url + name, path, sleep=lambda _: None,
+              **kwargs)
+    return path
+
+
+class Test_DownloadManager:
+
+    def test_download_all(self, server, manager, tmp_path):
+        pairs = [(server.url + name, str(tmp_path / name[1:]))
+                 for name in FILES]
+        assert manager.download_all(pairs) == [True, True, True]
+        for name, data in FILES.items():
+            assert (tmp_path / name[1:]).read_bytes() == data
+        assert not list(tmp_path.glob('*.part'))
+
+    def test_returns_error_for_missing_file(self, server, manager, tmp_path):
+        result = manager.download_all([(server.url + '/none.rar',
+                                        str(tmp_path / 'none.rar'))])
+        assert isinstance(result[0], requests.HTTPError)
+
+
+class Test_fetch:
+
+    def write_partial(self, tmp_path, name, data, etag=None):
+        path = str(tmp_path / name[1:])
+        with open(partial_path(path), 'wb') as f:
+            f.write(data)
+        if etag:
+            with open(validator_path(path), 'w') as f:
+                f.write(etag)
+
+    def test_resumes_partial_file(self, server, tmp_path):
+        data = FILES['/ind01.rar']
+        self.write_partial(tmp_path, '/ind01.rar', data[:100],
+                           server.etag(data))
+        path = get(server, tmp_path, '/ind01.rar')
+        assert open(path, 'rb').read() == data
+        assert server.log == [('/ind01.rar', 'bytes=100-')]
+        assert not list(tmp_path.glob('*.part*'))
+
+    def test_partial_file_of_changed_file_is_replaced(self, server,
+                                                      tmp_path):
+        old_data = FILES['/ind01.rar']
+        self.write_partial(tmp_path, '/ind01.rar', old_data[:100],
+                           server.etag(old_data))
+        server.files['/ind01.rar'] = b'new' + old_data[3:]
+        path = get(server, tmp_path, '/ind01.rar')
+        assert open(path, 'rb').read() == server.files['/ind01.rar']
+
+    def test_partial_file_without_validator_is_downloaded_again(self, server,
+                                                                tmp_path):
+        self.write_partial(tmp_path, '/ind01.rar', b'old')
+        path = get(server, tmp_path, '/ind01.rar')
+        assert open(path, 'rb').read() == FILES['/ind01.rar']
+        assert server.log == [('/ind01.rar', None)]
+
+    def test_on_range_not_at_offset_downloads_from_start(self, server,
+                                                         tmp_path):
+        data = FILES['/ind01.rar']
+        self.write_partial(tmp_path, '/ind01.rar', data[:100],
+                           server.etag(data))
+        server.failures['/ind01.rar'] = ['whole']
+        path = get(server, tmp_path, '/ind01.rar')
+        assert open(path, 'rb').read() == data
+        assert server.log == [('/ind01.rar', 'bytes=100-'),
+                              ('/ind01.rar', None)]
+
+    def test_on_dropped_connection_retries_from_received_bytes(self, server,
+                                                               tmp_path):
+        server.failures['/ind01.rar'] = ['drop']
+        path = get(server, tmp_path, '/ind01.rar')
+        assert open(path, 'rb').read() == FILES['/ind01.rar']
+        assert len(server.log) == 2
+        assert server.log[1][1] is not None
+
+    def test_retries_on_server_error(self, server, tmp_path):
+        server.failures['/ind02.rar'] = [503, 503]
+        path = get(server, tmp_path, '/ind02.rar')
+        assert open(path, 'rb').read() == FILES['/ind02.rar']
+        assert len(server.log) == 3
+
+    def test_raises_after_last_retry(self, server, tmp_path):
+        server.failures['/ind02.rar'] = [503, 503]
+        with pytest.raises(requests.HTTPError):
+            get(server, tmp_path, '/ind02.rar', retries=1)
+        assert not (tmp_path / 'ind02.rar').exists()
+
+    def test_does_not_retry_client_error(self, server, tmp_path):
+        with pytest.raises(requests.HTTPError):
+            get(server, tmp_path, '/none.rar')
+        assert len(server.log) == 1
+
+    def test_complete_partial_file_is_renamed(self, server, tmp_path):
+        data = FILES['/ind03.rar']
+        self.write_partial(tmp_path, '/ind03.rar', data, server.etag(data))
+        path = get(server, tmp_path, '/ind03.rar')
+        assert open(path, 'rb').read() == data
+        assert server.log == [('/ind03.rar', 'bytes=10-')]
+
+
+class Test_Manifest:
+
+    @pytest.fixture
+    def manifest(self, tmp_path):
+        return Manifest(tmp_path / 'downloads.json')
+
+    def fetch(self, server, tmp_path, manifest):
+        with make_session() as session:
+            return fetch_if_changed(session, server.url + '/ind02.rar',
+                                    str(tmp_path / 'ind02.rar'), manifest)
+
+    def test_skips_file_not_modified(self, server, tmp_path, manifest):
+        assert self.fetch(server, tmp_path, manifest)
+        assert not self.fetch(server, tmp_path, manifest)
+        assert (tmp_path / 'ind02.rar').read_bytes() == FILES['/ind02.rar']
+        assert len(server.log) == 2
+
+    def test_downloads_file_modified_on_server(self, server, tmp_path,
+                                               manifest):
+        self.fetch(server, tmp_path, manifest)
+        server.files['/ind02.rar'] = b'new'
+        assert self.fetch(server, tmp_path, manifest)
+        assert (tmp_path / 'ind02.rar').read_bytes() == b'new'
+
+    def test_downloads_again_if_local_file_changed(self, server, tmp_path,
+                                                   manifest):
+        self.fetch(server, tmp_path, manifest)
+        (tmp_path / 'ind02.rar').write_bytes(b'broken')
+        # same content as recorded is downloaded
+        assert not self.fetch(server, tmp_path, manifest)
+        assert (tmp_path / 'ind02.rar').read_bytes() == FILES['/ind02.rar']
+        assert len(server.log) == 2
+
+    def test_same_content_sent_again_is_not_changed(self, server, tmp_path,
+                                                    manifest):
+        self.fetch(server, tmp_path, manifest)
+        server.ignore_conditions = True
+        assert not self.fetch(server, tmp_path, manifest)
+        assert len(server.log) == 2
+
+    def test_manager_saves_manifest(self, server, tmp_path, manifest):
+        pairs = [(server.url + name, str(tmp_path / name[1:]))
+                 for name in FILES]
+        manager = DownloadManager(max_workers=3, manifest=manifest)
+        assert manager.download_all(pairs) == [True, True, True]
+        manager.manifest = Manifest(manifest.path)
+        assert manager.download_all(pairs) == [False, False, False]
+        manager.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
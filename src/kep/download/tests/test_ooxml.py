@@ -0,0 +1,85 @@
+import zipfile
+
+import pytest
+
+from kep.download.ooxml import folder_to_csv, read_rows
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:body>
+<w:p><w:r><w:t>Text outside of tables</w:t></w:r></w:p>
+{}
+</w:body>
+</w:document>
+"""
+
+
+def paragraph(*texts):
+    runs = ''.join('<w:r><w:t xml:space="preserve">{}</w:t></w:r>'.format(t)
+                   for t in texts)
+    return '<w:p>{}</w:p>'.format(runs)
+
+
+def cell(*paragraphs, span=1):
+    props = '<w:tcPr><w:gridSpan w:val="{}"/></w:tcPr>'.format(span) \
+        if span > 1 else ''
+    return '<w:tc>{}{}</w:tc>'.format(props, ''.join(paragraphs) or '<w:p/>')
+
+
+def row(*cells):
+    return '<w:tr>{}</w:tr>'.format(''.join(cells))
+
+
+def table(n_columns, *rows):
+    grid = '<w:tblGrid>{}</w:tblGrid>'.format('<w:gridCol/>' * n_columns)
+    return '<w:tbl>{}{}</w:tbl>'.format(grid, ''.join(rows))
+
+
+LINE_BREAK = '<w:p><w:r><w:t>“A”  </w:t><w:br/><w:t>B</w:t></w:r></w:p>'
+NESTED_TABLE = table(1, row(cell(paragraph('nested'))))
+
+TABLES = [
+    table(3,
+          row(cell(paragraph('Объем ВВП'), paragraph(' млрд.рублей'),
+                   span=3)),
+          row(cell(paragraph('2017')), cell(paragraph('1524', ',3 ')),
+              cell()),
+          row(cell(LINE_BREAK), cell(), cell(NESTED_TABLE))),
+    table(2,
+          row(cell(paragraph('2016')), cell(paragraph('99,1'))))]
+
+EXPECTED_ROWS = [['Объем ВВП млрд.рублей', '', ''],
+                 ['2017', '1524,3', ''],
+                 ['"A" B', '', 'nested'],
+                 ['2016', '99,1']]
+
+
+def make_docx(path, tables=TABLES):
+    with zipfile.ZipFile(str(path), 'w') as archive:
+        archive.writestr('word/document.xml',
+                         DOCUMENT.format(''.join(tables)))
+    return path
+
+
+def test_read_rows(tmp_path):
+    path = make_docx(tmp_path / 'tab.docx')
+    assert read_rows(path) == EXPECTED_ROWS
+
+
+def test_folder_to_csv_skips_binary_doc_files(tmp_path):
+    make_docx(tmp_path / 'tab.docx')
+    (tmp_path / 'tab1.doc').write_bytes(b'\xd0\xcf\x11\xe0')
+    # .doc file in OOXML format is read too
+    make_docx(tmp_path / 'tab2.doc', tables=TABLES[1:])
+    csv_path = tmp_path / 'tab.csv'
+    folder_to_csv(str(tmp_path), str(csv_path), max_workers=2)
+    assert csv_path.read_text(encoding='utf8').splitlines() == [
+        'Объем ВВП млрд.рублей\t\t',
+        '2017\t1524,3\t',
+        '"""A"" B"\t\tnested',
+        '2016\t99,1',
+        '2016\t99,1']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,126 @@
+"""Table readers tested on fake Word objects, no MS Word required."""
+import pytest
+
+from kep.download import word
+from kep.download.word import (CELL_END, CellReader, TableTextReader,
+                               dump_doc_files_to_csv, split_table_text)
+
+
+class Count:
+    def __init__(self, count):
+        self.count = count
+
+
+class Range:
+    def __init__(self, text):
+        self.Text = text
+
+
+class Cell:
+    def __init__(self, text):
+        self.Range = Range(text + CELL_END)
+
+
+class FakeTable:
+    """Stand-in for Word table, *cells* is list of rows of cell values.
+       Rows may have fewer cells than the widest row, as with merged
+       cells.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+        self.rows = Count(len(cells))
+        self.columns = Count(max(map(len, cells)))
+        self.cell_calls = 0
+
+    def Cell(self, Row, Column):
+        self.cell_calls += 1
+        try:
+            return Cell(self.cells[Row - 1][Column - 1])
+        except IndexError:
+            raise Exception("The requested member of the collection "
+                            "does not exist.")
+
+    @property
+    def Range(self):
+        return Range(''.join(CELL_END.join(row) + CELL_END * 2
+                             for row in self.cells))
+
+
+class Tables(list):
+    @property
+    def count(self):
+        return len(self)
+
+
+class FakeDocument:
+    def __init__(self, tables):
+        self.Tables = Tables(tables)
+
+
+class FakeWord:
+    """Stand-in for Word application with same tables in every file."""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.Documents = self
+
+    def Open(self, path):
+        self.ActiveDocument = FakeDocument(self.tables)
+
+    def Quit(self):
+        pass
+
+
+CELLS = [['Объем ВВП\r\x0b млрд.рублей', '', '“A”'],
+         ['2017', ' 1524,3\r', ''],
+         ['', '', '\x0c99\x00']]
+
+MERGED_CELLS = [['Индекс потребительских цен'],
+                ['2017', '102,1', '101,0']]
+
+
+@pytest.fixture
+def table():
+    return FakeTable(CELLS)
+
+
+class Test_TableTextReader:
+
+    def test_same_rows_as_cell_reader(self, table):
+        assert list(TableTextReader().rows(table)) == \
+            list(CellReader().rows(table))
+
+    def test_reads_table_text_in_one_call(self, table):
+        list(TableTextReader().rows(table))
+        assert table.cell_calls == 0
+
+    def test_on_merged_cells_reads_by_cell(self):
+        table = FakeTable(MERGED_CELLS)
+        rows = list(TableTextReader().rows(table))
+        assert rows == list(CellReader().rows(FakeTable(MERGED_CELLS)))
+        assert rows[0] == ['Индекс потребительских цен', '', '']
+        assert table.cell_calls > 0
+
+
+def test_split_table_text_on_wrong_cell_count_returns_none(table):
+    assert split_table_text(table.Range.Text, 3, 2) is None
+
+
+def test_dump_doc_files_to_csv_same_for_both_readers(tmp_path, monkeypatch):
+    tables = [FakeTable(CELLS), FakeTable(MERGED_CELLS)]
+    monkeypatch.setattr(word, 'win32_word_dispatch',
+                        lambda: FakeWord(tables))
+    doc_path = tmp_path / 'tab.doc'
+    doc_path.write_text('')
+    outputs = []
+    for reader in CellReader(), TableTextReader():
+        csv_path = tmp_path / 'tab.csv'
+        dump_doc_files_to_csv([str(doc_path)], str(csv_path), reader)
+        outputs.append(csv_path.read_text(encoding='utf8'))
+    assert outputs[0] == outputs[1]
+    assert outputs[0].startswith('Объем ВВП млрд.рублей\t\t"""A"""\n')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,5 +1,8 @@
 """make_csv(data_folder) dumps data from tables in Word document to csv file.
    Windows-only, requires MS Word installed.
+
+   Tables are read with TableTextReader(), one call to Word per table,
+   or with CellReader(), one call per cell.
 """
 
 # More info on...
@@ -109,10 +112,71 @@ def cell_iter(table):
 
 def row_iter(table):
     for i in range(1, table.rows.count + 1):
-        row = []
-        for j in range(1, table.columns.count + 1):
-            row = row + [get_filtered_cell_value(table, i, j)]
-        yield row
+        yield [get_filtered_cell_value(table, i, j)
+               for j in range(1, table.columns.count + 1)]
+
+
+# -------------------------------------------------------------------------------
+#
+#     Table readers
+#
+# -------------------------------------------------------------------------------
+
+# end of cell and end of row marker in Word range text
+CELL_END = '\r\x07'
+
+
+def split_table_text(text, n_rows, n_columns):
+    """Return list of rows with *n_columns* unfiltered cell values from
+       text of whole table or None if *text* does not have exactly
+       *n_columns* cells in every row.
+
+       Text of table is cell values followed by end of cell marker,
+       with one more marker at the end of each row.
+    """
+    values = text.split(CELL_END)
+    # text ends with marker, last value is empty
+    if values.pop() != VOID:
+        return None
+    width = n_columns + 1
+    if len(values) != n_rows * width:
+        return None
+    rows = [values[i:i + width] for i in range(0, len(values), width)]
+    if any(row.pop() != VOID for row in rows):
+        return None
+    return rows
+
+
+class CellReader:
+    """Read every cell of table with a separate call to Word.
+       Slow, but works for tables with merged cells.
+    """
+
+    def rows(self, table):
+        return row_iter(table)
+
+
+class TableTextReader(CellReader):
+    """Read text of whole table with one call to Word and split it to
+       cells. Tables with merged cells have fewer cells in some rows,
+       these are read with CellReader.rows().
+    """
+
+    def rows(self, table):
+        try:
+            text = table.Range.Text
+        except Exception:
+            text = None
+        if text is not None:
+            rows = split_table_text(text, table.rows.count,
+                                    table.columns.count)
+            if rows is not None:
+                return ([filter_cell_contents(value) for value in row]
+                        for row in rows)
+        return super().rows(table)
+
+
+DEFAULT_READER = TableTextReader()
 
 
 # -------------------------------------------------------------------------------
@@ -141,16 +205,17 @@ def query_all_tables(path, func):
     close_ms_word(word)
 
 
-def yield_continious_rows(path):
+def yield_continious_rows(path, reader=DEFAULT_READER):
     """Yields rows of the table within doc file.
 
     Args:
         path: path to doc file.
+        reader: CellReader() or TableTextReader() instance
 
     Yields:
         list of strings (row elements)
     """
-    for y in query_all_tables(path, func=row_iter):
+    for y in query_all_tables(path, func=reader.rows):
         for row in y:
             yield row
 
@@ -175,21 +240,21 @@ def to_csv(gen, csv_path):
 # -------------------------------------------------------------------------------
 
 
-def yield_rows_from_many_files(file_list):
+def yield_rows_from_many_files(file_list, reader=DEFAULT_READER):
     """Iterate by row over .doc files in *file_list* """
     print("Starting reading .doc files...")
     for p in file_list:
         if os.path.exists(p):
             print("File:", p)
-            for row in yield_continious_rows(p):
+            for row in yield_continious_rows(p, reader):
                 yield row
         else:
             print("File does not exist:", p)
 
 
-def dump_doc_files_to_csv(file_list, csv_path):
+def dump_doc_files_to_csv(file_list, csv_path, reader=DEFAULT_READER):
     """Write tables from .doc in *file_list* into one *csv_path* file. """
-    folder_iter = yield_rows_from_many_files(file_list)
+    folder_iter = yield_rows_from_many_files(file_list, reader)
     to_csv(folder_iter, csv_path)
 
 
@@ -198,12 +263,12 @@ def make_file_list(folder):
     return [os.path.abspath(os.path.join(folder, fn)) for fn in files]
 
 
-def folder_to_csv(folder, csv_filename):
+def folder_to_csv(folder, csv_filename, reader=DEFAULT_READER):
     """Make single csv based on 5 .doc files in *folder*. """
     print()
     print("Folder:\n    ", folder)
     file_list = make_file_list(folder)
-    dump_doc_files_to_csv(file_list, csv_filename)
+    dump_doc_files_to_csv(file_list, csv_filename, reader)
     print("Finished creating raw CSV file:", csv_filename)
     return True
 
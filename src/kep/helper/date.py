@@ -1,9 +1,16 @@
 """Dates for the project."""
 
-import pandas as pd
+from datetime import date
 
 
-def supported_dates(start_date='2009-04', exclude_dates=['2013-11']):
+def parse_month(text: str):
+    """Return (year, month) tuple for *text* like '2009-04'."""
+    year, month = text.split('-')
+    return int(year), int(month)
+
+
+def supported_dates(start_date='2009-04', exclude_dates=['2013-11'],
+                    today=None):
     """Get a list of (year, month) tuples starting from (2009, 4) up to 
        a previous recent month. This a 'supported date list'.
 
@@ -12,10 +19,15 @@ def supported_dates(start_date='2009-04', exclude_dates=['2013-11']):
     Returns:
         List of (year: int, month: int) tuples.
     """
-    end_date = pd.to_datetime('today') - pd.offsets.MonthEnd()
-    dates = pd.date_range(start_date, end_date, freq='MS')
-    exclude = map(pd.to_datetime, exclude_dates)
-    return [(date.year, date.month) for date in dates.drop(exclude)]
+    today = today or date.today()
+    exclude = set(map(parse_month, exclude_dates))
+    year, month = parse_month(start_date)
+    dates = []
+    while (year, month) < (today.year, today.month):
+        if (year, month) not in exclude:
+            dates.append((year, month))
+        year, month = (year, month + 1) if month < 12 else (year + 1, 1)
+    return dates
 
 
 class Date:    
@@ -0,0 +1,53 @@
+"""Values computed once per set of objects, kept by object ids.
+
+   Parsing definitions and mappers are not hashable, but same objects
+   are passed again and again. Values computed from them, such as hashes
+   or compiled matchers, are kept by ids of the objects:
+
+       definition_hash = IdentityCache(compute_hash)
+       definition_hash(pdef)  # computed
+       definition_hash(pdef)  # same value, not computed
+
+   Objects are kept alive with their values, so that their ids are not
+   reused. All values are dropped when there are more than *maxsize* of
+   them. Objects are assumed not to change after they are first passed.
+"""
+import threading
+
+# sets of objects to keep values for
+MAX_OBJECTS = 64
+
+
+class IdentityCache:
+    """Callable that returns *func(\\*objects)*, computed once for same
+       objects.
+    """
+
+    def __init__(self, func, maxsize: int = MAX_OBJECTS):
+        self.func = func
+        self.maxsize = maxsize
+        # (objects, value) by object ids
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, *objects):
+        ids = tuple(map(id, objects))
+        # value is kept in local variable, as other thread may clear
+        # entries after it is stored
+        entry = self.entries.get(ids)
+        if entry is None:
+            with self._lock:
+                entry = self.entries.get(ids)
+                if entry is None:
+                    if len(self.entries) >= self.maxsize:
+                        self.entries.clear()
+                    entry = (objects, self.func(*objects))
+                    self.entries[ids] = entry
+        return entry[1]
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,280 @@
+"""Compiled matchers for table header text.
+
+Classes:
+    HeaderMatcher - finds variable names in header rows
+    UnitMatcher - finds unit of measurement in header rows
+
+Header rows are matched by normalized text, see normalize_header(), and
+mapper keys are normalized same way.
+"""
+from collections.abc import Mapping
+import re
+import warnings
+
+from kep.helper.identity import IdentityCache
+
+__all__ = ['HeaderMatcher', 'UnitMatcher', 'ShadowedKeyWarning',
+           'NormalizedKeyWarning', 'normalize_header']
+
+# word broken by hyphen and space at line end, 'непродовольст- венные'
+HYPHENATION = re.compile(r'(?<=[а-яё])- (?=[а-яё])')
+
+
+def normalize_header(text: str):
+    """Header text without apostrophes ("), repeated whitespace and
+       hyphenation breaks.
+
+    >>> normalize_header('непродовольст- венные  "товары"')
+    'непродовольственные товары'
+    """
+    text = ' '.join(text.replace('"', '').split())
+    return HYPHENATION.sub('', text)
+
+
+class NormalizedKeyWarning(UserWarning):
+    pass
+
+
+def normalize_keys(mapper):
+    """Return dictionary of *mapper* items with keys normalized by
+       normalize_header(). Of keys that become same the first one is kept.
+
+       Keys changed by normalization are reported with NormalizedKeyWarning,
+       as they are never found in header text as written.
+
+    >>> normalize_keys({'в  %': 'pct', 'в %': 'rog'})
+    {'в %': 'pct'}
+    """
+    result = {}
+    changed = []
+    for key, value in dict(mapper).items():
+        normalized = normalize_header(key)
+        if normalized != key:
+            changed.append((key, normalized))
+        result.setdefault(normalized, value)
+    if changed:
+        msg = "Keys changed by normalization of header text:"
+        for key, normalized in changed:
+            msg += "\n    <{}> is matched as <{}>".format(key, normalized)
+        warnings.warn(msg, NormalizedKeyWarning, stacklevel=3)
+    return result
+
+
+# matcher compiled by class and mapper object
+_compiled = IdentityCache(lambda cls, mapper: cls(mapper))
+
+
+def make(cls, mapper):
+    """Return *mapper* if it is instance of *cls*, otherwise *cls* compiled
+       from *mapper*.
+
+       Matchers compiled from the same mapper object are reused, so that
+       dictionaries passed for every row are compiled and checked once.
+       Mapper is assumed not to change after it is first passed.
+    """
+    if isinstance(mapper, cls):
+        return mapper
+    return _compiled(cls, mapper)
+
+
+class HeaderMatcher(Mapping):
+    """Read-only mapping of header patterns to variable names, compiled
+       into one regex.
+
+       Each key is a regex pattern that must start at a word boundary, as
+       in ``re.search(r'\\b' + key, text)``. All keys found in a string are
+       collected in one scan of that string, matches may overlap.
+
+    >>> m = HeaderMatcher({'Объем ВВП': 'GDP', 'Индекс': 'INDPRO'})
+    >>> m.findall('Объем ВВП, млрд.рублей')
+    ['GDP']
+    >>> m.findall('Индекс физического объема')
+    ['INDPRO']
+    >>> m.findall('Инвестиции')
+    []
+    """
+
+    def __init__(self, mapper: dict):
+        self._mapper = normalize_keys(mapper)
+        self._keys = list(self._mapper.keys())
+        self._values = [self._mapper[k] for k in self._keys]
+        if self._keys:
+            alternation = '|'.join('(?:{})'.format(k) for k in self._keys)
+            # cheap test whether any key may be present at all
+            self._any = re.compile(alternation)
+            # positions where at least one key starts at a word boundary
+            self._starts = re.compile(r'\b(?={})'.format(alternation))
+            # at given position each lookahead records its key, if found
+            lookaheads = ''.join('(?=(?P<_{}>{})|)'.format(i, k)
+                                 for i, k in enumerate(self._keys))
+            self._each = re.compile(lookaheads)
+            self._groups = [self._each.groupindex['_{}'.format(i)] - 1
+                            for i in range(len(self._keys))]
+        else:
+            self._any = None
+
+    @classmethod
+    def make(cls, mapper):
+        """Return *mapper* if already compiled, compile it otherwise."""
+        return make(cls, mapper)
+
+    def find_keys(self, text: str):
+        """Return indices of keys found in *text*, in mapper order."""
+        if self._any is None:
+            return []
+        first = self._any.search(text)
+        if first is None:
+            return []
+        found = set()
+        for start in self._starts.finditer(text, first.start()):
+            groups = self._each.match(text, start.start()).groups()
+            for i, g in enumerate(self._groups):
+                if groups[g] is not None:
+                    found.add(i)
+        return sorted(found)
+
+    def findall(self, text: str):
+        """Return variable names for all keys found in *text*.
+
+           A variable name is repeated if several keys map to it.
+        """
+        return [self._values[i] for i in self.find_keys(text)]
+
+    def __getitem__(self, key):
+        return self._mapper[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self._mapper)
+
+
+class ShadowedKeyWarning(UserWarning):
+    pass
+
+
+def shadowed_keys(keys):
+    """Return (key, earlier_key) pairs where *key* contains *earlier_key*.
+
+       Such *key* is never selected by first-substring-wins lookup, because
+       *earlier_key* is found in every string where *key* is found.
+
+    >>> shadowed_keys(['%', 'в % к ВВП', 'рублей'])
+    [('в % к ВВП', '%')]
+    """
+    result = []
+    for j, key in enumerate(keys):
+        for earlier_key in keys[:j]:
+            if earlier_key in key:
+                result.append((key, earlier_key))
+                break
+    return result
+
+
+def overlaps(key: str, other: str):
+    """Return True if *other* may start inside *key* and end after it.
+
+    >>> overlaps('abc', 'cde')
+    True
+    >>> overlaps('abc', 'bc')
+    False
+    """
+    return any(other.startswith(key[i:]) and len(other) > len(key) - i
+               for i in range(1, len(key)))
+
+
+class UnitMatcher(Mapping):
+    """Read-only mapping of header substrings to units of measurement,
+       compiled into one regex.
+
+       Lookup returns unit for the first key in mapper order that is
+       a substring of the text, same as walking an ordered dictionary
+       with ``if key in text``.
+
+       The text is scanned once with alternation of all keys in mapper
+       order. Keys hidden by a non-overlapping scan are resolved with
+       tables built on creation: keys contained in a found key are
+       present as well, keys that overlap the tail of a found key are
+       checked directly.
+
+       Keys that can never be selected because an earlier key is their
+       substring are reported with ShadowedKeyWarning on creation, except
+       keys listed in *known_shadowed*.
+
+    >>> m = UnitMatcher([('% change', 'rog'), ('%', 'pct')])
+    >>> m.find('Rate, %')
+    'pct'
+    >>> m.find('Rate, % change')
+    'rog'
+    >>> m.find('Rate')
+    False
+    """
+
+    def __init__(self, mapper, known_shadowed=()):
+        self._mapper = normalize_keys(mapper)
+        self._keys = keys = list(self._mapper.keys())
+        priority = {k: i for i, k in enumerate(keys)}
+        # best priority among keys contained in each key, including itself
+        self._contained = {k: min(priority[x] for x in keys if x in k)
+                           for k in keys}
+        # keys that may start inside each key and end after it
+        self._overlapping = {k: sorted(priority[x] for x in keys
+                                       if overlaps(k, x))
+                             for k in keys}
+        if keys:
+            self._scan = re.compile('|'.join(map(re.escape, keys)))
+        else:
+            self._scan = None
+        self.shadowed = shadowed_keys(keys)
+        unexpected = [(key, earlier_key) for key, earlier_key in self.shadowed
+                      if key not in known_shadowed]
+        if unexpected:
+            msg = "Keys never selected as their substring comes first:"
+            for key, earlier_key in unexpected:
+                msg += "\n    <{}> shadowed by <{}>".format(key, earlier_key)
+            warnings.warn(msg, ShadowedKeyWarning, stacklevel=2)
+
+    @classmethod
+    def make(cls, mapper):
+        """Return *mapper* if already compiled, compile it otherwise."""
+        return make(cls, mapper)
+
+    def find_key(self, text: str):
+        """Return first key in mapper order found in *text* or None."""
+        if self._scan is None:
+            return None
+        found = self._scan.findall(text)
+        if not found:
+            return None
+        best = min(map(self._contained.__getitem__, found))
+        for key in found:
+            for i in self._overlapping[key]:
+                if i >= best:
+                    break
+                if self._keys[i] in text:
+                    best = i
+                    break
+        return self._keys[best]
+
+    def find(self, text: str):
+        """Return unit of measurement found in *text* or False."""
+        key = self.find_key(text)
+        if key is None:
+            return False
+        return self._mapper[key]
+
+    def __getitem__(self, key):
+        return self._mapper[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self._mapper)
@@ -4,15 +4,21 @@ Paths as strings:
     UNPACK_RAR_EXE
     XL_PATH
 
+Functions:
+    md
+    atomic_write
+
 Classes:
     DataFolder
     InterimCSV
     ProcessedCSV
     LocalRarFile
 """
-
+from contextlib import contextmanager
+import os
 from pathlib import Path
 import shutil
+import tempfile
 
 from kep import FREQUENCIES
 from kep.helper.date import Date
@@ -26,6 +32,26 @@ def md(folder):
         folder.mkdir(parents=True)
 
 
+@contextmanager
+def atomic_write(path, mode='wb', **kwargs):
+    """Open temporary file next to *path* for writing and replace *path*
+       with it when done, so that *path* is either complete or not
+       replaced. Temporary file is deleted on error.
+
+           with atomic_write(path, 'w', encoding='utf-8') as f:
+               f.write(text)
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp, str(path))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
 def find_repo_root():
     """Returns root folder for repository.
     Current file is assumed to be:
@@ -52,6 +78,7 @@ class DataFolderBase:
         self.raw_folder = data_folder / 'raw'
         self.interim_folder = data_folder / 'interim'
         self.processed_folder = data_folder / 'processed' 
+        self.cache_folder = data_folder / 'cache'
         self.latest = self.processed_folder / 'latest' 
     
 
@@ -149,6 +176,10 @@ def copy_to_latest(year:int, month: int):
          dst = LatestCSV().path(freq)         
          shutil.copyfile(str(src), str(dst))
          print("Updated", dst)
+         # binary sidecar of CSV file, see kep.sidecar
+         src_sidecar = src.with_suffix('.npz')
+         if src_sidecar.exists():
+             shutil.copyfile(str(src_sidecar), str(dst.with_suffix('.npz')))
 
 def get_path_in_latest_folder(freq: str): 
     return LatestCSV().path(freq)
@@ -1,3 +1,5 @@
+from datetime import date
+
 import pytest
 
 from kep.helper.date import Date, supported_dates
@@ -15,6 +17,10 @@ class Test_supported_dates():
 
      def test_supported_is_after_2017(self):
         assert self.supported[-1][0] >= 2017   
+
+     def test_supported_ends_in_previous_month(self):
+        assert supported_dates(today=date(2018, 5, 31))[-1] == (2018, 4)
+        assert supported_dates(today=date(2019, 1, 1))[-1] == (2018, 12)
     
 
        
@@ -0,0 +1,41 @@
+from kep.helper.identity import IdentityCache
+
+
+class Test_IdentityCache:
+
+    def test_computes_value_once_for_same_objects(self):
+        calls = []
+        length = IdentityCache(lambda x: calls.append(x) or len(x))
+        mapper = {'a': 1}
+        assert length(mapper) == length(mapper) == 1
+        assert len(calls) == 1
+
+    def test_computes_value_for_equal_but_other_object(self):
+        length = IdentityCache(len)
+        mapper = {'a': 1}
+        length(mapper)
+        mapper_copy = dict(mapper)
+        length(mapper_copy)
+        assert len(length) == 2
+
+    def test_keeps_objects_alive(self):
+        length = IdentityCache(len)
+        # without a reference the second dictionary may get id of the first
+        assert length({'a': 1}) == 1
+        assert length({'a': 1, 'b': 2}) == 2
+
+    def test_drops_values_over_maxsize(self):
+        length = IdentityCache(len, maxsize=2)
+        xs = [[1], [1, 2], [1, 2, 3]]
+        assert [length(x) for x in xs] == [1, 2, 3]
+        assert len(length) == 1
+
+    def test_when_other_thread_clears_entries(self):
+        class ClearedByOtherThread(dict):
+            def __setitem__(self, key, value):
+                super().__setitem__(key, value)
+                self.clear()
+
+        length = IdentityCache(len)
+        length.entries = ClearedByOtherThread()
+        assert length([1, 2]) == 2
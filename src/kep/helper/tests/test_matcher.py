@@ -0,0 +1,129 @@
+import warnings
+
+import pytest
+
+from collections import OrderedDict as odict
+
+from kep.helper.matcher import (HeaderMatcher, UnitMatcher,
+                                NormalizedKeyWarning, ShadowedKeyWarning,
+                                normalize_header, shadowed_keys)
+
+
+class Test_HeaderMatcher:
+    matcher = HeaderMatcher({"abc": "ZZZ", "1. ab": "YYY", "bc": "XXX"})
+
+    def test_finds_overlapping_keys_in_mapper_order(self):
+        assert self.matcher.findall("1. abcd") == ["ZZZ", "YYY"]
+
+    def test_key_must_start_at_word_boundary(self):
+        assert self.matcher.findall("xbc") == []
+        assert self.matcher.findall("x bc") == ["XXX"]
+
+    def test_repeated_key_is_reported_once(self):
+        assert self.matcher.findall("abc abc") == ["ZZZ"]
+
+    def test_behaves_as_read_only_mapping(self):
+        assert self.matcher["abc"] == "ZZZ"
+        assert list(self.matcher) == ["abc", "1. ab", "bc"]
+        assert len(self.matcher) == 3
+        with pytest.raises(TypeError):
+            self.matcher["abc"] = "AAA"
+
+    def test_make_does_not_recompile(self):
+        assert HeaderMatcher.make(self.matcher) is self.matcher
+        assert isinstance(HeaderMatcher.make({"a": "A"}), HeaderMatcher)
+
+    def test_empty_mapper_finds_nothing(self):
+        assert HeaderMatcher({}).findall("abc") == []
+
+
+class Test_UnitMatcher:
+    matcher = UnitMatcher(odict([
+        ('период с начала отчетного года в % к соответствующему периоду', 'ytd'),
+        ('в % к соответствующему периоду', 'yoy'),
+        ('% к предыдущему', 'rog'),
+        ('млрд.рублей', 'bln_rub')]))
+
+    def test_first_key_in_mapper_order_wins(self):
+        text = ('период с начала отчетного года в % к соответствующему '
+                'периоду предыдущего года')
+        assert self.matcher.find(text) == 'ytd'
+
+    def test_earlier_key_wins_over_key_found_earlier_in_text(self):
+        text = 'млрд.рублей, в % к соответствующему периоду'
+        assert self.matcher.find(text) == 'yoy'
+
+    def test_returns_false_when_nothing_found(self):
+        assert self.matcher.find('Объем ВВП') is False
+
+    def test_keys_are_plain_substrings(self):
+        assert UnitMatcher({'млрд.': 'bln'}).find('млрд, рублей') is False
+
+
+class Test_normalized_keys:
+    HYPHENATED = 'непродовольст- венные товары'
+
+    @pytest.mark.parametrize('make_matcher', [HeaderMatcher, UnitMatcher])
+    def test_key_changed_by_normalization_warns(self, make_matcher):
+        with pytest.warns(NormalizedKeyWarning):
+            m = make_matcher({self.HYPHENATED: 'rog'})
+        assert list(m) == ['непродовольственные товары']
+
+    def test_hyphenated_key_matches_normalized_header(self):
+        with pytest.warns(NormalizedKeyWarning):
+            m = UnitMatcher({self.HYPHENATED: 'rog'})
+        assert m.find(normalize_header('"непродовольст- венные товары"')) \
+            == 'rog'
+
+    def test_first_of_keys_normalized_to_same_key_is_kept(self):
+        with pytest.warns(NormalizedKeyWarning):
+            m = UnitMatcher(odict([('непродовольственные товары', 'rog'),
+                                   (self.HYPHENATED, 'pct')]))
+        assert dict(m) == {'непродовольственные товары': 'rog'}
+
+    def test_parsing_definitions_have_normalized_keys(self):
+        from kep.parsing_definition.units import UNITS
+        from kep.parsing_definition import (DEFINITION_DEFAULT,
+                                            DEFINITIONS_BY_SEGMENT)
+        keys = list(UNITS)
+        for pdef in [DEFINITION_DEFAULT] + list(DEFINITIONS_BY_SEGMENT):
+            keys.extend(pdef.mapper)
+        assert [key for key in keys if normalize_header(key) != key] == []
+
+
+class Test_shadowed_keys:
+    def test_later_key_containing_earlier_key_is_shadowed(self):
+        assert shadowed_keys(['%', 'в % к ВВП']) == [('в % к ВВП', '%')]
+
+    def test_earlier_key_containing_later_key_is_not_shadowed(self):
+        assert shadowed_keys(['в % к ВВП', '%']) == []
+
+    def test_unit_matcher_warns_on_shadowed_keys(self):
+        with pytest.warns(ShadowedKeyWarning):
+            m = UnitMatcher(odict([('%', 'pct'), ('в % к ВВП', 'gdp_percent')]))
+        assert m.shadowed == [('в % к ВВП', '%')]
+
+    def test_known_shadowed_keys_are_not_reported(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            m = UnitMatcher(odict([('%', 'pct'), ('в % к ВВП', 'gdp_percent')]),
+                            known_shadowed=['в % к ВВП'])
+        assert m.shadowed == [('в % к ВВП', '%')]
+
+    def test_units_in_parsing_definition_shadow_only_known_keys(self):
+        from kep.parsing_definition.units import SHADOWED_UNITS, UNITS
+        shadowed = [key for key, _ in shadowed_keys(list(UNITS))]
+        assert shadowed == SHADOWED_UNITS
+
+    @pytest.mark.parametrize('header, unit', [
+        ('млн.рублей / mln rubles', 'rub'),
+        ('2.2. Сальдированный финансовый результат по видам экономической '
+         'деятельности, млн.рублей', 'rub'),
+        ('в % к ВВП / percent of GDP', 'pct')])
+    def test_shadowed_units_in_interim_headers(self, header, unit):
+        from kep.parsing_definition.parsing_definition import UNITS_MATCHER
+        assert UNITS_MATCHER.find(header) == unit
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
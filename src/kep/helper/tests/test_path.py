@@ -5,6 +5,7 @@ from kep.helper.path import (UNPACK_RAR_EXE, XL_PATH,
                              DataFolder,
                              InterimCSV, ProcessedCSV,
                              LocalRarFile,
+                             atomic_write,
                              )
 
 
@@ -18,6 +19,26 @@ def test_constants():
     assert isinstance(XL_PATH, str)
 
 
+class Test_atomic_write():
+    def test_replaces_file(self, tmp_path):
+        path = tmp_path / 'a.txt'
+        path.write_text('old')
+        with atomic_write(path, 'w') as f:
+            f.write('new')
+        assert path.read_text() == 'new'
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_on_error_keeps_file_and_deletes_temporary_file(self, tmp_path):
+        path = tmp_path / 'a.txt'
+        path.write_text('old')
+        with pytest.raises(ValueError):
+            with atomic_write(path, 'w') as f:
+                f.write('new')
+                raise ValueError
+        assert path.read_text() == 'old'
+        assert list(tmp_path.iterdir()) == [path]
+
+
 # TODO: randomise tests with a random pair from supported dates
 class Test_DataFolder():
 
@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+from kep.helper.timing import collect, combine, is_enabled, stage, timed
+
+
+@timed('double', count=len)
+def double(xs):
+    return xs + xs
+
+
+class Test_timed:
+
+    def test_outside_of_collect_calls_function_only(self):
+        assert not is_enabled()
+        assert double([1]) == [1, 1]
+
+    def test_records_calls_and_rows(self):
+        with collect() as timings:
+            double([1])
+            double([1, 2])
+        report = timings.report()['double']
+        assert report['calls'] == 2
+        assert report['rows'] == 6
+        assert report['seconds'] <= timings.seconds
+        assert not is_enabled()
+
+
+class Test_stage:
+
+    def test_records_rows_set_in_block(self):
+        with collect() as timings:
+            with stage('block') as counter:
+                counter.rows = 5
+        assert timings.report()['block']['rows'] == 5
+
+    def test_nested_collect_records_to_both(self):
+        with collect() as outer:
+            with collect() as inner:
+                double([])
+        assert outer.report() == inner.report()
+
+    def test_str_lists_stages(self):
+        with collect() as timings:
+            double([])
+        assert 'double' in str(timings)
+        assert 'total' in str(timings)
+
+
+def test_collect_records_own_thread_only():
+    barrier = threading.Barrier(2)
+    reports = {}
+
+    def run(n):
+        with collect() as timings:
+            barrier.wait()
+            for _ in range(n):
+                double([])
+            barrier.wait()
+        reports[n] = timings.report()['double']['calls']
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert reports == {1: 1, 2: 2}
+
+
+def test_combine_sums_by_stage():
+    report = dict(double=dict(seconds=1.0, calls=1, rows=2))
+    assert combine([report, report]) == \
+        dict(double=dict(seconds=2.0, calls=2, rows=4))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,160 @@
+"""Wall time, call counts and row counts by parsing stage.
+
+   Stages are recorded only inside collect() block:
+
+       with collect() as timings:
+           Vintage(2018, 4)
+       print(timings)
+       timings.report()  # {'reading': {'seconds': ..., 'calls': 1,
+                         #              'rows': 6532}, ...}
+
+   Outside of collect() a timed function is called directly, the cost
+   is a check of one thread-local list. Stages recorded:
+
+       cache - parsing result lookup, load and save (kep.cache)
+       reading - CSV text to rows (popper)
+       segmentation - rows to segments (pipeline)
+       tables - segment rows to tables (extract_tables)
+       headers - table header lines to labels (extract_tables)
+       values - table datarows to values (extract_tables)
+       dataframe - values to dataframe (dataframe)
+       deaccumulation - accumulated values to monthly or quarterly ones
+       validation - checkpoints lookup (checkpoints)
+
+   Stages do not overlap. collect() records stages run in its own thread
+   only, segments parsed by other threads or processes are not recorded.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+import threading
+import time
+
+
+class _Local(threading.local):
+    def __init__(self):
+        # Timings() instances collecting now in this thread, see collect()
+        self.collectors = []
+
+
+_LOCAL = _Local()
+
+
+class Stage:
+    __slots__ = ('seconds', 'calls', 'rows')
+
+    def __init__(self):
+        self.seconds, self.calls, self.rows = 0.0, 0, 0
+
+    def as_dict(self):
+        return dict(seconds=self.seconds, calls=self.calls, rows=self.rows)
+
+
+class Timings:
+    """Stages by name in order of first record, total time of collect()
+       block in .seconds.
+    """
+
+    def __init__(self):
+        self.stages = OrderedDict()
+        self.seconds = 0.0
+
+    def add(self, name: str, seconds: float, rows: int = 0):
+        try:
+            stage = self.stages[name]
+        except KeyError:
+            stage = self.stages[name] = Stage()
+        stage.seconds += seconds
+        stage.calls += 1
+        stage.rows += rows
+
+    def report(self):
+        """Return dictionary of seconds, calls and rows by stage name."""
+        return OrderedDict((name, stage.as_dict())
+                           for name, stage in self.stages.items())
+
+    def __str__(self):
+        lines = ['{:<16}{:>10}{:>8}{:>10}'.format('stage', 'seconds',
+                                                   'calls', 'rows')]
+        for name, stage in self.stages.items():
+            lines.append('{:<16}{:>10.4f}{:>8}{:>10}'.format(
+                name, stage.seconds, stage.calls, stage.rows))
+        lines.append('{:<16}{:>10.4f}'.format('total', self.seconds))
+        return '\n'.join(lines)
+
+
+def combine(reports):
+    """Sum *reports* from Timings.report() by stage."""
+    result = OrderedDict()
+    for report in reports:
+        for name, values in report.items():
+            total = result.setdefault(name, dict(seconds=0.0, calls=0,
+                                                 rows=0))
+            for key, value in values.items():
+                total[key] += value
+    return result
+
+
+def record(name: str, seconds: float, rows: int = 0):
+    for timings in _LOCAL.collectors:
+        timings.add(name, seconds, rows)
+
+
+def is_enabled():
+    return bool(_LOCAL.collectors)
+
+
+@contextmanager
+def collect():
+    """Record stages run by current thread within block to Timings() 
+       instance."""
+    timings = Timings()
+    collectors = _LOCAL.collectors
+    collectors.append(timings)
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings.seconds = time.perf_counter() - start
+        collectors.remove(timings)
+
+
+class _Counter:
+    __slots__ = ('rows',)
+
+    def __init__(self):
+        self.rows = 0
+
+
+@contextmanager
+def stage(name: str):
+    """Record time of block as stage *name*. Number of rows can be set
+       to .rows of yielded object.
+    """
+    counter = _Counter()
+    if not _LOCAL.collectors:
+        yield counter
+        return
+    start = time.perf_counter()
+    try:
+        yield counter
+    finally:
+        record(name, time.perf_counter() - start, counter.rows)
+
+
+def timed(name: str, count=None):
+    """Decorator to record calls of function as stage *name*.
+       Number of rows is *count(result)*, 0 if *count* is None.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _LOCAL.collectors:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            seconds = time.perf_counter() - start
+            record(name, seconds, count(result) if count else 0)
+            return result
+        return wrapper
+    return decorator
@@ -1,7 +1,12 @@
 """Validate parsing result using checkpoints."""
 
 from collections import namedtuple
-import pandas as pd
+from typing import TYPE_CHECKING
+
+from kep.helper.timing import timed
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
 
 var_str = 'date label value'
 Annual, Qtr, Month = (namedtuple(name, 'date label value')
@@ -137,17 +142,79 @@ VALUES_MONTHLY_1999 = make_list(Month,
  'WAGE_REAL_yoy': 58.6})
 
 
-def contains(df: pd.DataFrame, checkpoint):
-    try:
-        subset = df[checkpoint.label]
-    except KeyError:
-        return False              
-    return checkpoint.value == subset.loc[checkpoint.date].iloc[0]
+def lookup(df: 'pd.DataFrame', checkpoints: list):
+    """Return values of *df* at *checkpoints*, NaN where label or date
+       is not in *df*, and a boolean array of checkpoints found in *df*.
+
+       All checkpoints are looked up at once: labels are matched to column
+       positions, dates to first row in the period with a search in sorted
+       index, values are taken from *df* with a single indexing operation.
+    """
+    # imported here so that importing parsing definitions stays fast
+    import numpy as np
+    import pandas as pd
+    labels = [c.label for c in checkpoints]
+    dates = [c.date for c in checkpoints]
+    values = np.full(len(checkpoints), np.nan)
+    found = np.zeros(len(checkpoints), dtype=bool)
+    if df.empty or not checkpoints:
+        return values, found
+    cols = df.columns.get_indexer(labels)
+    rows = df.index.searchsorted(pd.to_datetime(dates))
+    rows = np.minimum(rows, len(df.index) - 1)
+    # row found by search must be within period of checkpoint date,
+    # '1999-03' is compared to start of '1999-03-31'
+    row_dates = df.index[rows].strftime('%Y-%m-%d')
+    found[:] = [col >= 0 and row_date.startswith(date)
+                for col, row_date, date in zip(cols, row_dates, dates)]
+    if found.any():
+        block = df.astype(float).values
+        values[found] = block[rows[found], cols[found]]
+    return values, found
+
+
+Mismatch = namedtuple('Mismatch', 'checkpoint actual')
+
+
+class Report(namedtuple('Report', 'missing mismatched uncovered')):
+    """Result of examining a dataframe with checkpoints:
+
+       missing - checkpoints with label or date not in dataframe
+       mismatched - Mismatch(checkpoint, actual) where value differs
+       uncovered - column names not covered by checkpoints
+    """
+
+    @property
+    def missed(self):
+        return self.missing + [m.checkpoint for m in self.mismatched]
+
+    @property
+    def is_valid(self):
+        return not self.missed
 
-def missed(df: pd.DataFrame, checkpoints: list):
-    return [c for c in checkpoints if not contains(df, c)]
 
-def uncovered(df: pd.DataFrame, checkpoints: list):
+def examine(df: 'pd.DataFrame', checkpoints: list):
+    """Return Report() for *df* and *checkpoints*."""
+    values, found = lookup(df, checkpoints)
+    missing, mismatched = [], []
+    for checkpoint, value, is_found in zip(checkpoints, values, found):
+        if not is_found:
+            missing.append(checkpoint)
+        elif checkpoint.value != value:
+            mismatched.append(Mismatch(checkpoint, value))
+    return Report(missing, mismatched, uncovered(df, checkpoints))
+
+
+def contains(df: 'pd.DataFrame', checkpoint):
+    values, found = lookup(df, [checkpoint])
+    return bool(found[0]) and checkpoint.value == values[0]
+
+def missed(df: 'pd.DataFrame', checkpoints: list):
+    values, found = lookup(df, checkpoints)
+    return [c for c, value, is_found in zip(checkpoints, values, found)
+            if not is_found or c.value != value]
+
+def uncovered(df: 'pd.DataFrame', checkpoints: list):
     """Returns column names that are not covered by *checkpoints*."""
     checkpoint_column_names = {c.label for c in checkpoints}
     diff = set(df.columns) \
@@ -189,14 +256,50 @@ def cover(df, checkpoints):
                   exc_handler=print,
                   exc_message = 'Variables in dataframe not covered by checkpoints:')
 
+
+# required and optional checkpoints by frequency
+CHECKPOINTS = dict(a=(VALUES_ANNUAL_1999, VALUES_ANNUAL_2017),
+                   q=(VALUES_QTR_1999, []),
+                   m=(VALUES_MONTHLY_1999, []))
+
+
+@timed('validation')
+def validation_report(a, q, m):
+    """Return reports for dataframes by frequency, without printing or
+       raising errors.
+
+       Returns:
+           {'a': (required, optional), 'q': ..., 'm': ...} where required
+           and optional are Report() for required and optional checkpoints.
+           Columns covered by either are not reported as uncovered.
+    """
+    reports = {}
+    for freq, df in dict(a=a, q=q, m=m).items():
+        required, optional = CHECKPOINTS[freq]
+        columns = uncovered(df, required + optional)
+        required_report = examine(df, required)._replace(uncovered=columns)
+        optional_report = examine(df, optional)._replace(uncovered=[])
+        reports[freq] = required_report, optional_report
+    return reports
+
     
 def verify(a, q, m):
-    require(a, VALUES_ANNUAL_1999)
-    expect(a, VALUES_ANNUAL_2017)    
-    require(q, VALUES_QTR_1999)
-    require(m, VALUES_MONTHLY_1999)
-    cover(a, VALUES_ANNUAL_1999+VALUES_ANNUAL_2017)
-    cover(q, VALUES_QTR_1999)
-    cover(m, VALUES_MONTHLY_1999)
-
-    
\ No newline at end of file
+    """Raise ValidationError if required checkpoints are missed, print
+       missed optional checkpoints and uncovered columns.
+
+       Returns:
+           reports from validation_report()
+    """
+    reports = validation_report(a, q, m)
+    must_contain = [c for required, _ in reports.values()
+                    for c in required.missed]
+    if must_contain:
+        raise_validation_error('Dataframe must contain:' + fmt(must_contain))
+    for freq, (required, optional) in reports.items():
+        if optional.missed:
+            print('Optional checkpoints not found in dataframe:'
+                  + fmt(optional.missed))
+        if required.uncovered:
+            print('Variables in dataframe not covered by checkpoints:'
+                  + fmt(required.uncovered))
+    return reports
@@ -103,9 +103,7 @@ YAML_BY_SEGMENT = """
     'header': 'Индекс потребительских цен'
     'unit': 'rog'
   - 'var': 'CPI_NONFOOD'
-    'header':
-      - 'непродовольственные товары'
-      - 'непродовольст- венные товары'
+    'header': 'непродовольственные товары'
     'unit': 'rog'
   - 'var': 'CPI_FOOD'
     'header': 'продукты питания'
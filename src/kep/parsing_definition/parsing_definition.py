@@ -30,12 +30,16 @@ Create parsing instructions for an individual variable.
 
 from collections import namedtuple
 
-import yaml
 from typing import List
 
 from kep.helper.label import make_label
+from kep.helper.matcher import HeaderMatcher, UnitMatcher
 from .parameters import YAML_DEFAULT, YAML_BY_SEGMENT
-from .units import UNITS
+from .snapshot import SNAPSHOT_PATH, load_snapshot, source_hash
+from .units import SHADOWED_UNITS, UNITS
+
+# compiled once, shared by all parsing definitions
+UNITS_MATCHER = UnitMatcher(UNITS, known_shadowed=SHADOWED_UNITS)
 
 
 def iterate(x):
@@ -66,18 +70,66 @@ def make_required_labels(commands):
 DefinitionFactory = namedtuple('ParsingDefinition', 
                               ['mapper', 'required_labels', 'boundaries',
                                'units', 'reader']) 
+# pickle finds class by its name
+ParsingDefinition = DefinitionFactory
 
 def make_parsing_definition(commands: List[dict],
                             boundaries: List[dict] = [],
                             reader: str = '',
                             units = UNITS):
-    return DefinitionFactory(mapper = make_table_header_mapper(commands),
+    mapper = HeaderMatcher(make_table_header_mapper(commands))
+    return DefinitionFactory(mapper = mapper,
                 required_labels = make_required_labels(commands),
                 boundaries = boundaries,
                 reader = reader,
-                units = UNITS)  
+                units = UNITS_MATCHER)  
+
+
+def parse_yaml():
+    """Return YAML parameters as dictionary with 'default' and 
+       'by_segment' lists of documents."""
+    # yaml is imported only when snapshot is missing or outdated
+    import yaml
+    return dict(default=list(yaml.load_all(YAML_DEFAULT,
+                                           Loader=yaml.SafeLoader)),
+                by_segment=list(yaml.load_all(YAML_BY_SEGMENT, 
+                                              Loader=yaml.SafeLoader)))
+
+
+def read_documents(path=SNAPSHOT_PATH):
+    """Return YAML documents from snapshot at *path* if it matches 
+       YAML parameters, parse YAML otherwise."""
+    documents = load_snapshot(path, source_hash())
+    if documents is None:
+        documents = parse_yaml()
+    return documents
+
+
+def compile_definitions(documents=None):
+    """Return default parsing definition and list of parsing definitions
+       by segment compiled from YAML *documents*, parsed from YAML 
+       parameters if None."""
+    if documents is None:
+        documents = parse_yaml()
+    definition_default = make_parsing_definition(documents['default'], 
+                                                 boundaries=[], reader='')
+    definitions_by_segment = [make_parsing_definition(**instruction) 
+                              for instruction in documents['by_segment']]
+    return definition_default, definitions_by_segment
+
+
+def load_definitions(path=SNAPSHOT_PATH, use_snapshot: bool = True):
+    """Return compiled definitions.
+
+       Args:
+           path - snapshot file, see kep.parsing_definition.snapshot
+           use_snapshot - read YAML documents from snapshot at *path*
+                          while it matches YAML parameters, snapshot is
+                          never written here
+    """
+    if not use_snapshot:
+        return compile_definitions()
+    return compile_definitions(read_documents(path))
+
 
-commands_default = list(yaml.load_all(YAML_DEFAULT))
-instructions_by_segment = list(yaml.load_all(YAML_BY_SEGMENT))    
-DEFINITION_DEFAULT = make_parsing_definition(commands_default, boundaries=[], reader='')
-DEFINITIONS_BY_SEGMENT = [make_parsing_definition(**instruction) for instruction in instructions_by_segment]
+DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT = load_definitions()
@@ -0,0 +1,72 @@
+"""Snapshot of parsed YAML parameters.
+
+   Parsing definitions are made from YAML strings in parameters.py.
+   Parsing YAML takes most of import time, so parsed documents are kept
+   in JSON file *definitions.json* next to this module together with
+   a hash of the YAML strings. Snapshot is read only while the hash
+   matches, then yaml is not imported:
+
+       documents = load_snapshot(SNAPSHOT_PATH, source_hash())
+
+   Snapshot is never written on import. After changing parameters.py
+   rebuild it with:
+
+       invoke snapshot
+
+"""
+import hashlib
+import json
+from pathlib import Path
+
+from .parameters import YAML_DEFAULT, YAML_BY_SEGMENT
+
+SNAPSHOT_PATH = Path(__file__).parent / 'definitions.json'
+
+# change when layout of snapshot file changes
+SNAPSHOT_VERSION = 1
+
+
+def source_hash(sources=(YAML_DEFAULT, YAML_BY_SEGMENT)):
+    """Hash of YAML strings in *sources* and snapshot version."""
+    h = hashlib.sha256(str(SNAPSHOT_VERSION).encode('utf-8'))
+    for text in sources:
+        h.update(b'\0')
+        h.update(text.encode('utf-8'))
+    return h.hexdigest()
+
+
+def is_documents(obj):
+    return (isinstance(obj, dict)
+            and sorted(obj) == ['by_segment', 'default']
+            and all(isinstance(obj[k], list) for k in obj))
+
+
+def load_snapshot(path, key: str):
+    """Return YAML documents stored at *path* under *key* or None if
+       snapshot is missing, unreadable or made for other *key*.
+
+       Returns:
+           dictionary with 'default' and 'by_segment' lists of documents
+    """
+    try:
+        with open(str(path), encoding='utf-8') as f:
+            snapshot = json.load(f)
+        snapshot_key, documents = snapshot['key'], snapshot['documents']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if snapshot_key != key or not is_documents(documents):
+        return None
+    return documents
+
+
+def save_snapshot(path, key: str, documents: dict):
+    """Write YAML *documents* with *key* to JSON file at *path*."""
+    text = json.dumps(dict(key=key, documents=documents), ensure_ascii=False,
+                      indent=1)
+    Path(path).write_text(text + '\n', encoding='utf-8')
+
+
+def rebuild(path=SNAPSHOT_PATH):
+    """Parse YAML parameters and save them as snapshot at *path*."""
+    from .parsing_definition import parse_yaml
+    save_snapshot(path, source_hash(), parse_yaml())
@@ -0,0 +1,79 @@
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+import kep
+from kep.parsing_definition.parsing_definition import (DEFINITION_DEFAULT,
+                                                       DEFINITIONS_BY_SEGMENT,
+                                                       compile_definitions,
+                                                       load_definitions,
+                                                       parse_yaml)
+from kep.parsing_definition.snapshot import (SNAPSHOT_PATH, load_snapshot,
+                                             save_snapshot, source_hash)
+
+DOCUMENTS = dict(default=[dict(var='GDP', header='Объем ВВП',
+                               unit='bln_rub')],
+                 by_segment=[])
+
+
+class Test_snapshot:
+
+    def test_save_and_load(self, tmp_path):
+        path = tmp_path / 'definitions.json'
+        save_snapshot(path, 'key', DOCUMENTS)
+        assert load_snapshot(path, 'key') == DOCUMENTS
+
+    def test_load_on_other_key_returns_none(self, tmp_path):
+        path = tmp_path / 'definitions.json'
+        save_snapshot(path, 'key', DOCUMENTS)
+        assert load_snapshot(path, 'other key') is None
+
+    @pytest.mark.parametrize('content', [b'not json', b'[1, 2]',
+                                         b'{"key": "key"}',
+                                         b'{"key": "key", "documents": [1]}'])
+    def test_load_on_broken_file_returns_none(self, tmp_path, content):
+        path = tmp_path / 'definitions.json'
+        path.write_bytes(content)
+        assert load_snapshot(path, 'key') is None
+
+    def test_load_on_missing_file_returns_none(self, tmp_path):
+        assert load_snapshot(tmp_path / 'definitions.json', 'key') is None
+
+
+def test_snapshot_matches_yaml_parameters():
+    # rebuild with 'invoke snapshot' after editing parameters.py
+    assert load_snapshot(SNAPSHOT_PATH, source_hash()) == parse_yaml()
+
+
+def test_source_hash_changes_with_yaml():
+    assert source_hash(['a: 1']) != source_hash(['a: 2'])
+
+
+def test_load_definitions_same_as_compiled():
+    default, by_segment = compile_definitions()
+    assert repr(DEFINITION_DEFAULT) == repr(default)
+    assert repr(DEFINITIONS_BY_SEGMENT) == repr(by_segment)
+
+
+def test_load_definitions_on_outdated_snapshot_parses_yaml(tmp_path):
+    path = tmp_path / 'definitions.json'
+    save_snapshot(path, 'old key', DOCUMENTS)
+    default, by_segment = load_definitions(path)
+    assert repr(by_segment) == repr(DEFINITIONS_BY_SEGMENT)
+    assert json.loads(path.read_text(encoding='utf-8'))['key'] == 'old key'
+
+
+def test_import_does_not_load_yaml_and_pandas():
+    statement = ("import sys, kep.parsing_definition; "
+                 "print([m for m in ('yaml', 'pandas') if m in sys.modules])")
+    output = subprocess.run([sys.executable, '-c', statement], check=True,
+                            cwd=str(Path(kep.__file__).parents[1]),
+                            stdout=subprocess.PIPE, universal_newlines=True)
+    assert output.stdout.strip() == '[]'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -2,9 +2,13 @@ import pytest
 
 from kep.parsing_definition.checkpoints import (
     Annual,
+    Mismatch,
     ValidationError,
+    examine,
+    expect,
+    lookup,
     require,
-    expect
+    validation_report
 )
 from kep.vintage import Vintage
 
@@ -47,7 +51,30 @@ class Test_verify():
     def test_expect_passed(self, dataframe, present, absent):
         expect(dataframe, present)
         expect(dataframe, absent)
-    
+
+    def test_validation_report_on_good_vintage_is_valid(self):
+        dfs = Vintage(2017, 12).dfs
+        reports = validation_report(**dfs)
+        assert all(required.is_valid for required, _ in reports.values())
+
+
+class Test_examine():
+
+    def test_lookup_matches_first_row_in_period(self, dataframe):
+        values, found = lookup(dataframe, [Annual('2016', 'GDP_yoy', 0),
+                                           Annual('1900', 'GDP_yoy', 0)])
+        assert values[0] == dataframe.loc['2016', 'GDP_yoy'].iloc[0]
+        assert found.tolist() == [True, False]
+
+    def test_report_lists_missing_and_mismatched(self, dataframe, absent,
+                                                 present):
+        wrong = Annual(date="1999", label="AGROPROD_yoy", value=0.0)
+        report = examine(dataframe, absent + present + [wrong])
+        assert report.missing == absent
+        assert report.mismatched == [Mismatch(wrong, 103.8)]
+        assert report.missed == absent + [wrong]
+        assert not report.is_valid
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -6,6 +6,7 @@
        
        UNITS
        UNIT_NAMES 
+       SHADOWED_UNITS
        
 """
 from collections import OrderedDict as odict
@@ -47,12 +48,19 @@ UNITS = odict([  # 1. MONEY
     ("продукты питания", 'rog'),
     ("алкогольные напитки", 'rog'),
     ("непродовольственные товары", 'rog'),
-    ("непродовольст- венные товары", 'rog'),
     ("услуги", 'rog'),
     ('млн.кв.м', 'mln_m2'),
 
 ])
 
+# keys never selected, because an earlier key is found in them: 
+# 'млн.рублей' gives 'rub' and 'в % к ВВП' gives 'pct'. They are kept in 
+# place, so that parsing results do not change.
+SHADOWED_UNITS = ['млн.рублей',
+                  'отчетный месяц в % к предыдущему месяцу',
+                  'отчетный месяц в % к соответствующему месяцу предыдущего года',
+                  'в % к ВВП']
+
 # 'official' names of units used in project front
 UNIT_NAMES = {'bln_rub': 'млрд.руб.',
               'bln_usd': 'млрд.долл.',
@@ -1,7 +1,13 @@
 """Creating pandas dataframes."""
 
+import numpy as np
 import pandas as pd
 
+from kep.helper.timing import timed
+from kep.pipeline.datapoints import Datapoints
+from kep.pipeline.parser.extract_tables import (FREQ_CODES, period_grid,
+                                                period_timestamps)
+
 
 def get_duplicates(df):
     if df.empty:
@@ -21,17 +27,12 @@ def check_duplicates(df):
 
 
 def create_dataframe(datapoints, freq):    
-    df = pd.DataFrame([x for x in datapoints if x['freq'] == freq])
+    if isinstance(datapoints, Datapoints):
+        df = scatter(datapoints, freq)
+    else:
+        df = pivot(datapoints, freq)
     if df.empty:
         return pd.DataFrame()
-    #import pdb; pdb.set_trace()
-    check_duplicates(df)
-    df = df.drop_duplicates(['freq', 'label', 'time_index'], keep='first')
-    # reshape
-    df = df.pivot(columns='label', values='value', index='time_index')
-    # delete some internals for better view
-    df.columns.name = None
-    df.index.name = None
     # add year
     df.insert(0, "year", df.index.year)
     # add period
@@ -48,6 +49,69 @@ def create_dataframe(datapoints, freq):
         df = deaccumulate(df, first_month=1)
     return df        
 
+@timed('dataframe', count=len)
+def pivot(datapoints, freq):
+    """Make dataframe from datapoint dictionaries of frequency *freq*,
+       first value wins for same label and time_index.
+    """
+    df = pd.DataFrame([x for x in datapoints if x['freq'] == freq])
+    if df.empty:
+        return df
+    check_duplicates(df)
+    df = df.drop_duplicates(['freq', 'label', 'time_index'], keep='first')
+    # reshape
+    df = df.pivot(columns='label', values='value', index='time_index')
+    # delete some internals for better view
+    df.columns.name = None
+    df.index.name = None
+    return df
+
+
+@timed('dataframe', count=len)
+def scatter(datapoints, freq):
+    """Make dataframe from Datapoints() buffer, same as pivot().
+
+       Values of frequency *freq* are written into preallocated 
+       (period x label) array, first value wins for same label and period.
+    """
+    columns = datapoints.columns
+    subset = columns.freq == FREQ_CODES[freq]
+    labels = columns.label[subset]
+    periods = columns.period[subset]
+    values = columns.value[subset]
+    if not len(values):
+        return pd.DataFrame()
+    check_duplicates(duplicate_rows(datapoints, freq, labels, periods, values))
+    label_codes, label_pos = np.unique(labels, return_inverse=True)
+    period_codes, period_pos = np.unique(periods, return_inverse=True)
+    _, first = np.unique(label_pos * len(period_codes) + period_pos, 
+                         return_index=True)
+    data = np.full((len(period_codes), len(label_codes)), np.nan)
+    data[period_pos[first], label_pos[first]] = values[first]
+    # columns sorted by label name, same as in pivot()
+    names = [datapoints.labels[code] for code in label_codes]
+    order = sorted(range(len(names)), key=names.__getitem__)
+    return pd.DataFrame(data[:, order],
+                        index=period_grid(freq)[period_codes],
+                        columns=[names[i] for i in order])
+
+
+def duplicate_rows(datapoints, freq, labels, periods, values):
+    """Return dataframe of repeated datapoints among *labels*, *periods* 
+       and *values* of frequency *freq*, same as in pivot().
+    """
+    df = pd.DataFrame(dict(label=labels, period=periods, value=values))
+    dups = df[df.duplicated(keep=False)]
+    if dups.empty:
+        return pd.DataFrame()
+    grid = period_timestamps(freq)
+    return pd.DataFrame(dict(label=[datapoints.labels[x] for x in dups.label],
+                             value=dups.value,
+                             time_index=[grid[x] for x in dups.period],
+                             freq=freq), 
+                        index=dups.index)
+
+
 # government revenue and expense time series transformation
 
 
@@ -67,6 +131,7 @@ def deacc_main(df, first_month):
     return df
 
 
+@timed('deaccumulation', count=len)
 def deaccumulate(df, first_month):
     varnames = [
         vn for vn in df.columns if vn.startswith('GOV') and (
@@ -0,0 +1,95 @@
+"""Columnar buffer of parsed datapoints.
+
+   Datapoints() holds label, frequency and period codes and values in
+   typed arrays. Iterating over it yields datapoint dictionaries, same
+   as produced by Table.values.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from kep.pipeline.parser.extract_tables import (FREQUENCIES,
+                                                period_timestamps)
+
+Columns = namedtuple('Columns', 'label freq period value')
+
+
+class Datapoints:
+    """Columnar store of datapoints.
+
+       .labels - label names, position in list is label code
+       .columns - Columns() of arrays:
+           label - label codes
+           freq - frequency codes, position in FREQUENCIES
+           period - period codes, see extract_tables.period_code()
+           value - float values
+    """
+
+    def __init__(self):
+        self.labels = []
+        self._label_codes = {}
+        self._chunks = []
+        self._columns = None
+
+    @classmethod
+    def from_columns(cls, labels, columns):
+        """Make Datapoints from label names and Columns() of arrays."""
+        datapoints = cls()
+        for label in labels:
+            datapoints.label_code(label)
+        datapoints._chunks = [Columns(*columns)]
+        return datapoints
+
+    def label_code(self, label: str):
+        try:
+            return self._label_codes[label]
+        except KeyError:
+            self._label_codes[label] = len(self.labels)
+            self.labels.append(label)
+            return self._label_codes[label]
+
+    def add(self, label: str, freq_codes, period_codes, values):
+        """Append datapoints of *label* from arrays of same length."""
+        codes = np.full(len(values), self.label_code(label), dtype=np.int32)
+        self._chunks.append(Columns(codes,
+                                    np.asarray(freq_codes, dtype=np.int8),
+                                    np.asarray(period_codes, dtype=np.int32),
+                                    np.asarray(values, dtype=float)))
+        self._columns = None
+
+    @property
+    def columns(self):
+        if self._columns is None:
+            if self._chunks:
+                chunks = self._chunks
+            else:
+                chunks = [Columns(np.zeros(0, dtype=np.int32),
+                                  np.zeros(0, dtype=np.int8),
+                                  np.zeros(0, dtype=np.int32),
+                                  np.zeros(0))]
+            self._columns = Columns(*map(np.concatenate, zip(*chunks)))
+            # keep one chunk instead of many small ones
+            self._chunks = [self._columns]
+        return self._columns
+
+    def __len__(self):
+        return len(self.columns.value)
+
+    def __iter__(self):
+        """Yield datapoint dictionaries with label, value, time_index
+           and freq."""
+        freqs = [freq for freq, _ in FREQUENCIES]
+        grids = [period_timestamps(freq) for freq in freqs]
+        columns = self.columns
+        for label, freq, period, value in zip(columns.label.tolist(),
+                                              columns.freq.tolist(),
+                                              columns.period.tolist(),
+                                              columns.value.tolist()):
+            yield dict(label=self.labels[label],
+                       value=value,
+                       time_index=grids[freq][period],
+                       freq=freqs[freq])
+
+    def __repr__(self):
+        return "<Datapoints: {} values, {} labels>".format(len(self),
+                                                         len(self.labels))
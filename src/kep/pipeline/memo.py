@@ -0,0 +1,89 @@
+"""Memoized parsing of CSV segments.
+
+   Consecutive monthly publications repeat most tables, so a segment
+   with same rows and same parsing definition is parsed once and its
+   result is reused:
+
+       memo = SegmentMemo()
+       columns = memo.evaluate(rows, pdef)
+       print(memo.report())
+
+"""
+from collections import Counter, OrderedDict
+import hashlib
+
+from kep.helper.identity import IdentityCache
+from kep.pipeline.parser.extract_tables import evaluate_assignment_columns
+from kep.pipeline.parser.row_model import Row
+
+
+def rows_hash(rows):
+    """Hash of CSV *rows*, list of lists of strings or Row() instances."""
+    h = hashlib.sha256()
+    for row in rows:
+        cells = row.cells if isinstance(row, Row) else row
+        h.update('\t'.join(cells).encode('utf-8'))
+        h.update(b'\n')
+    return h.hexdigest()
+
+
+def definition_hash(pdef):
+    """Hash of parsing definition *pdef*."""
+    return hashlib.sha256(repr(pdef).encode('utf-8')).hexdigest()
+
+
+def segment_name(pdef):
+    """Start line of first segment boundary or 'default'."""
+    if pdef.boundaries:
+        return pdef.boundaries[0]['start']
+    return 'default'
+
+
+class SegmentMemo:
+    """Results of evaluate_assignment_columns() by (rows hash, definition
+       hash), least recently used results dropped over *maxsize*.
+
+       .hits and .misses count lookups by segment name.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.results = OrderedDict()
+        self.hits, self.misses = Counter(), Counter()
+        self.definition_hash = IdentityCache(definition_hash)
+
+    def evaluate(self, rows, pdef):
+        """Same as evaluate_assignment_columns(*rows*, *pdef*)."""
+        key = rows_hash(rows), self.definition_hash(pdef)
+        name = segment_name(pdef)
+        try:
+            result = self.results[key]
+        except KeyError:
+            self.misses[name] += 1
+            result = evaluate_assignment_columns(rows, pdef)
+            self.results[key] = result
+            if len(self.results) > self.maxsize:
+                self.results.popitem(last=False)
+        else:
+            self.hits[name] += 1
+            self.results.move_to_end(key)
+        return result
+
+    def clear(self):
+        self.results.clear()
+        self.hits.clear()
+        self.misses.clear()
+
+    def report(self):
+        """Table of hits and misses by segment."""
+        names = sorted(set(self.hits) | set(self.misses))
+        width = max([len(name) for name in names] + [len('Segment')])
+        lines = ['{:<{w}}  {:>6}  {:>6}'.format('Segment', 'Hits', 'Misses',
+                                                 w=width)]
+        for name in names:
+            lines.append('{:<{w}}  {:>6}  {:>6}'.format(
+                name, self.hits[name], self.misses[name], w=width))
+        lines.append('{:<{w}}  {:>6}  {:>6}'.format(
+            'Total', sum(self.hits.values()), sum(self.misses.values()),
+            w=width))
+        return '\n'.join(lines)
@@ -4,21 +4,39 @@
 """
 from collections import OrderedDict as odict
 from enum import Enum, unique
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 from kep.helper.label import make_label
-from .row_splitter import get_splitter
-from .to_float import to_float
-from .row_model import Row
+from kep.helper.matcher import HeaderMatcher, UnitMatcher
+from kep.helper.timing import stage, timed
+from .header_cache import HeaderCache
+from .row_splitter import get_splitter, get_layout
+from .to_float import to_float, to_float_array
+from .row_model import YEAR_MIN, YEAR_MAX, as_row, make_rows
 
 
 def evaluate_assignment(rows, pdef):
-    tables = split_to_tables(rows)
+    tables = required_tables(rows, pdef)
+    return [v for t in tables for v in t.values] 
+
+def evaluate_assignment_columns(rows, pdef):
+    """Same as evaluate_assignment(), but return list of 
+       (label, freq_codes, period_codes, values) arrays by table.
+    """
+    tables = required_tables(rows, pdef)
+    return [(t.label,) + t.columns for t in tables if t.is_defined()]
+
+def required_tables(rows, pdef):
+    with stage('tables') as counter:
+        tables = list(split_to_tables(rows))
+        counter.rows = len(rows)
     tables = parse_tables(tables, pdef)
     verify_tables(tables, pdef) 
-    tables = [t for t in tables if (t.label in pdef.required_labels)]
-    return [v for t in tables for v in t.values] 
+    return [t for t in tables if (t.label in pdef.required_labels)]
 
+@timed('headers', count=len)
 def parse_tables(tables, pdef):
     tables = list(tables)
     # assign reader function
@@ -48,13 +66,13 @@ class State(Enum):
 
 
 def split_to_tables(rows):
-    """Yield Table() instances from *rows* list of lists."""
+    """Yield Table() instances from *rows* list of lists or Row() 
+       instances."""
     datarows = []
     headers = []
     state = State.INIT
     for row in rows:
-        r = Row(row)
-        if r.is_datarow():
+        if as_row(row).is_datarow():
             datarows.append(row)
             state = State.DATA
         else:
@@ -70,27 +88,36 @@ def split_to_tables(rows):
         yield Table(headers, datarows)
 
 
+# header line resolutions, shared by all tables in a process
+HEADER_CACHE = HeaderCache()
+
+
 class HeaderParser:
     def __init__(self, headers):
-        self.rows = [Row(line) for line in headers]
+        self.rows = make_rows(headers)
+        # rows are shared with other tables of same file, so parsing
+        # flags are kept here
+        self.parsed = [False] * len(self.rows)
         self.varname = None
         self.unit = None
 
-    def set_label(self, varnames_dict, units_dict):
+    def set_label(self, varnames_dict, units_dict, cache=HEADER_CACHE):
+        varnames_dict = HeaderMatcher.make(varnames_dict)
+        units_dict = UnitMatcher.make(units_dict)
         for i, row in enumerate(self.rows):
-            varname = row.get_varname(varnames_dict)
+            varname, unit, parsed = cache.resolve(row, varnames_dict,
+                                                  units_dict)
             if varname:
                 self.varname = varname
-                self.rows[i].is_parsed = True
-            unit = row.get_unit(units_dict)
             if unit:
                 self.unit = unit
-                self.rows[i].is_parsed = True
+            if parsed:
+                self.parsed[i] = True
         return self.varname, self.unit
 
     @property
     def is_parsed(self):
-        return all(row.is_parsed for row in self.rows)
+        return all(self.parsed)
 
     def __str__(self):
         return '\n'.join(map(str,self.rows))
@@ -98,7 +125,7 @@ class HeaderParser:
 
 def count_columns(datarows):
     """Number of columns in table."""
-    return max(len(row) for row in map(Row, datarows))
+    return max(len(row) for row in map(as_row, datarows))
 
 
 class DataBlock:
@@ -115,17 +142,36 @@ class DataBlock:
 
     def extract_values(self):
         """Filter out None values from ._extract_values() stream."""
+        matrix = ValueMatrix.from_datarows(self.datarows, self.splitter_func)
+        if matrix is not None:
+            return matrix.datapoints(self.label)
         def has_value(d):
             return d['value'] is not None
         return filter(has_value, self._extract_values())
 
+    @timed('values', count=lambda columns: len(columns[2]))
+    def extract_columns(self):
+        """Return (freq_codes, period_codes, values) arrays in same order
+           as .extract_values().
+        """
+        matrix = ValueMatrix.from_datarows(self.datarows, self.splitter_func)
+        if matrix is not None:
+            return matrix.columns()
+        points = list(self.extract_values())
+        freq_codes = [FREQ_CODES[d['freq']] for d in points]
+        period_codes = [timestamp_period_code(d['time_index'], d['freq'])
+                        for d in points]
+        return (np.array(freq_codes, dtype=np.int8),
+                np.array(period_codes, dtype=np.int32),
+                np.array([d['value'] for d in points], dtype=float))
+
     def _extract_values(self):
         """Yield dictionaries with variable name, frequency, time_index
            and value. May yield a dictionary where d['value'] is None.
         """
-        for row in self.datarows:
-            year = Row(row).year
-            data = Row(row).data
+        for row in map(as_row, self.datarows):
+            year = row.year
+            data = row.data
             a_value, q_values, m_values = self.splitter_func(data)
             if a_value:
                 time_stamp = timestamp_annual(year)
@@ -155,6 +201,142 @@ def timestamp_month(year, month):
     return pd.Timestamp(year, month, 1) + pd.offsets.MonthEnd()
 
 
+# frequency and number of periods in a year
+FREQUENCIES = (('a', 1), ('q', 4), ('m', 12))
+FREQ_CODES = {freq: code for code, (freq, _) in enumerate(FREQUENCIES)}
+
+
+def period_code(year: int, period: int, n_periods: int):
+    """Position of *period* of *year* in period grid, *period* counts from 1.
+
+    >>> period_code(1991, 1, 12)
+    0
+    >>> period_code(1992, 2, 4)
+    5
+    """
+    return (year - YEAR_MIN) * n_periods + period - 1
+
+
+def timestamp_period_code(time_stamp, freq: str):
+    """Period code of *time_stamp* made by timestamp_annual(), 
+       timestamp_quarter() or timestamp_month().
+
+    >>> timestamp_period_code(timestamp_quarter(1992, 2), 'q')
+    5
+    """
+    n_periods = dict(FREQUENCIES)[freq]
+    period = dict(a=1, q=time_stamp.quarter, m=time_stamp.month)[freq]
+    return period_code(time_stamp.year, period, n_periods)
+
+
+@lru_cache(maxsize=None)
+def period_grid(freq: str):
+    """Timestamps for all periods in plausible years, by period code."""
+    n_periods = dict(FREQUENCIES)[freq]
+    make_timestamp = dict(a=lambda year, t: timestamp_annual(year),
+                          q=timestamp_quarter,
+                          m=timestamp_month)[freq]
+    return pd.DatetimeIndex([make_timestamp(year, t)
+                             for year in range(YEAR_MIN, YEAR_MAX + 1)
+                             for t in range(1, n_periods + 1)])
+
+
+@lru_cache(maxsize=None)
+def period_timestamps(freq: str):
+    """Same as period_grid(), as tuple of pd.Timestamp."""
+    return tuple(period_grid(freq))
+
+
+class ValueMatrix:
+    """Values of table datarows arranged by frequency.
+
+       For each frequency *freq* in 'a', 'q' and 'm' there are arrays
+       with a row for each datarow and a column for each period in a year:
+           .periods[freq] - period codes, see period_code()
+           .values[freq] - float values, NaN where value is missing
+           .defined[freq] - True where value is present
+    """
+
+    def __init__(self, years, cells, layouts):
+        """
+        Args:
+            years - list of years of datarows
+            cells - list of datarows without year, as lists of strings
+            layouts - list of column-index maps of datarows, see get_layout()
+        """
+        n_rows = len(cells)
+        # extra empty column is a placeholder for missing periods
+        width = max(map(len, cells)) + 1
+        matrix = np.full((n_rows, width), '', dtype=object)
+        for i, data in enumerate(cells):
+            matrix[i, :len(data)] = data
+        years = np.array(years, dtype=int).reshape(n_rows, 1)
+        all_values, all_defined = to_float_array(matrix)
+        rows = np.arange(n_rows).reshape(n_rows, 1)
+        self.periods, self.values, self.defined = {}, {}, {}
+        for freq, n_periods in FREQUENCIES:
+            index = np.full((n_rows, n_periods), width - 1, dtype=int)
+            for i, layout in enumerate(layouts):
+                columns = getattr(layout, freq)
+                index[i, :len(columns)] = columns
+            self.periods[freq] = period_code(years, 
+                                             np.arange(1, n_periods + 1),
+                                             n_periods)
+            self.values[freq] = all_values[rows, index]
+            self.defined[freq] = all_defined[rows, index]
+
+    @classmethod
+    def from_datarows(cls, datarows, splitter_func):
+        """Return ValueMatrix for *datarows* or None if *splitter_func*
+           has no column-index map for some of *datarows*.
+        """
+        rows = make_rows(datarows)
+        layouts = [get_layout(splitter_func, len(row.data)) for row in rows]
+        if not rows or None in layouts:
+            return None
+        return cls(years=[row.year for row in rows],
+                   cells=[row.data for row in rows],
+                   layouts=layouts)
+
+    def columns(self):
+        """Return (freq_codes, period_codes, values) arrays in same order
+           as .datapoints(), skipping missing values.
+        """
+        freq_codes = np.concatenate([np.full(n_periods, code, dtype=np.int8)
+                                     for code, (_, n_periods) 
+                                     in enumerate(FREQUENCIES)])
+        def stack(arrays):
+            return np.hstack([arrays[freq] for freq, _ in FREQUENCIES])
+        mask = stack(self.defined)
+        periods = stack(self.periods)
+        freq_codes = np.broadcast_to(freq_codes, periods.shape)
+        return (freq_codes[mask], 
+                periods[mask].astype(np.int32), 
+                stack(self.values)[mask])
+
+    def datapoints(self, label):
+        """Yield dictionaries with *label*, frequency, time_index and value
+           in same order as DataBlock._extract_values(), skipping missing
+           values.
+        """
+        columns = []
+        for freq, _ in FREQUENCIES:
+            columns.append((freq,
+                            period_timestamps(freq),
+                            self.periods[freq].tolist(),
+                            self.values[freq].tolist(),
+                            self.defined[freq].tolist()))
+        for i in range(len(self.periods['a'])):
+            for freq, grid, periods, values, defined in columns:
+                for code, value, is_defined in zip(periods[i], values[i], 
+                                                   defined[i]):
+                    if is_defined:
+                        yield dict(label=label,
+                                   value=value,
+                                   time_index=grid[code],
+                                   freq=freq)
+
+
 class Table:
     """Representation of CSV table, has headers and datarows.
        Depends on HeaderParser and DataBlock classes.
@@ -182,6 +364,12 @@ class Table:
     def has_unknown_lines(self):
         return not self.header.is_parsed
     
+    @property
+    def columns(self):
+        """(freq_codes, period_codes, values) arrays, same as .values"""
+        dblock = DataBlock(self.datarows, self.label, self.splitter_func)
+        return dblock.extract_columns()
+
     @property
     def values(self):        
         if self.is_defined():
@@ -0,0 +1,189 @@
+"""Cache of table header line resolutions.
+
+   Same header lines appear in every monthly publication, so variable
+   name and unit of a header line are found once per set of mappers:
+
+       cache = HeaderCache()
+       varname, unit, parsed = cache.resolve(row, varnames, units)
+       print(cache.report())
+
+   Resolutions are kept in memory of a process, oldest resolutions are
+   dropped when there are more than *maxsize* of them. All interim CSV
+   files have under 1000 distinct header lines.
+
+   Resolutions can be kept between runs in a JSON file:
+
+       cache.load(path)
+       ...
+       cache.save(path)
+
+   Saved resolutions are keyed by mappers fingerprint, same as in memory,
+   and are not loaded if code that resolves header lines has changed.
+
+"""
+import hashlib
+import json
+from pathlib import Path
+import threading
+
+from kep.helper.identity import IdentityCache
+from kep.helper.matcher import HeaderMatcher, UnitMatcher
+from kep.helper.path import atomic_write, md
+from .row_model import as_row
+
+# header line resolutions to keep
+MAX_HEADERS = 10000
+
+# modules that resolve header lines, saved resolutions are not loaded
+# after any of them changes
+SOURCE_FILES = [Path(__file__),
+                Path(__file__).parent / 'row_model.py',
+                Path(__file__).parents[2] / 'helper' / 'matcher.py']
+
+
+def source_hash():
+    """Hash of source code that resolves header lines."""
+    sha = hashlib.sha256()
+    for path in SOURCE_FILES:
+        sha.update(path.read_bytes())
+    return sha.hexdigest()
+
+
+def mappers_fingerprint(varnames, units):
+    """Hash of variable name and unit mappers."""
+    text = repr(HeaderMatcher.make(varnames)) + repr(UnitMatcher.make(units))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def resolve(row, varnames, units):
+    """Return (varname, unit, parsed) for header *row*.
+
+       Args:
+           varnames - HeaderMatcher or dictionary to compile it from
+           units - UnitMatcher or dictionary to compile it from
+
+       Returns:
+           varname, unit - as found by Row.get_varname() and Row.get_unit()
+           parsed - True if either varname or unit was found
+    """
+    row = as_row(row)
+    varname = row.get_varname(varnames)
+    unit = row.get_unit(units)
+    return varname, unit, bool(varname or unit)
+
+
+class HeaderCache:
+    """Resolutions of header lines by mappers fingerprint and normalized
+       header text, see Row.header.
+
+       .seen and .new count lookups of header lines found in cache and
+       resolved anew.
+    """
+
+    def __init__(self, maxsize: int = MAX_HEADERS):
+        self.maxsize = maxsize
+        self.resolutions = {}
+        self.seen, self.new = 0, 0
+        self.fingerprint = IdentityCache(mappers_fingerprint)
+        self.changed = False
+        # number of resolutions, kept along with .resolutions
+        self._size = 0
+        # guards .resolutions and counts, so that one cache can be shared
+        # by parsing jobs run in a thread pool
+        self._lock = threading.Lock()
+
+    def resolve(self, row, varnames, units):
+        """Same as resolve(*row*, *varnames*, *units*)."""
+        row = as_row(row)
+        fingerprint = self.fingerprint(varnames, units)
+        with self._lock:
+            result = self.resolutions.get(fingerprint, {}).get(row.header)
+            if result is not None:
+                self.seen += 1
+                return result
+        # header is resolved outside the lock, other threads keep going
+        result = resolve(row, varnames, units)
+        with self._lock:
+            self.new += 1
+            by_header = self.resolutions.setdefault(fingerprint, {})
+            if row.header not in by_header:
+                by_header[row.header] = result
+                self._size += 1
+                self.changed = True
+                self._evict()
+        return result
+
+    def save(self, path):
+        """Write resolutions to JSON file at *path*."""
+        with self._lock:
+            content = dict(source=source_hash(),
+                           resolutions=self.resolutions)
+            md(Path(path).parent)
+            with atomic_write(path, 'w', encoding='utf-8') as f:
+                json.dump(content, f, ensure_ascii=False)
+            self.changed = False
+
+    def load(self, path):
+        """Add resolutions from JSON file at *path* written by .save().
+           Missing or damaged file and file saved by other version of code
+           are skipped.
+
+           Returns:
+               number of resolutions added
+        """
+        try:
+            with open(str(path), encoding='utf-8') as f:
+                content = json.load(f)
+            if content['source'] != source_hash():
+                return 0
+            saved = {fingerprint: {header: tuple(result)
+                                   for header, result in by_header.items()}
+                     for fingerprint, by_header
+                     in content['resolutions'].items()}
+        except (FileNotFoundError, ValueError, KeyError, TypeError,
+                AttributeError):
+            return 0
+        count = 0
+        with self._lock:
+            for fingerprint, by_header in saved.items():
+                known = self.resolutions.setdefault(fingerprint, {})
+                for header, result in by_header.items():
+                    if header not in known:
+                        known[header] = result
+                        count += 1
+            self._size += count
+            self._evict()
+        return count
+
+    def evict(self):
+        """Drop oldest resolutions until there are at most .maxsize."""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        while self._size > self.maxsize:
+            fingerprint = next(iter(self.resolutions))
+            by_header = self.resolutions[fingerprint]
+            if by_header:
+                del by_header[next(iter(by_header))]
+                self._size -= 1
+            else:
+                del self.resolutions[fingerprint]
+
+    def clear(self):
+        with self._lock:
+            self.resolutions.clear()
+            self._size = 0
+            self.seen, self.new = 0, 0
+            self.changed = False
+
+    def __len__(self):
+        return self._size
+
+    def report(self):
+        """Counts of header lines seen before and new."""
+        total = self.seen + self.new
+        share = self.seen / total if total else 0
+        return ("Header lines: {} seen before, {} new, {:.0%} seen\n"
+                "Cached resolutions: {}".format(self.seen, self.new, share,
+                                                len(self)))
@@ -2,7 +2,10 @@
 
 import re
 
-YEAR_CATCHER = re.compile("\D*(\d{4}).*")
+from kep.helper.matcher import HeaderMatcher, UnitMatcher, normalize_header
+
+YEAR_CATCHER = re.compile(r"\D*(\d{4})")
+YEAR_MIN, YEAR_MAX = 1991, 2050
 
 
 def get_year(string: str, rx=YEAR_CATCHER):
@@ -11,10 +14,10 @@ def get_year(string: str, rx=YEAR_CATCHER):
        Returns:
            Year as integer
            False if year is not valid or not in plausible range."""
-    match = re.match(rx, string)
+    match = rx.match(string)
     if match:
         year = int(match.group(1))
-        if year >= 1991 and year <= 2050:
+        if year >= YEAR_MIN and year <= YEAR_MAX:
             return year
     return False
 
@@ -29,20 +32,45 @@ class Row:
     Encapsulates a list of strings and allows extracting
     unit and variable name from row.
 
+    Year and name without apostrophes are computed once on creation,
+    normalized header text on first use. Make rows once per file with
+    make_rows() and pass them on, as_row() keeps Row instances as is.
+
+    Attributes:
+      .cells - list of strings, row as read from CSV file
+      .year - year as integer or False, see get_year()
+      .text - name without apostrophes ("), used in .startswith()
+      .header - normalized name of a header row, used to find variable
+                name and unit, see normalize_header()
+
     Methods:
       .get_unit(...)
       .get_varname(...)
 
     """
 
+    __slots__ = ('cells', 'name', 'data', 'is_parsed', 'year', 'text',
+                 '_header')
+
     def __init__(self, row):
         """
         Args:
             row - list of strings
         """
+        self.cells = row
         self.name = row[0]
         self.data = row[1:]
         self.is_parsed = False
+        self.year = get_year(self.name)
+        # clean out apostrophe (")
+        self.text = self.name.replace('"', '')
+        self._header = None
+
+    @property
+    def header(self):
+        if self._header is None:
+            self._header = normalize_header(self.name)
+        return self._header
 
     def is_datarow(self):
         """Helper function for table demarkation.
@@ -51,7 +79,7 @@ class Row:
             True if first element in row is year.
             False otherwise.
         """
-        return is_year(self.name)
+        return self.year is not False
 
     def startswith(self, text):
         """Helper function for header parsing.
@@ -60,10 +88,7 @@ class Row:
             True if *self.name* starts with *text*.
             False otherwise.
         """
-        # clean out apostrophe (")
-        r = self.name.replace('"', '')
-        text = text.replace('"', '')
-        return r.startswith(text)
+        return self.text.startswith(text.replace('"', ''))
 
     def matches(self, pat):
         """Helper function for header parsing.
@@ -75,26 +100,17 @@ class Row:
         rx = r"\b{}".format(pat)
         return bool(re.search(rx, self.name))
 
-    @property
-    def year(self):
-        """Extract year as integer from *self.name*
-
-        If *self.name* cannot be parsed as a year, False is returned
-
-        Returns:
-            year as an integer, or False.
-        """
-        return get_year(self.name)
-
     def get_varname(self, varnames_mapper_dict):
         """Returns variable name string (varname) found in this row.
 
         Args:
             varnames_mapper_dict: dictionary of valid variable names.
                                   For example: {'Gross domestic product':'GDP'}
+                                  or HeaderMatcher compiled from such
+                                  dictionary.
 
         Returns:
-            Matched varname from *self.name* as string, for example:
+            Matched varname from *self.header* as string, for example:
             'GDP', 'CPI', 'INDPRO'.
 
             If no match was found returns False.
@@ -102,10 +118,8 @@ class Row:
         Raises:
             ValueError: if found for more than one varname .
         """
-        varnames = []
-        for k in varnames_mapper_dict.keys():
-            if self.matches(k):
-                varnames.append(varnames_mapper_dict[k])
+        matcher = HeaderMatcher.make(varnames_mapper_dict)
+        varnames = matcher.findall(self.header)
         if len(varnames) > 1:
             msg = "Multiple entries found in <{0}>: {1}".format(
                 self.name, varnames)
@@ -122,15 +136,18 @@ class Row:
             units_mapper_dict: dictionary of valid units of measurement,
                                ex. {'% change from previous period': 'rog',
                                     'billion ruble': 'bln_rub'}
+                               or UnitMatcher compiled from such
+                               dictionary. First key found wins.
 
         Returns:
             Matched unit of measurement as string.
             False if no match was found.
         """
-        for k in units_mapper_dict.keys():
-            if k in self.name:
-                return units_mapper_dict[k]
-        return False
+        return UnitMatcher.make(units_mapper_dict).find(self.header)
+
+    def __reduce__(self):
+        # pickle source cells only, cached attributes are made on load
+        return Row, (self.cells,)
 
     def __len__(self):
         return len(self.data)
@@ -143,3 +160,17 @@ class Row:
 
     def __repr__(self):
         return "Row({})".format([self.name] + self.data)
+
+
+def as_row(row):
+    """Return *row* if it is a Row already, make Row from list otherwise."""
+    if row.__class__ is Row:
+        return row
+    return Row(row)
+
+
+def make_rows(rows):
+    """Row() instances for *rows*, list of lists of strings. Rows are made
+       once per file and passed on instead of lists.
+    """
+    return [as_row(row) for row in rows]
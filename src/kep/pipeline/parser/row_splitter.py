@@ -1,5 +1,8 @@
 """Splitter functions extract annual, quarterly and monthly values from data row."""
 
+from collections import namedtuple
+from functools import lru_cache
+
 
 __all__ = []  # TODO: (ID) Which classes/functions need to be added to __all__?
 
@@ -107,5 +110,39 @@ def get_splitter(arg):
         return emit_nones
 
 
+Layout = namedtuple('Layout', 'a q m')
+
+
+@lru_cache(maxsize=None)
+def get_layout(splitter_func, width: int):
+    """Column-index map of *splitter_func* for rows with *width* values.
+
+       Returns:
+           Layout of lists with indices of annual, quarterly and monthly
+           values in data row.
+           None if *splitter_func* is not in FUNC_MAPPER or fails on
+           rows with *width* values.
+
+    >>> get_layout(split_row_fiscal, 12)
+    Layout(a=[0], q=[3, 6, 9, 0], m=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 0])
+    >>> get_layout(split_row_by_year_and_qtr, 3)
+    Layout(a=[0], q=[1, 2], m=[])
+    >>> get_layout(split_row_fiscal, 5) is None
+    True
+    """
+    if splitter_func not in FUNC_MAPPER.values():
+        return None
+    try:
+        a, q, m = splitter_func(list(range(width)))
+    except IndexError:
+        return None
+    layout = Layout(a=[] if a is None else [a],
+                    q=list(q or []),
+                    m=list(m or []))
+    if len(layout.q) > 4 or len(layout.m) > 12:
+        return None
+    return layout
+
+
 if __name__ == "__main__":
     pass
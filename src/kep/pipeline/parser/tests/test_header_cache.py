@@ -0,0 +1,119 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kep.pipeline.parser.extract_tables import HeaderParser
+from kep.pipeline.parser import header_cache
+from kep.pipeline.parser.header_cache import HeaderCache, resolve
+
+VARNAMES = {'Объем ВВП': 'GDP'}
+UNITS = {'млрд.рублей': 'bln_rub', '%': 'pct'}
+
+HEADER = ['Объем ВВП, млрд.рублей / Gross domestic product, bln rubles']
+
+
+class Test_HeaderCache:
+
+    def test_resolve_same_as_resolve_function(self):
+        cache = HeaderCache()
+        assert cache.resolve(HEADER, VARNAMES, UNITS) == \
+            resolve(HEADER, VARNAMES, UNITS) == ('GDP', 'bln_rub', True)
+
+    def test_on_same_header_counts_seen(self):
+        cache = HeaderCache()
+        cache.resolve(HEADER, VARNAMES, UNITS)
+        cache.resolve(['Объем  "ВВП", млрд.рублей / Gross domestic product, '
+                       'bln rubles'], VARNAMES, UNITS)
+        assert (cache.seen, cache.new) == (1, 1)
+
+    def test_on_other_mappers_counts_new(self):
+        cache = HeaderCache()
+        cache.resolve(HEADER, VARNAMES, UNITS)
+        assert cache.resolve(HEADER, {}, UNITS) == (False, 'bln_rub', True)
+        assert cache.new == 2
+
+    def test_drops_oldest_resolutions_over_maxsize(self):
+        cache = HeaderCache(maxsize=2)
+        cache.resolve(HEADER, VARNAMES, UNITS)
+        cache.resolve(['Unknown line'], VARNAMES, UNITS)
+        cache.resolve(HEADER, {}, UNITS)
+        assert len(cache) == 2
+        cache.resolve(HEADER, VARNAMES, UNITS)
+        assert cache.new == 4
+
+    def test_resolve_from_many_threads(self):
+        cache = HeaderCache(maxsize=50)
+        headers = [['Line {}'.format(i)] for i in range(200)] + [HEADER]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(
+                    lambda header: cache.resolve(header, VARNAMES, UNITS),
+                    headers * 5))
+        finally:
+            sys.setswitchinterval(interval)
+        assert results[200] == ('GDP', 'bln_rub', True)
+        assert len(cache) == 50
+        assert cache.seen + cache.new == len(headers) * 5
+
+    def test_report_has_counts(self):
+        cache = HeaderCache()
+        cache.resolve(HEADER, VARNAMES, UNITS)
+        assert cache.report().startswith('Header lines: 0 seen before, 1 new')
+
+
+class Test_HeaderCache_save_and_load:
+
+    def test_loaded_resolutions_are_seen(self, tmp_path):
+        path = tmp_path / 'headers.json'
+        cache = HeaderCache()
+        cache.resolve(HEADER, VARNAMES, UNITS)
+        cache.resolve(HEADER, {}, UNITS)
+        assert cache.changed
+        cache.save(path)
+        assert not cache.changed
+        other = HeaderCache()
+        assert other.load(path) == 2
+        assert other.resolve(HEADER, VARNAMES, UNITS) == \
+            ('GDP', 'bln_rub', True)
+        assert other.resolve(HEADER, {}, UNITS) == (False, 'bln_rub', True)
+        assert (other.seen, other.new) == (2, 0)
+
+    def test_load_keeps_resolutions_in_memory(self, tmp_path):
+        path = tmp_path / 'headers.json'
+        cache = HeaderCache()
+        cache.resolve(HEADER, VARNAMES, UNITS)
+        cache.save(path)
+        assert cache.load(path) == 0
+        assert len(cache) == 1
+
+    def test_load_skips_file_from_other_source(self, tmp_path, monkeypatch):
+        path = tmp_path / 'headers.json'
+        cache = HeaderCache()
+        cache.resolve(HEADER, VARNAMES, UNITS)
+        cache.save(path)
+        monkeypatch.setattr(header_cache, 'source_hash', lambda: 'changed')
+        assert HeaderCache().load(path) == 0
+
+    @pytest.mark.parametrize('content', [None, '', '{"source": 1', '[]'])
+    def test_load_skips_missing_or_damaged_file(self, tmp_path, content):
+        path = tmp_path / 'headers.json'
+        if content is not None:
+            path.write_text(content)
+        cache = HeaderCache()
+        assert cache.load(path) == 0
+        assert len(cache) == 0
+
+
+def test_header_parser_uses_cache():
+    cache = HeaderCache()
+    header = HeaderParser([HEADER, ['Unknown line']])
+    assert header.set_label(VARNAMES, UNITS, cache) == ('GDP', 'bln_rub')
+    assert header.is_parsed is False
+    assert len(cache) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
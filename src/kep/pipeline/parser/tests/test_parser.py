@@ -6,6 +6,7 @@ from kep.parsing_definition.units import UNITS
 from kep.pipeline.parser.extract_tables import Table, DataBlock, HeaderParser
 from kep.pipeline.parser.extract_tables import timestamp_quarter, timestamp_month, timestamp_annual
 from kep.pipeline.parser.row_splitter import split_row_by_year_and_qtr
+from kep.pipeline.parser.row_splitter import FUNC_MAPPER, emit_nones
 
 
 @pytest.fixture
@@ -125,6 +126,29 @@ class Test_DataBlock:
         values = list(datablock.extract_values())
         assert len(values) == 2
 
+    def test_extract_values_same_as_row_by_row_extraction(self):
+        datarows = [['1999'] + [str(x) for x in range(1, 18)],
+                    ['2000', '', '5,5', 'x', '7'] + ['1'] * 13,
+                    ['20012)', '4', '', '6'],
+                    ['2002', '4 5', '91)']]
+        def extract(values_func):
+            try:
+                return [d for d in values_func() if d['value'] is not None]
+            except (IndexError, ValueError) as e:
+                return type(e)
+        for splitter_func in set(FUNC_MAPPER.values()):
+            for rows in [datarows, datarows[1:], [datarows[0][:13]]]:
+                datablock = DataBlock(rows, 'GDP_bln_rub', splitter_func)
+                assert (extract(datablock.extract_values) 
+                        == extract(datablock._extract_values))
+
+    def test_extract_values_without_column_map_uses_splitter(self):
+        datablock = DataBlock(datarows=[['1999', '1', '2']],
+                              label='GDP_bln_rub',
+                              splitter_func = emit_nones)
+        with pytest.raises(ValueError):
+            list(datablock.extract_values())
+
 
 def test_timestamp_quarter():
     assert timestamp_quarter(1999, 1) == pd.Timestamp('1999-03-31')
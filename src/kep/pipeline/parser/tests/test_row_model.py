@@ -1,7 +1,10 @@
+import warnings
+
 import pytest
 from collections import OrderedDict as odict
 
-from kep.pipeline.parser.row_model import get_year, is_year, Row
+from kep.pipeline.parser.row_model import (get_year, is_year, normalize_header,
+                                           Row, as_row, make_rows)
 
 
 class Test_get_year():
@@ -120,6 +123,50 @@ class Test_Row_get_unit(Test_Row):
         assert Row(["1. abcd, % change"]).get_unit(unit_mapper) == "rog"
         assert Row(["1. abcd, % change"]).get_unit(unit_mapper) != "pct"
 
+    def test_finds_unit_in_hyphenated_header(self):
+        unit_mapper = {"непродовольственные товары": "rog"}
+        row = Row(['"непродовольст- венные  товары"'])
+        assert row.get_unit(unit_mapper) == "rog"
+
+    def test_get_unit_with_units_dictionary_warns_at_most_once(self):
+        from kep.parsing_definition.units import UNITS
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            for _ in range(3):
+                Row(["Объем ВВП, млрд.рублей"]).get_unit(UNITS)
+        assert len(caught) <= 1
+
+
+class Test_normalize_header:
+
+    def test_removes_apostrophes_and_repeated_whitespace(self):
+        assert normalize_header(' Объем  "ВВП"\n, млрд') == 'Объем ВВП , млрд'
+
+    def test_joins_hyphenation_break(self):
+        assert normalize_header('непродовольст- венные товары') == \
+            'непродовольственные товары'
+
+    def test_keeps_hyphen_between_words(self):
+        assert normalize_header('млрд. тонно-км') == 'млрд. тонно-км'
+        assert normalize_header('товары - всего') == 'товары - всего'
+
+
+class Test_as_row:
+
+    def test_returns_same_row(self):
+        row = Row(["1999", "1"])
+        assert as_row(row) is row
+
+    def test_on_list_returns_row_with_cached_attributes(self):
+        row = as_row(['"1999"', "1"])
+        assert row.cells == ['"1999"', "1"]
+        assert row.year == 1999
+        assert row.text == "1999"
+
+    def test_make_rows(self):
+        rows = make_rows([["a", "1"], ["1999", "1"]])
+        assert [row.is_datarow() for row in rows] == [False, True]
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -1,6 +1,9 @@
+import numpy as np
 import pytest
 
-from kep.pipeline.parser.to_float import to_float
+from kep.helper.path import DataFolderBase
+from kep.pipeline.parser.to_float import to_float, to_float_array
+from kep.pipeline.reader.popper import yield_csv_rows
 
 
 class Test_to_float:
@@ -26,3 +29,48 @@ class Test_to_float:
     def test_on_max_recursion_depth_throws_exception(self):
         with pytest.raises(ValueError):
             to_float("1.2,,,,,")
+
+
+class Test_to_float_array:
+    def test_on_block_same_as_to_float(self):
+        cells = [['5,6', '', '123,0 4561)'],
+                 ['…', '5,6', '97.1.']]
+        values, defined = to_float_array(cells)
+        for i, row in enumerate(cells):
+            for j, text in enumerate(row):
+                if to_float(text) is None:
+                    assert not defined[i, j]
+                else:
+                    assert defined[i, j]
+                    assert values[i, j] == to_float(text)
+
+    def test_on_blanks_returns_undefined(self):
+        values, defined = to_float_array(['', '1', ''])
+        assert list(defined) == [False, True, False]
+        assert values[1] == 1
+
+    def test_over_max_converted_texts_converts_anew(self, monkeypatch):
+        from kep.pipeline.parser import to_float as to_float_module
+        monkeypatch.setattr(to_float_module, 'MAX_CONVERTED', 2)
+        to_float_array(['1', '2'])
+        values, defined = to_float_array(['2', '3,5', 'x'])
+        assert list(defined) == [True, True, False]
+        assert list(values[:2]) == [2, 3.5]
+
+    def test_on_all_interim_csv_files_same_as_to_float(self):
+        paths = sorted(DataFolderBase().interim_folder.glob('*/*/tab.csv'))
+        if not paths:
+            pytest.skip('no interim CSV files')
+        for path in paths:
+            csv_text = path.read_text(encoding='utf-8')
+            cells = [x for row in yield_csv_rows(csv_text) for x in row]
+            values, defined = to_float_array(cells)
+            uniques = list(set(cells))
+            position = {text: i for i, text in enumerate(uniques)}
+            inverse = [position[text] for text in cells]
+            expected = [to_float(text) for text in uniques]
+            expected_defined = np.array([x is not None for x in expected])
+            expected_values = np.array([np.nan if x is None else x 
+                                        for x in expected])
+            assert (defined == expected_defined[inverse]).all(), path
+            np.testing.assert_array_equal(values, expected_values[inverse])
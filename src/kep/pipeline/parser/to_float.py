@@ -1,4 +1,7 @@
 import re
+import threading
+
+import numpy as np
 
 COMMENT_CATCHER = re.compile("\D*(\d+[.,]?\d*)\s*(?=\d\))")
 
@@ -33,3 +36,40 @@ def to_float(text: str, i=0):
         if text.endswith("."):  
             return to_float(text[:-1], i)
         return None
+
+
+# distinct cell texts to keep converted values for, interim CSV files
+# have about 25000 of them
+MAX_CONVERTED = 100000
+# float value by cell text, NaN where to_float() returns None
+_converted = {}
+_converted_lock = threading.Lock()
+
+
+def to_float_array(cells):
+    """Convert array of strings *cells* to float values.
+
+    Same as applying to_float() to every cell, except that cells
+    converted to NaN are not defined. Each distinct cell text is
+    converted once and kept for later calls, cells are then looked up
+    in one pass.
+
+    Returns:
+        values - float array of same shape as *cells*, NaN where
+                 conversion not successful
+        defined - boolean array, True where conversion successful
+    """
+    cells = np.asarray(cells, dtype=object)
+    flat = cells.ravel().tolist()
+    with _converted_lock:
+        new = set(flat).difference(_converted)
+        if len(_converted) + len(new) > MAX_CONVERTED:
+            _converted.clear()
+            new = set(flat)
+        for text in new:
+            value = to_float(text)
+            _converted[text] = np.nan if value is None else value
+        values = np.fromiter(map(_converted.__getitem__, flat),
+                             dtype=float, count=len(flat))
+    values = values.reshape(cells.shape)
+    return values, ~np.isnan(values)
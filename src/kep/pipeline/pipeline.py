@@ -3,24 +3,79 @@
     yield_parsing_assingments(...)
 
 """
-from kep.pipeline.parser.extract_tables import evaluate_assignment
-from kep.pipeline.reader.boundaries import get_boundaries
-from kep.pipeline.reader.popper import Popper
+from pathlib import PurePath
 
+from kep.helper.timing import stage
+from kep.pipeline.datapoints import Datapoints
+from kep.pipeline.parser.extract_tables import evaluate_assignment_columns
+from kep.pipeline.parser.row_model import make_rows
+from kep.pipeline.reader.popper import file_to_list, text_to_list
+from kep.pipeline.reader.segmenter import Segmenter, boundary_lines
 
-def yield_parsing_jobs(csv_text: str, definition_default, definitions_by_segment):
-    stack = Popper(csv_text)
-    for pdef in definitions_by_segment:
-        start, end = get_boundaries(pdef.boundaries, stack.rows)
-        yield stack.pop(start, end), pdef
-    yield stack.remaining_rows(), definition_default
 
+def read_rows(source):
+    """Valid CSV rows from *source*, CSV text or path to CSV file.
+       File is streamed by blocks, its text is not kept in memory.
+    """
+    if isinstance(source, PurePath):
+        return file_to_list(source)
+    return text_to_list(source)
 
-def create_parser(default_definition, other_definitions):
-    def _mapper(csv_text: str):
-        jobs = yield_parsing_jobs(csv_text, default_definition, other_definitions) 
+
+def yield_parsing_jobs(source, definition_default, definitions_by_segment):
+    rows = make_rows(read_rows(source))
+    with stage('segmentation') as counter:
+        stack = Segmenter(rows, boundary_lines(definitions_by_segment))
+        jobs = list(stack.jobs(definition_default, definitions_by_segment))
+        counter.rows = len(rows)
+    yield from jobs
+
+
+def evaluate_jobs(jobs, memo=None, executor=None):
+    """Yield evaluate_assignment_columns() results for (rows, definition)
+       *jobs* in order of *jobs*.
+
+       Args:
+           memo - kep.pipeline.memo.SegmentMemo() to reuse results of 
+                  segments parsed before, used when *executor* is None
+           executor - concurrent.futures thread or process pool executor
+                      to evaluate jobs concurrently, memo is not used
+    """
+    if executor is None:
+        evaluate = memo.evaluate if memo else evaluate_assignment_columns
         for data, definition in jobs:
-            for value in evaluate_assignment(data, definition):
-                yield value
-    return _mapper
+            yield evaluate(data, definition)
+    else:
+        rows, definitions = zip(*jobs)
+        yield from executor.map(evaluate_assignment_columns, rows,
+                                definitions)
 
+
+def extract_datapoints(source, default_definition, other_definitions,
+                       memo=None, executor=None):
+    datapoints = Datapoints()
+    jobs = yield_parsing_jobs(source, default_definition, other_definitions)
+    for result in evaluate_jobs(jobs, memo, executor):
+        for columns in result:
+            datapoints.add(*columns)
+    return datapoints
+
+
+def create_parser(default_definition, other_definitions, executor=None,
+                  memo=None):
+    """Return function that parses CSV text or CSV file at path to
+       Datapoints() buffer. Iterating over the buffer yields datapoint
+       dictionaries.
+
+       Args:
+           executor - concurrent.futures executor to evaluate segments 
+                      concurrently, segments are evaluated one by one
+                      if None
+           memo - kep.pipeline.memo.SegmentMemo() to reuse parsing 
+                  results of segments repeated across CSV texts, off 
+                  by default
+    """
+    def _mapper(source):
+        return extract_datapoints(source, default_definition, 
+                                  other_definitions, memo, executor)
+    return _mapper
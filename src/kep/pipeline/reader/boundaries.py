@@ -1,5 +1,5 @@
 from typing import List
-from kep.pipeline.parser.row_model import Row
+from kep.pipeline.parser.row_model import as_row
 
 class Boundary():
     def __init__(self, line, rows, name='boundary'):
@@ -13,17 +13,22 @@ class Boundary():
     @staticmethod
     def find(line: str, rows: List[str]):
         for row in rows:
-            if Row(row).startswith(line):
+            if as_row(row).startswith(line):
                 return True
         return False
 
     def __str__(self):
-        # FIXME: use %r
-        def shorten(string):
-            return f'<{string[:10]}...>'
+        return describe(self._name, self._line, self.is_found)
 
-        result = {True: 'found:  ', False: 'NOT found:'}[self.is_found]
-        return f'{self._name} line {result} {shorten(self._line)}'
+
+def describe(name: str, line: str, is_found: bool):
+    """Message about boundary *line* search result."""
+    # FIXME: use %r
+    def shorten(string):
+        return f'<{string[:10]}...>'
+
+    result = {True: 'found:  ', False: 'NOT found:'}[is_found]
+    return f'{name} line {result} {shorten(line)}'
 
 
 class Start(Boundary):
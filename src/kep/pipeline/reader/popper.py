@@ -2,14 +2,19 @@
 Read a text string with CSV data as list of lists with:
     text_to_list()
 
+Read CSV file rows one by one with:
+    stream_rows()
+
 Use Popper class as a stack to split CSV data.
 
 """
 
 import csv
 from io import StringIO
+import mmap
 
-from kep.pipeline.parser.row_model import Row
+from kep.helper.timing import timed
+from kep.pipeline.parser.row_model import as_row
 
 CSV_FORMAT = dict(delimiter="\t", lineterminator="\n")
 
@@ -44,9 +49,124 @@ def is_valid_row(row):
         return False
 
 
+def is_valid_name(x: str):
+    """Same as is_valid_row() for row with first element *x*."""
+    return x != '' and \
+        not x.startswith("___") and \
+        not 'В целях обеспечения статистической сопоставимости' in x
+
+
+# size of text blocks read from file, characters or bytes
+BLOCK_SIZE = 2 ** 18
+
+
+def split_block(block: str):
+    """Lines of *block* without line endings."""
+    lines = block.split('\n')
+    if lines[-1] == '':
+        lines.pop()
+    return lines
+
+
+def feed_lines(lines, k, blocks):
+    """Yield *lines* from position *k* with line endings, then append
+       lines from next *blocks* to *lines* and yield them as well."""
+    while True:
+        while k < len(lines):
+            yield lines[k] + '\n'
+            k += 1
+        block = next(blocks, None)
+        if block is None:
+            return
+        lines.extend(split_block(block))
+
+
+def is_quoted(line: str):
+    return '"' in line or '\r' in line
+
+
+def split_rows(lines, blocks, fmt=CSV_FORMAT):
+    """Return valid CSV rows from *lines* without line endings. Quoted
+       values with line breaks may take more lines from *blocks*.
+    """
+    rows = []
+    i = 0
+    while i < len(lines):
+        k = next((j for j in range(i, len(lines)) if is_quoted(lines[j])),
+                 len(lines))
+        rows.extend([line.split('\t') for line in lines[i:k]])
+        if k < len(lines):
+            reader = csv.reader(feed_lines(lines, k, blocks), **fmt)
+            rows.append(next(reader, []))
+            k += reader.line_num
+        i = k
+    return [row for row in rows if row and is_valid_name(row[0])]
+
+
+def tokenize(blocks, fmt=CSV_FORMAT):
+    """Yield valid CSV rows from *blocks*, iterable of strings that end
+       on line breaks, same as filter(is_valid_row, csv.reader(text)).
+
+       Lines without quote characters are split on tab, other lines are
+       read with csv.reader, which may consume following lines for
+       a quoted value with line breaks.
+    """
+    blocks = iter(blocks)
+    for block in blocks:
+        yield from split_rows(split_block(block), blocks, fmt)
+
+
+@timed('reading', count=len)
 def text_to_list(csv_text: str):
-    csv_rows = filter(is_valid_row, yield_csv_rows(csv_text))
-    return list(csv_rows)
+    return list(tokenize([csv_text]))
+
+
+def file_blocks(path):
+    """Yield text blocks of whole lines from file at *path*."""
+    with open(str(path), encoding='utf-8') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), ''):
+            # complete last line of block
+            yield block + f.readline()
+
+
+def mmap_blocks(path):
+    """Yield text blocks of whole lines from file at *path* read through
+       mmap, with line endings translated to '\\n' same as in
+       path.read_text().
+    """
+    with open(str(path), 'rb') as f:
+        if not f.seek(0, 2):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < len(mm):
+                end = mm.find(b'\n', start + BLOCK_SIZE) + 1 or len(mm)
+                block = mm[start:end].decode('utf-8')
+                if '\r' in block:
+                    block = block.replace('\r\n', '\n').replace('\r', '\n')
+                yield block
+                start = end
+
+
+def stream_rows(path, use_mmap: bool = False):
+    """Yield valid CSV rows from file at *path*, same as
+       text_to_list(path.read_text(encoding='utf-8')).
+
+       Args:
+           use_mmap - read file through mmap instead of file object
+    """
+    if use_mmap:
+        yield from tokenize(mmap_blocks(path))
+    else:
+        yield from tokenize(file_blocks(path))
+
+
+@timed('reading', count=len)
+def file_to_list(path):
+    """Valid CSV rows from file at *path*, read by blocks without loading
+       whole file text, same as text_to_list() on file text.
+    """
+    return list(stream_rows(path))
 
 
 class Popper:
@@ -72,7 +192,7 @@ class Popper:
 
     @staticmethod
     def startswith(row, text):
-        return Row(row).startswith(text)
+        return as_row(row).startswith(text)
 
     def pop(self, start, end):
         """Pops elements of *self.rows* between [start, end).
@@ -0,0 +1,118 @@
+"""Cut CSV rows into segments by start and end lines of parsing definitions.
+
+    Segmenter(rows, lines)
+
+Replaces repeated get_boundaries() and Popper.pop() calls: rows are indexed
+once by boundary lines they start with, segments are resolved against this
+index.
+"""
+from collections import defaultdict
+from typing import List
+
+from kep.pipeline.parser.row_model import as_row
+from kep.pipeline.reader.boundaries import describe
+
+
+def normalise(text: str):
+    # clean out apostrophe (") as in Row.startswith()
+    return text.replace('"', '')
+
+
+def boundary_lines(definitions):
+    """All start and end lines in *definitions*."""
+    return [line for pdef in definitions
+            for b in pdef.boundaries
+            for line in (b['start'], b['end'])]
+
+
+class PrefixIndex:
+    """Positions of rows that start with each of boundary *lines*."""
+
+    def __init__(self, rows: List[List[str]], lines: List[str]):
+        by_length = defaultdict(set)
+        for line in map(normalise, lines):
+            by_length[len(line)].add(line)
+        self.positions = defaultdict(list)
+        for i, row in enumerate(rows):
+            name = as_row(row).text
+            for length, group in by_length.items():
+                prefix = name[:length]
+                if prefix in group:
+                    self.positions[prefix].append(i)
+
+    def get(self, line: str):
+        return self.positions.get(normalise(line), [])
+
+
+class Segmenter:
+    """Stack of CSV rows with boundary line index.
+
+       Methods to extract segments of CSV file:
+          self.pop(start, end)
+          self.remaining_rows()
+          self.jobs(definition_default, definitions_by_segment)
+    """
+
+    def __init__(self, rows: List[List[str]], lines: List[str]):
+        self.rows = rows
+        self.index = PrefixIndex(rows, lines)
+        self.taken = [False] * len(rows)
+
+    def first(self, line: str):
+        """Position of first remaining row starting with *line* or None."""
+        for i in self.index.get(line):
+            if not self.taken[i]:
+                return i
+        return None
+
+    def get_boundaries(self, boundaries: List[dict]):
+        """Get start and end line, which is found in remaining rows.
+
+        Returns:
+            start, end - tuple of start and end strings
+        Raises:
+            ValueError: no start/end line pairs was found in remaining rows.
+        """
+        error_message = ['Start or end boundary not found:']
+        for m in boundaries:
+            start, end = m['start'], m['end']
+            start_found = self.first(start) is not None
+            end_found = self.first(end) is not None
+            if start_found and end_found:
+                return start, end
+            error_message.extend([describe('Start', start, start_found),
+                                  describe('End', end, end_found)])
+        raise ValueError('\n'.join(error_message))
+
+    def pop(self, start: str, end: str):
+        """Take remaining rows between *start* (inclusive) and
+           *end* (non-inclusive) lines, same as Popper.pop().
+        """
+        i = self.first(start)
+        if i is None:
+            return []
+        stop = self.first(end)
+        if stop is None:
+            stop = len(self.rows)
+        segment = []
+        for j in range(i, stop):
+            if not self.taken[j]:
+                segment.append(self.rows[j])
+                self.taken[j] = True
+        return segment
+
+    def remaining_rows(self):
+        """Take all rows that remain in the stack."""
+        remaining = [row for row, taken in zip(self.rows, self.taken)
+                     if not taken]
+        self.taken = [True] * len(self.rows)
+        return remaining
+
+    def jobs(self, definition_default, definitions_by_segment):
+        """Yield (rows, definition) tuples, default definition comes last
+           and gets all remaining rows.
+        """
+        for pdef in definitions_by_segment:
+            start, end = self.get_boundaries(pdef.boundaries)
+            yield self.pop(start, end), pdef
+        yield self.remaining_rows(), definition_default
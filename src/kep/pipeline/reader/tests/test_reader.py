@@ -1,6 +1,8 @@
 import pytest
 
-from kep.pipeline.reader.popper import is_valid_row, yield_csv_rows, text_to_list, Popper
+from kep.pipeline.reader import popper as reader
+from kep.pipeline.reader.popper import (is_valid_row, yield_csv_rows, text_to_list,
+                                        tokenize, stream_rows, Popper)
 
 DOC = """__________
 \t\t\t
@@ -42,6 +44,63 @@ def test_text_to_rows():
     assert text_to_list(DOC) == CLEAN_ROWS
 
 
+QUOTED_DOC = 'Объем ВВП\t"a\nb"\r\n1999\t4823\r\n"2000"\t7306\r\n'
+
+
+class Test_tokenize:
+
+    def test_on_quotes_and_crlf_line_endings(self):
+        text = QUOTED_DOC.replace('\r\n', '\n')
+        assert list(tokenize([text])) == [['Объем ВВП', 'a\nb'],
+                                          ['1999', '4823'],
+                                          ['2000', '7306']]
+
+    def test_quoted_value_spans_blocks(self):
+        text = QUOTED_DOC.replace('\r\n', '\n')
+        blocks = [line + '\n' for line in text.split('\n')[:-1]]
+        assert list(tokenize(blocks)) == text_to_list(text)
+
+    def test_on_empty_text(self):
+        assert list(tokenize([''])) == []
+
+
+class Test_stream_rows:
+
+    @pytest.fixture(params=[False, True], ids=['file', 'mmap'])
+    def use_mmap(self, request):
+        return request.param
+
+    def test_same_as_text_to_list(self, tmp_path, use_mmap):
+        path = tmp_path / 'tab.csv'
+        path.write_text(DOC, encoding='utf-8')
+        assert list(stream_rows(path, use_mmap)) == CLEAN_ROWS
+
+    def test_on_quotes_and_crlf_line_endings(self, tmp_path, use_mmap):
+        path = tmp_path / 'tab.csv'
+        path.write_bytes(QUOTED_DOC.encode('utf-8'))
+        assert list(stream_rows(path, use_mmap)) == [['Объем ВВП', 'a\nb'],
+                                                     ['1999', '4823'],
+                                                     ['2000', '7306']]
+
+    def test_quoted_value_spans_blocks(self, tmp_path, use_mmap, monkeypatch):
+        monkeypatch.setattr(reader, 'BLOCK_SIZE', 1)
+        path = tmp_path / 'tab.csv'
+        path.write_bytes(QUOTED_DOC.encode('utf-8'))
+        expected = text_to_list(path.read_text(encoding='utf-8'))
+        assert list(stream_rows(path, use_mmap)) == expected
+
+    def test_on_empty_file(self, tmp_path, use_mmap):
+        path = tmp_path / 'tab.csv'
+        path.write_text('', encoding='utf-8')
+        assert list(stream_rows(path, use_mmap)) == []
+
+
+def test_text_to_list_same_as_csv_reader():
+    text = QUOTED_DOC + DOC
+    assert text_to_list(text) == list(filter(is_valid_row,
+                                             yield_csv_rows(text)))
+
+
 # Test Popper class
 def mock_rows():
     yield ["apt extra text", "1", "2"]
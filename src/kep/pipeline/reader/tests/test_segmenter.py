@@ -0,0 +1,86 @@
+from collections import namedtuple
+
+import pytest
+
+from kep.pipeline.reader.boundaries import get_boundaries
+from kep.pipeline.reader.popper import Popper
+from kep.pipeline.reader.segmenter import PrefixIndex, Segmenter, boundary_lines
+
+Definition = namedtuple('Definition', 'boundaries')
+
+
+def mock_rows():
+    return [["apt extra text", "1", "2"],
+            ["bat aa...ah", "1", "2"],
+            ['can "extra" text', "1", "2"],
+            ["dot oo...eh", "1", "2"],
+            ["bat again", "1", "2"],
+            ["wed more text", "1", "2"],
+            ["zed some text"]]
+
+
+def make_segmenter(lines=("apt", "bat", "can", "dot", "wed", "zed")):
+    return Segmenter(mock_rows(), list(lines))
+
+
+def make_popper():
+    csv_text = '\n'.join(['\t'.join(row) for row in mock_rows()])
+    return Popper(csv_text)
+
+
+class Test_PrefixIndex:
+    def test_finds_all_positions_ignoring_apostrophe(self):
+        index = PrefixIndex(mock_rows(), ['bat', 'can extra', 'zzz'])
+        assert index.get('bat') == [1, 4]
+        assert index.get('"can" extra') == [2]
+        assert index.get('zzz') == []
+
+
+class Test_Segmenter:
+
+    @pytest.mark.parametrize("pairs", [
+        [("bat", "dot")],
+        [("apt", "wed")],
+        [("bat", "dot"), ("apt", "wed")],
+        [("dot", "bat")],
+        [("bat", "dot"), ("bat", "zed")],
+        [("can", "can")],
+    ])
+    def test_pop_and_remaining_rows_are_same_as_in_popper(self, pairs):
+        popper, segmenter = make_popper(), make_segmenter()
+        for start, end in pairs:
+            assert segmenter.pop(start, end) == popper.pop(start, end)
+        assert segmenter.remaining_rows() == popper.remaining_rows()
+
+    def test_pop_on_missing_start_returns_empty_list(self):
+        segmenter = make_segmenter()
+        assert segmenter.pop("xxx", "dot") == []
+        assert len(segmenter.remaining_rows()) == 7
+
+    def test_get_boundaries_returns_first_matched_pair(self):
+        boundaries = [dict(start='apt', end='xxx'),
+                      dict(start='bat', end='wed')]
+        segmenter = make_segmenter(["apt", "xxx", "bat", "wed"])
+        assert segmenter.get_boundaries(boundaries) == ('bat', 'wed')
+
+    def test_get_boundaries_error_message_same_as_in_get_boundaries(self):
+        boundaries = [dict(start='apt', end='xxx'),
+                      dict(start='yyy', end='wed')]
+        segmenter = make_segmenter(["apt", "xxx", "yyy", "wed"])
+        with pytest.raises(ValueError) as e1:
+            segmenter.get_boundaries(boundaries)
+        with pytest.raises(ValueError) as e2:
+            get_boundaries(boundaries, mock_rows())
+        assert str(e1.value) == str(e2.value)
+
+    def test_jobs_take_segments_and_leave_remaining_rows_to_default(self):
+        definitions = [Definition([dict(start='bat', end='dot')]),
+                       Definition([dict(start='dot', end='wed')])]
+        segmenter = make_segmenter(boundary_lines(definitions))
+        jobs = list(segmenter.jobs('default', definitions))
+        assert [len(rows) for rows, _ in jobs] == [2, 2, 3]
+        assert jobs[-1][1] == 'default'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from kep.pipeline.dataframe import create_dataframe
+from kep.pipeline.datapoints import Datapoints
+from kep.pipeline.parser.extract_tables import split_to_tables
+from kep.pipeline.reader.popper import text_to_list
+
+DOC = """Объем ВВП, млрд.рублей / Gross domestic product, bln rubles
+1999	4823	901	1102	1373	1447
+2000	7306	1527	1697	2038	2044
+Индекс / Index
+1999	101	102	103	104	105
+1999	99	98	97	96	95"""
+
+
+def make_datapoints():
+    datapoints = Datapoints()
+    for table, label in zip(split_to_tables(text_to_list(DOC)),
+                            ['GDP_bln_rub', 'INDEX_rog']):
+        table.set_splitter(None)
+        datapoints.add(label, *table.columns)
+    return datapoints
+
+
+def make_dicts():
+    dicts = []
+    for table, varname in zip(split_to_tables(text_to_list(DOC)),
+                              ['GDP', 'INDEX']):
+        table.set_splitter(None)
+        table.varname = varname
+        table.unit = 'bln_rub' if varname == 'GDP' else 'rog'
+        dicts.extend(table.values)
+    return dicts
+
+
+class Test_Datapoints:
+
+    def test_iter_yields_same_dicts_as_table_values(self):
+        assert list(make_datapoints()) == make_dicts()
+
+    def test_len_and_labels(self):
+        datapoints = make_datapoints()
+        assert len(datapoints) == 20
+        assert datapoints.labels == ['GDP_bln_rub', 'INDEX_rog']
+
+    def test_on_empty_buffer_yields_nothing(self):
+        datapoints = Datapoints()
+        assert len(datapoints) == 0
+        assert list(datapoints) == []
+
+
+class Test_create_dataframe:
+
+    @pytest.mark.parametrize("freq", ['a', 'q', 'm'])
+    def test_on_buffer_same_as_on_dicts(self, freq):
+        df1 = create_dataframe(make_datapoints(), freq)
+        df2 = create_dataframe(make_dicts(), freq)
+        pd.testing.assert_frame_equal(df1, df2)
+
+    def test_on_buffer_first_value_wins(self):
+        dfa = create_dataframe(make_datapoints(), 'a')
+        assert dfa.loc['1999-12-31', 'INDEX_rog'] == 101
+        assert dfa.loc['2000-12-31', 'GDP_bln_rub'] == 7306
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
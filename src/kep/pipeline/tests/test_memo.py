@@ -0,0 +1,84 @@
+import pytest
+
+from kep.parsing_definition import make_parsing_definition
+from kep.pipeline.memo import SegmentMemo, rows_hash, segment_name
+from kep.pipeline.parser.extract_tables import evaluate_assignment_columns
+from kep.pipeline.pipeline import create_parser
+from kep.pipeline.reader.popper import text_to_list
+
+DOC = """Объем ВВП, млрд.рублей / Gross domestic product, bln rubles
+1999	4823	901	1102	1373	1447
+2000	7306	1527	1697	2038	2044"""
+
+PDEF = make_parsing_definition(dict(var='GDP', header='Объем ВВП',
+                                    unit='bln_rub'))
+
+
+def assert_same_columns(result, expected):
+    assert len(result) == len(expected)
+    for (label1, *arrays1), (label2, *arrays2) in zip(result, expected):
+        assert label1 == label2
+        for a, b in zip(arrays1, arrays2):
+            assert a.tolist() == b.tolist()
+
+
+class Test_SegmentMemo:
+
+    def test_evaluate_same_as_evaluate_assignment_columns(self):
+        rows = text_to_list(DOC)
+        result = SegmentMemo().evaluate(rows, PDEF)
+        assert_same_columns(result, evaluate_assignment_columns(rows, PDEF))
+
+    def test_on_same_rows_counts_hit(self):
+        memo = SegmentMemo()
+        memo.evaluate(text_to_list(DOC), PDEF)
+        memo.evaluate(text_to_list(DOC), PDEF)
+        assert memo.hits['default'] == 1
+        assert memo.misses['default'] == 1
+
+    def test_on_changed_rows_counts_miss(self):
+        memo = SegmentMemo()
+        memo.evaluate(text_to_list(DOC), PDEF)
+        memo.evaluate(text_to_list(DOC.replace('4823', '4824')), PDEF)
+        assert memo.misses['default'] == 2
+
+    def test_on_changed_definition_counts_miss(self):
+        memo = SegmentMemo()
+        pdef = make_parsing_definition(dict(var='GDP', header='Объем ВВП',
+                                            unit='bln_rub'),
+                                       boundaries=[dict(start='Объем ВВП',
+                                                        end='Инвестиции')])
+        memo.evaluate(text_to_list(DOC), PDEF)
+        memo.evaluate(text_to_list(DOC), pdef)
+        assert memo.misses['default'] == 1
+        assert memo.misses['Объем ВВП'] == 1
+
+    def test_drops_least_recently_used_over_maxsize(self):
+        memo = SegmentMemo(maxsize=1)
+        memo.evaluate(text_to_list(DOC), PDEF)
+        memo.evaluate(text_to_list(DOC.replace('4823', '4824')), PDEF)
+        assert len(memo.results) == 1
+
+    def test_report_has_totals(self):
+        memo = SegmentMemo()
+        memo.evaluate(text_to_list(DOC), PDEF)
+        assert memo.report().splitlines()[-1].split() == ['Total', '0', '1']
+
+
+def test_create_parser_reuses_segments_with_memo():
+    memo = SegmentMemo()
+    parser = create_parser(PDEF, [], memo=memo)
+    assert list(parser(DOC)) == list(parser(DOC))
+    assert (memo.misses['default'], memo.hits['default']) == (1, 1)
+
+
+def test_rows_hash_depends_on_row_boundaries():
+    assert rows_hash([['a', 'b']]) != rows_hash([['a'], ['b']])
+
+
+def test_segment_name_on_default_definition():
+    assert segment_name(PDEF) == 'default'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
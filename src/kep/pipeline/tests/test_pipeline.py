@@ -0,0 +1,45 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from kep.parsing_definition import make_parsing_definition
+from kep.pipeline.pipeline import create_parser, yield_parsing_jobs
+
+DOC = """Индекс физического объема произведенного ВВП, в %
+1999	106,4	98,1	103,1	111,4	112,0
+2000	110,0	111,4	110,2	111,5	109,2
+Объем ВВП, млрд.рублей / Gross domestic product, bln rubles
+1999	4823	901	1102	1373	1447
+2000	7306	1527	1697	2038	2044"""
+
+DEFAULT = make_parsing_definition(dict(var='GDP', header='Объем ВВП',
+                                       unit='bln_rub'))
+SEGMENTS = [make_parsing_definition(
+    dict(var='GDP', header='Индекс физического объема', unit='yoy'),
+    boundaries=[dict(start='Индекс физического объема',
+                     end='Объем ВВП')])]
+
+
+def test_yield_parsing_jobs_cuts_segment_and_default_jobs():
+    jobs = list(yield_parsing_jobs(DOC, DEFAULT, SEGMENTS))
+    assert [len(rows) for rows, _ in jobs] == [3, 3]
+
+
+def test_create_parser_on_file_path_same_as_on_text(tmp_path):
+    path = tmp_path / 'tab.csv'
+    path.write_text(DOC, encoding='utf-8')
+    parser = create_parser(DEFAULT, SEGMENTS)
+    assert list(parser(path)) == list(parser(DOC))
+
+
+@pytest.mark.parametrize('pool', [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_create_parser_with_executor_same_as_serial(pool):
+    expected = list(create_parser(DEFAULT, SEGMENTS)(DOC))
+    with pool(2) as executor:
+        result = list(create_parser(DEFAULT, SEGMENTS, executor)(DOC))
+    assert result == expected
+    assert len(result) == 20
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,221 @@
+"""Poll Rosstat web site for next KEP publication and process it.
+
+   KEP for month x is published at end of month x+1 or start of month
+   x+2 (see kep.helper.date.Date). Poller waits for archive of month
+   after latest processed one:
+
+       poller = ReleasePoller(interval=3600, jitter=0.1)
+       poller.run()       # poll until stopped
+       poller.check()     # poll once
+
+   A poll is one HEAD request. When the archive is found, it is
+   downloaded, converted, parsed, validated and saved by
+   process_release(). Latest processed month, time of last poll and
+   last error are kept in a JSON state file.
+"""
+from datetime import date, datetime
+import json
+from pathlib import Path
+import random
+import time
+
+import requests
+
+from kep.download import RemoteFile, word2csv
+from kep.download.download import Manifest, make_session, make_url
+from kep.helper.path import (DataFolderBase, InterimCSV, LocalRarFile,
+                             ProcessedCSV, atomic_write)
+from kep.revisions import processed_vintages
+from kep.vintage import Vintage
+
+INTERVAL = 3600
+JITTER = 0.1
+# longest sleep before release window starts
+MAX_DELAY = 24 * 3600
+TIMEOUT = 30
+# release window is from this day of month x+1 to this day of month x+2
+WINDOW_START_DAY = 20
+WINDOW_END_DAY = 10
+
+
+def next_month(year: int, month: int):
+    return (year, month + 1) if month < 12 else (year + 1, 1)
+
+
+def release_window(year: int, month: int):
+    """Dates of first and last day of expected release of KEP for *year*
+       and *month*."""
+    year1, month1 = next_month(year, month)
+    year2, month2 = next_month(year1, month1)
+    return (date(year1, month1, WINDOW_START_DAY),
+            date(year2, month2, WINDOW_END_DAY))
+
+
+def process_release(year: int, month: int, manifest=None):
+    """Download, convert, parse, validate and save KEP for *year* and
+       *month*, add it to store of all vintages (see kep.revisions).
+       Steps after download are skipped if archive is same as before and
+       processed files exist.
+
+       Download is recorded in *manifest*, defaults to one in cache folder.
+    """
+    remote = RemoteFile(year, month)
+    changed = remote.download(manifest)
+    if not changed and InterimCSV(year, month).exists() \
+       and ProcessedCSV(year, month).path('m').exists():
+        print('Archive not changed, nothing to update')
+        return
+    remote.unrar()
+    # convert Word files to interim csv file again if archive changed
+    word2csv(year, month, force=changed)
+    vintage = Vintage(year, month)
+    vintage.validate()
+    vintage.save()
+
+
+def error_message(year: int, month: int, error):
+    return '{}-{:02d}: {!r}'.format(year, month, error)
+
+
+class PollerState:
+    """Latest processed month, time of last poll and last error kept in
+       JSON file at *path*."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.latest, self.checked, self.error = None, None, None
+        if self.path.exists():
+            state = json.loads(self.path.read_text(encoding='utf-8'))
+            self.latest = tuple(state['latest']) if state['latest'] else None
+            self.checked, self.error = state['checked'], state['error']
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self.path, 'w', encoding='utf-8') as f:
+            json.dump(dict(latest=self.latest, checked=self.checked,
+                           error=self.error), f)
+
+
+class ReleasePoller:
+    """Poll for KEP archive of month after latest processed one.
+
+       Args:
+           state_path - JSON state file, defaults to
+                        *data/cache/poller.json*
+           latest - latest processed (year, month), defaults to one in
+                    state file or latest folder in *data/processed*,
+                    required if there is neither
+           interval - seconds between polls in release window
+           jitter - share of *interval* added or subtracted at random,
+                    so that polls from many hosts do not come together
+           pipeline - function of year, month and *manifest* to call when
+                      archive is found, process_release() by default
+           url - function of year and month that returns archive URL
+           manifest - Manifest() of downloaded files, for conditional
+                      requests and downloads by *pipeline*
+           clock, sleep - functions for current time and waiting
+    """
+
+    def __init__(self, state_path=None, latest=None,
+                 interval: float = INTERVAL, jitter: float = JITTER,
+                 pipeline=process_release, url=make_url, manifest=None,
+                 session=None, clock=datetime.now, sleep=time.sleep):
+        state_path = state_path or \
+            DataFolderBase().cache_folder / 'poller.json'
+        self.state = PollerState(state_path)
+        if latest:
+            self.state.latest = tuple(latest)
+        if self.state.latest is None:
+            dates = processed_vintages()
+            if not dates:
+                raise ValueError("No processed vintages found, pass "
+                                 "latest=(year, month) to ReleasePoller")
+            self.state.latest = dates[-1]
+        self.interval, self.jitter = interval, jitter
+        self.pipeline, self.url = pipeline, url
+        self.manifest = manifest or Manifest()
+        self.session = session or make_session(1)
+        self.clock, self.sleep = clock, sleep
+
+    @property
+    def expected(self):
+        """(year, month) of next publication."""
+        return next_month(*self.state.latest)
+
+    def is_published(self, year: int, month: int):
+        """Check with HEAD request if archive is on web site. A request
+           for archive downloaded before is conditional."""
+        url = self.url(year, month)
+        path = LocalRarFile(year, month).path
+        headers = self.manifest.conditions(url, path) or {}
+        r = self.session.head(url, headers=headers, timeout=TIMEOUT,
+                              allow_redirects=True)
+        if r.status_code in (200, 304):
+            return True
+        if r.status_code == 404:
+            return False
+        r.raise_for_status()
+        return False
+
+    def check(self):
+        """Poll once, process archive if it is published.
+
+           Returns:
+               (year, month) of processed archive or None
+        """
+        year, month = self.expected
+        self.state.checked = self.clock().isoformat(timespec='seconds')
+        self.state.error = None
+        try:
+            found = self.is_published(year, month)
+        except (requests.RequestException, OSError, ValueError) as e:
+            # ValueError is raised for date not supported by
+            # kep.helper.date.Date
+            self.state.error = error_message(year, month, e)
+            found = False
+        if found:
+            try:
+                self.pipeline(year, month, manifest=self.manifest)
+            except Exception as e:
+                # any download, conversion or parsing error is kept in
+                # state file, same month is processed on next poll
+                self.state.error = error_message(year, month, e)
+                found = False
+        if found:
+            self.state.latest = (year, month)
+        self.state.save()
+        return (year, month) if found else None
+
+    def delay(self):
+        """Seconds to wait before next poll. Before release window of
+           expected publication it is time until window starts, but not
+           more than MAX_DELAY.
+        """
+        now = self.clock()
+        start, _ = release_window(*self.expected)
+        start = datetime.combine(start, datetime.min.time())
+        if now < start:
+            return min((start - now).total_seconds(), MAX_DELAY)
+        spread = self.interval * self.jitter
+        return max(0.0, self.interval + random.uniform(-spread, spread))
+
+    def run(self, max_polls: int = None):
+        """Poll until stopped or *max_polls* polls are done. An error is
+           printed once while it repeats on consecutive polls.
+           Returns list of processed (year, month) tuples."""
+        processed = []
+        polls = 0
+        printed_error = None
+        while max_polls is None or polls < max_polls:
+            result = self.check()
+            polls += 1
+            if result:
+                processed.append(result)
+                # next publication can also be out already
+                continue
+            if self.state.error and self.state.error != printed_error:
+                print(self.state.error)
+            printed_error = self.state.error
+            if max_polls is None or polls < max_polls:
+                self.sleep(self.delay())
+        return processed
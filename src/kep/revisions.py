@@ -0,0 +1,168 @@
+"""Store of all processed vintages for revision analysis.
+
+   Values from *data/processed/YYYY/MM/df{a,q,m}.csv* files are kept in
+   one SQLite database keyed by (label, freq, date, vintage):
+
+       store = RevisionStore()
+       store.update()      # read new or changed vintages
+       df = store.triangle('GDP_yoy', 'q')
+       s = store.history('GDP_yoy', 'q', '2015-03-31')
+
+   A triangle has a row for each date and a column for each vintage,
+   a vintage is release month like '2018-04'. Vintage.save() adds the
+   saved vintage to default store, batch.reparse() adds all saved
+   vintages once after the batch.
+"""
+from pathlib import Path
+import sqlite3
+
+import pandas as pd
+
+from kep import FREQUENCIES
+from kep.helper.path import DataFolderBase, ProcessedCSV, md
+from kep.sidecar import file_hash, read_dataframe
+
+# columns of processed dataframes that are not variables
+TIME_COLUMNS = ['year', 'qtr', 'month']
+
+# seconds to wait for database locked by other process
+TIMEOUT = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    vintage TEXT NOT NULL,
+    freq TEXT NOT NULL,
+    csv_hash TEXT NOT NULL,
+    PRIMARY KEY (vintage, freq)
+);
+CREATE TABLE IF NOT EXISTS observations (
+    label TEXT NOT NULL,
+    freq TEXT NOT NULL,
+    date TEXT NOT NULL,
+    vintage TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (label, freq, date, vintage)
+) WITHOUT ROWID;
+"""
+
+
+def vintage_name(year: int, month: int):
+    return '{}-{:02d}'.format(year, month)
+
+
+def processed_vintages(data_folder=None):
+    """Return (year, month) of vintages in processed folder."""
+    folder = DataFolderBase(data_folder).processed_folder
+    dates = []
+    for path in folder.glob('[0-9][0-9][0-9][0-9]/[0-9][0-9]'):
+        if path.is_dir():
+            dates.append((int(path.parent.name), int(path.name)))
+    return sorted(dates)
+
+
+def observations(df, freq: str, vintage: str):
+    """Yield (label, freq, date, vintage, value) rows of *df* without
+       missing values."""
+    df = df.drop(columns=[c for c in TIME_COLUMNS if c in df.columns])
+    dates = df.index.strftime('%Y-%m-%d')
+    for label in df.columns:
+        column = df[label]
+        mask = column.notna().values
+        for date, value in zip(dates[mask], column.values[mask].tolist()):
+            yield label, freq, date, vintage, value
+
+
+class RevisionStore:
+    """Values of all vintages in SQLite database at *path*. Writes wait up
+       to *timeout* seconds while database is locked by other process."""
+
+    def __init__(self, path=None, data_folder=None, timeout: float = TIMEOUT):
+        folders = DataFolderBase(data_folder)
+        self.data_folder = data_folder
+        self.path = Path(path or folders.cache_folder / 'revisions.sqlite')
+        md(self.path.parent)
+        self.connection = sqlite3.connect(str(self.path), timeout=timeout)
+        self.connection.executescript(SCHEMA)
+
+    def csv_path(self, year: int, month: int, freq: str):
+        folder = DataFolderBase(self.data_folder).processed_folder
+        filename = ProcessedCSV.make_filename(freq)
+        return folder / str(year) / str(month).zfill(2) / filename
+
+    def stored_hash(self, vintage: str, freq: str):
+        row = self.connection.execute(
+            "SELECT csv_hash FROM files WHERE vintage = ? AND freq = ?",
+            (vintage, freq)).fetchone()
+        return row[0] if row else None
+
+    def ingest(self, year: int, month: int):
+        """Read vintage for *year* and *month* if its files are new or
+           changed. Returns number of files read.
+        """
+        vintage = vintage_name(year, month)
+        count = 0
+        for freq in FREQUENCIES:
+            path = self.csv_path(year, month, freq)
+            if not path.exists():
+                continue
+            csv_hash = file_hash(path)
+            if self.stored_hash(vintage, freq) == csv_hash:
+                continue
+            df = read_dataframe(path)
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM observations WHERE vintage = ? AND freq = ?",
+                    (vintage, freq))
+                self.connection.executemany(
+                    "INSERT INTO observations VALUES (?, ?, ?, ?, ?)",
+                    observations(df, freq, vintage))
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?)",
+                    (vintage, freq, csv_hash))
+            count += 1
+        return count
+
+    def update(self):
+        """Read all new or changed vintages. Returns number of files read."""
+        return sum(self.ingest(year, month)
+                   for year, month in processed_vintages(self.data_folder))
+
+    def vintages(self):
+        rows = self.connection.execute(
+            "SELECT DISTINCT vintage FROM files ORDER BY vintage")
+        return [vintage for vintage, in rows]
+
+    def labels(self, freq: str):
+        rows = self.connection.execute(
+            "SELECT DISTINCT label FROM observations WHERE freq = ? "
+            "ORDER BY label", (freq,))
+        return [label for label, in rows]
+
+    def triangle(self, label: str, freq: str, start=None, end=None):
+        """Return dataframe of *label* values with a row for each date and
+           a column for each vintage, NaN where vintage has no value.
+           Dates can be limited by *start* and *end*, like '2015-03-31'.
+        """
+        query = ("SELECT date, vintage, value FROM observations "
+                 "WHERE label = ? AND freq = ? AND date >= ? AND date <= ?")
+        rows = self.connection.execute(
+            query, (label, freq, start or '', end or '9999')).fetchall()
+        df = pd.DataFrame(rows, columns=['date', 'vintage', 'value'])
+        df = df.pivot(index='date', columns='vintage', values='value')
+        df.index = pd.to_datetime(df.index, format='%Y-%m-%d')
+        df.columns.name = None
+        return df
+
+    def history(self, label: str, freq: str, date: str):
+        """Return series of *label* value for *date* by vintage."""
+        rows = self.connection.execute(
+            "SELECT vintage, value FROM observations "
+            "WHERE label = ? AND freq = ? AND date = ? ORDER BY vintage",
+            (label, freq, date)).fetchall()
+        return pd.Series(dict(rows), name=label, dtype=float)
+
+    def close(self):
+        self.connection.close()
+
+    def __repr__(self):
+        return "RevisionStore({!r})".format(str(self.path))
@@ -0,0 +1,153 @@
+"""Binary sidecar files for processed dataframes.
+
+   Vintage.save() writes *dfa.csv* and next to it *dfa.npz* with same
+   data, values rounded as in the CSV file. CSV file remains the published
+   result, the sidecar keeps its size, modification time and hash and is
+   used only while they match. The hash is checked only if size is same
+   and modification time differs, for example for a copied CSV file:
+
+       save_sidecar(df, csv_path)
+       df = read_dataframe(csv_path)
+
+"""
+import csv
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from kep.helper.path import atomic_write
+
+# same formats as used in CSV files
+FLOAT_FORMAT = '%.2f'
+DATE_FORMAT = '%Y-%m-%d'
+
+
+def sidecar_path(csv_path):
+    return Path(csv_path).with_suffix('.npz')
+
+
+def file_hash(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def file_stat(path):
+    """Size and modification time of file at *path*, nanoseconds."""
+    stat = os.stat(str(path))
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+def round_as_text(values, float_format: str = FLOAT_FORMAT):
+    """Float *values* as read back from text written with *float_format*.
+
+    >>> round_as_text(np.array([1524.3999999999996, np.nan])).tolist()
+    [1524.4, nan]
+    """
+    if not values.size:
+        return values.astype(float)
+    return np.char.mod(float_format, values).astype(float)
+
+
+def save_sidecar(df, csv_path, float_format: str = FLOAT_FORMAT):
+    """Write *df* to sidecar of CSV file at *csv_path*. CSV file must be
+       written already.
+    """
+    is_float = np.array([dtype.kind == 'f' for dtype in df.dtypes],
+                        dtype=bool)
+    float_columns = df.columns[is_float]
+    int_columns = df.columns[~is_float]
+    # arrays are stored by column, so that a column is contiguous
+    floats = round_as_text(df[float_columns].values.astype(float).T,
+                           float_format)
+    ints = df[int_columns].values.astype(np.int64).T
+    path = sidecar_path(csv_path)
+    with atomic_write(path) as f:
+        np.savez(f,
+                 csv_hash=np.array(file_hash(csv_path)),
+                 csv_stat=file_stat(csv_path),
+                 index=df.index.values.astype('datetime64[ns]'),
+                 columns=np.array(df.columns, dtype=str),
+                 float_columns=np.array(float_columns, dtype=str),
+                 floats=floats,
+                 int_columns=np.array(int_columns, dtype=str),
+                 ints=ints)
+    return path
+
+
+def is_fresh(arrays, csv_path):
+    """Return True if sidecar *arrays* were saved for current content of
+       CSV file at *csv_path*."""
+    size, mtime = file_stat(csv_path)
+    saved_size, saved_mtime = arrays['csv_stat']
+    if size != saved_size:
+        return False
+    if mtime == saved_mtime:
+        return True
+    return str(arrays['csv_hash']) == file_hash(csv_path)
+
+
+def load_sidecar(csv_path, labels=None):
+    """Return dataframe from sidecar of CSV file at *csv_path* or None if
+       sidecar is missing or CSV file changed after sidecar was written.
+       Only *labels* columns found in sidecar are returned if *labels* 
+       are given.
+    """
+    path = sidecar_path(csv_path)
+    try:
+        with np.load(str(path)) as npz:
+            arrays = {key: npz[key] for key in npz.files}
+        if not is_fresh(arrays, csv_path):
+            return None
+    except (OSError, ValueError, KeyError):
+        return None
+    columns = arrays['columns'].tolist()
+    float_columns = arrays['float_columns'].tolist()
+    int_columns = arrays['int_columns'].tolist()
+    floats, ints = arrays['floats'], arrays['ints']
+    if labels is not None:
+        labels = set(labels)
+        columns = [name for name in columns if name in labels]
+        floats = floats[[i for i, name in enumerate(float_columns)
+                         if name in labels]]
+        ints = ints[[i for i, name in enumerate(int_columns)
+                     if name in labels]]
+        float_columns = [name for name in float_columns if name in labels]
+        int_columns = [name for name in int_columns if name in labels]
+    # float block is used without copy, integer columns are inserted
+    # at their positions
+    df = pd.DataFrame(floats.T,
+                      index=pd.DatetimeIndex(arrays['index']),
+                      columns=float_columns,
+                      copy=False)
+    positions = [columns.index(name) for name in int_columns]
+    for position, name, values in sorted(zip(positions, int_columns, ints)):
+        df.insert(position, name, values)
+    return df
+
+
+def read_csv(csv_path, labels=None):
+    """Read dataframe from CSV file written by Vintage.save(), only 
+       *labels* columns found in file if *labels* are given."""
+    usecols = None
+    if labels is not None:
+        with open(str(csv_path), encoding='utf-8') as f:
+            header = next(csv.reader(f), [''])
+        labels = set(labels)
+        usecols = [0] + [i for i, name in enumerate(header)
+                         if i and name in labels]
+    df = pd.read_csv(str(csv_path), index_col=0, usecols=usecols)
+    # one vectorised parse instead of pd.to_datetime() for each cell
+    df.index = pd.to_datetime(df.index, format=DATE_FORMAT)
+    return df
+
+
+def read_dataframe(csv_path, labels=None):
+    """Read dataframe from sidecar of *csv_path* if it is fresh, from CSV
+       file otherwise. Only *labels* columns are read if *labels* are 
+       given."""
+    df = load_sidecar(csv_path, labels)
+    if df is None:
+        df = read_csv(csv_path, labels)
+    return df
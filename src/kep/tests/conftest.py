@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def df():
+    """Monthly dataframe as saved by Vintage.save(), with values that are
+       rounded in CSV file."""
+    index = pd.date_range('2016-11-30', periods=4, freq='M')
+    return pd.DataFrame({'year': [2016, 2016, 2017, 2017],
+                         'month': [11, 12, 1, 2],
+                         'CPI_rog': [100.4, 100.4, 100.6, 100.1999999999996],
+                         'GDP_bln_rub': [np.nan, 1.005, 2.0, 3.0]},
+                        index=index)
+
+
+@pytest.fixture
+def csv_path(tmp_path, df):
+    """*df* saved to dfm.csv in temporary folder."""
+    path = tmp_path / 'dfm.csv'
+    df.to_csv(path, float_format='%.2f')
+    return path
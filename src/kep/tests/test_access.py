@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from kep.access import DataframeCache, locate, select
+
+
+class Test_DataframeCache:
+
+    def test_second_get_is_hit(self, csv_path):
+        cache = DataframeCache()
+        assert cache.get(csv_path) is cache.get(csv_path)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_on_changed_file_reads_again(self, csv_path, df):
+        cache = DataframeCache()
+        cache.get(csv_path)
+        df.iloc[0, 2] = 99.0
+        df.to_csv(csv_path, float_format='%.2f')
+        stat = csv_path.stat()
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert cache.get(csv_path).iloc[0, 2] == 99.0
+        assert cache.misses == 2
+
+    def test_drops_least_recently_used(self, csv_path, tmp_path, df):
+        other_path = tmp_path / 'dfq.csv'
+        df.to_csv(other_path)
+        cache = DataframeCache(maxsize=1)
+        cache.get(csv_path)
+        cache.get(other_path)
+        assert list(cache.frames) == [other_path]
+
+    def test_on_labels_reads_only_labels(self, csv_path):
+        cache = DataframeCache()
+        df = cache.get(csv_path, ['CPI_rog'])
+        assert df.columns.tolist() == ['CPI_rog']
+        assert cache.get(csv_path, ['CPI_rog']) is df
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_on_other_labels_keeps_columns_read_before(self, csv_path):
+        cache = DataframeCache()
+        cache.get(csv_path, ['CPI_rog'])
+        df = cache.get(csv_path, ['month'])
+        assert df.columns.tolist() == ['month', 'CPI_rog']
+        assert cache.get(csv_path, ['CPI_rog']) is df
+        assert cache.misses == 2
+
+    def test_get_all_columns_after_labels_reads_again(self, csv_path):
+        cache = DataframeCache()
+        cache.get(csv_path, ['CPI_rog'])
+        assert len(cache.get(csv_path).columns) == 4
+        assert cache.get(csv_path, ['month']) is cache.get(csv_path)
+        assert cache.misses == 2
+
+
+class Test_select:
+
+    def test_labels_and_dates(self, df):
+        result = select(df, labels=['CPI_rog'], start='2016-12', end='2017-01')
+        assert result.columns.tolist() == ['CPI_rog']
+        assert result.CPI_rog.tolist() == [100.4, 100.6]
+
+    def test_returns_copy(self, df):
+        select(df).iloc[0, 2] = 0
+        assert df.iloc[0, 2] == 100.4
+
+    def test_on_unknown_label_raises_key_error(self, df):
+        with pytest.raises(KeyError):
+            select(df, labels=['CPI_rog', 'NOT_A_LABEL'])
+
+
+def test_locate():
+    assert locate('m').name == 'dfm.csv'
+    assert locate('a', 2018, 4).parts[-3:] == ('2018', '04', 'dfa.csv')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,73 @@
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+import kep
+from kep.batch import reparse, process, largest_first, Summary, Result
+from kep.cache import ParseCache
+from kep.parsing_definition.checkpoints import ValidationError
+from kep.vintage import Vintage
+
+
+class Test_reparse:
+
+    def test_without_saving_returns_summary_by_date(self):
+        summary = reparse(dates=[(2017, 10), (2009, 4)], max_workers=2,
+                          save=False)
+        assert [(r.year, r.month) for r in summary.results] == \
+            [(2009, 4), (2017, 10)]
+        assert [r.status for r in summary.results] == ['error', 'ok']
+        assert 'Missed labels' in summary.errors[0].message
+
+    def test_workers_use_given_cache(self, tmp_path):
+        cache = ParseCache(tmp_path)
+        reparse(dates=[(2017, 10)], max_workers=1, save=False, cache=cache)
+        assert len(cache.entries()) == 1
+
+
+def test_worker_import_does_not_parse_yaml():
+    # workers started by spawn import kep.batch anew
+    statement = ("import sys, kep.batch; "
+                 "print('yaml' in sys.modules)")
+    output = subprocess.run([sys.executable, '-c', statement], check=True,
+                            cwd=str(Path(kep.__file__).parents[1]),
+                            stdout=subprocess.PIPE, universal_newlines=True)
+    assert output.stdout.strip() == 'False'
+
+
+class Test_process:
+
+    def test_on_validation_error_returns_invalid_status(self, monkeypatch):
+        def fail(self):
+            raise ValidationError('Required values not found')
+        monkeypatch.setattr(Vintage, 'validate', fail)
+        result = process(2017, 10, save=False)
+        assert result.status == 'invalid'
+        assert result.message == 'Required values not found'
+
+    def test_with_timings_returns_time_by_stage(self):
+        result = process(2017, 10, save=False, timings=True)
+        assert result.timings['validation']['calls'] == 1
+        assert Summary([result]).timings() == result.timings
+
+    def test_on_missing_file_returns_error_status(self):
+        result = process(2000, 1, save=False)
+        assert result.status == 'error'
+
+
+def test_largest_first_puts_missing_files_last():
+    dates = largest_first([(2000, 1), (2009, 4), (2017, 10)])
+    assert dates[-1] == (2000, 1)
+
+
+def test_summary_str_lists_failures():
+    summary = Summary([Result(2017, 10, 'ok', '', 1.0, ''),
+                       Result(2009, 4, 'error', 'ValueError()', 1.0, '')])
+    assert str(summary).startswith('Vintages: 2, ok: 1, invalid: 0, errors: 1')
+    assert '2009-04 error: ValueError()' in str(summary)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,121 @@
+import pytest
+
+from kep.cache import ParseCache, fingerprint, parser_source
+from kep.helper.timing import collect
+from kep.parsing_definition import (DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT,
+                                    make_parsing_definition)
+
+DEFINITIONS = (DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT)
+
+DOC = """Объем ВВП, млрд.рублей / Gross domestic product, bln rubles
+1999	4823	901	1102	1373	1447
+2000	7306	1527	1697	2038	2044"""
+
+GDP_DEFINITIONS = (make_parsing_definition(dict(var='GDP',
+                                                header='Объем ВВП',
+                                                unit='bln_rub')),
+                   [])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(tmp_path)
+
+
+class Test_ParseCache:
+
+    def test_second_parse_is_read_from_cache(self, cache):
+        first = cache.parse(DOC, GDP_DEFINITIONS)
+        second = cache.parse(DOC, GDP_DEFINITIONS)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert list(first) == list(second)
+        assert len(second) == 10
+
+    def test_file_path_has_same_key_as_its_text(self, cache, tmp_path):
+        path = tmp_path / 'tab.csv'
+        path.write_text(DOC, encoding='utf-8')
+        assert cache.key(path, GDP_DEFINITIONS) == cache.key(DOC,
+                                                             GDP_DEFINITIONS)
+        first = cache.parse(path, GDP_DEFINITIONS)
+        second = cache.parse(DOC, GDP_DEFINITIONS)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert list(first) == list(second)
+
+    def test_on_changed_file_parses_again(self, cache, tmp_path):
+        path = tmp_path / 'tab.csv'
+        path.write_text(DOC, encoding='utf-8')
+        cache.parse(path, GDP_DEFINITIONS)
+        path.write_text(DOC.replace('4823', '4824'), encoding='utf-8')
+        assert len(cache.parse(path, GDP_DEFINITIONS)) == 10
+        assert cache.misses == 2
+
+    def test_timings_show_cache_stage(self, cache):
+        with collect() as timings:
+            cache.parse(DOC, GDP_DEFINITIONS)
+        assert {'cache', 'reading', 'segmentation'} <= set(timings.stages)
+        with collect() as timings:
+            cache.parse(DOC, GDP_DEFINITIONS)
+        assert list(timings.stages) == ['cache']
+        assert timings.report()['cache']['rows'] == 10
+
+    def test_on_changed_text_parses_again(self, cache):
+        cache.parse(DOC, GDP_DEFINITIONS)
+        cache.parse(DOC.replace('4823', '4824'), GDP_DEFINITIONS)
+        assert cache.misses == 2
+        assert len(cache.entries()) == 2
+
+    def test_evict_keeps_cache_under_size_limit(self, cache):
+        cache.parse(DOC, GDP_DEFINITIONS)
+        cache.max_bytes = cache.size()
+        cache.parse(DOC.replace('4823', '4824'), GDP_DEFINITIONS)
+        assert len(cache.entries()) == 1
+        assert cache.size() <= cache.max_bytes
+
+    def test_evict_skips_entries_deleted_by_other_process(self, cache,
+                                                          monkeypatch):
+        cache.parse(DOC, GDP_DEFINITIONS)
+        cache.parse(DOC.replace('4823', '4824'), GDP_DEFINITIONS)
+        stats = cache.stats()
+        # other process deletes all entries after they are listed
+        for path in cache.entries():
+            path.unlink()
+        monkeypatch.setattr(cache, 'stats', lambda: stats)
+        cache.max_bytes = 0
+        cache.evict()
+        assert list(cache.folder.glob('*.npz')) == []
+
+    def test_truncated_entry_is_deleted_and_parsed_again(self, cache):
+        cache.parse(DOC, GDP_DEFINITIONS)
+        path, = cache.entries()
+        path.write_bytes(path.read_bytes()[:100])
+        assert len(cache.parse(DOC, GDP_DEFINITIONS)) == 10
+        assert cache.misses == 2
+        assert cache.parse(DOC, GDP_DEFINITIONS) is not None
+        assert cache.hits == 1
+
+    def test_purge_deletes_all_entries(self, cache):
+        cache.parse(DOC, GDP_DEFINITIONS)
+        cache.purge()
+        assert cache.entries() == []
+
+
+class Test_fingerprint:
+
+    def test_is_same_for_same_definitions(self):
+        assert fingerprint(DEFINITIONS) == fingerprint(DEFINITIONS)
+
+    def test_changes_with_definitions(self):
+        assert fingerprint(DEFINITIONS) != fingerprint(GDP_DEFINITIONS)
+
+    def test_changes_with_units(self):
+        units = {'млрд.рублей': 'bln_rub'}
+        assert fingerprint(DEFINITIONS) != fingerprint(DEFINITIONS, units)
+
+    def test_covers_header_and_unit_matching_code(self):
+        source = parser_source()
+        assert 'class UnitMatcher' in source
+        assert 'def make_label' in source
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
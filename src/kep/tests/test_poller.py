@@ -0,0 +1,146 @@
+"""ReleasePoller tested against local HTTP server, see kep/conftest.py."""
+from datetime import date, datetime
+import json
+
+import pytest
+
+from kep import poller as poller_module
+from kep.download.download import Manifest
+from kep.poller import ReleasePoller, next_month, release_window
+
+
+@pytest.fixture
+def make_poller(server, tmp_path):
+    processed = []
+
+    def process(year, month, manifest):
+        processed.append((year, month))
+
+    def make(pipeline=None, **kwargs):
+        def url(year, month):
+            return '{}/{}/ind{:02d}.rar'.format(server.url, year, month)
+        kwargs.setdefault('latest', (2018, 4))
+        poller = ReleasePoller(state_path=tmp_path / 'poller.json',
+                               pipeline=pipeline or process,
+                               url=url,
+                               manifest=Manifest(tmp_path / 'manifest.json'),
+                               clock=lambda: datetime(2018, 6, 1),
+                               **kwargs)
+        poller.processed = processed
+        return poller
+    return make
+
+
+class Test_ReleasePoller:
+
+    def test_check_before_publication(self, server, make_poller):
+        poller = make_poller()
+        assert poller.check() is None
+        assert poller.processed == []
+        assert server.log == [('/2018/ind05.rar', None)]
+
+    def test_check_processes_published_archive(self, server, make_poller,
+                                               tmp_path):
+        server.files['/2018/ind05.rar'] = b'rar'
+        poller = make_poller()
+        assert poller.check() == (2018, 5)
+        assert poller.processed == [(2018, 5)]
+        assert poller.expected == (2018, 6)
+        state = json.loads((tmp_path / 'poller.json').read_text())
+        assert state['latest'] == [2018, 5]
+        assert state['checked'] == '2018-06-01T00:00:00'
+
+    def test_state_is_read_from_file(self, server, make_poller):
+        server.files['/2018/ind05.rar'] = b'rar'
+        make_poller().check()
+        assert make_poller(latest=None).expected == (2018, 6)
+
+    @pytest.mark.parametrize('error', [Exception('MS Word not found'),
+                                       KeyError('GDP_yoy'),
+                                       AssertionError('Missed labels')])
+    def test_on_pipeline_error_keeps_latest(self, server, make_poller,
+                                            tmp_path, error):
+        def fail(year, month, manifest):
+            raise error
+        server.files['/2018/ind05.rar'] = b'rar'
+        poller = make_poller(pipeline=fail)
+        assert poller.check() is None
+        assert poller.expected == (2018, 5)
+        assert repr(error) in poller.state.error
+        state = json.loads((tmp_path / 'poller.json').read_text())
+        assert state['error'] == poller.state.error
+
+    def test_run_continues_after_pipeline_error(self, server, make_poller):
+        errors = [Exception('MS Word not found')]
+
+        def fail_once(year, month, manifest):
+            if errors:
+                raise errors.pop()
+        server.files['/2018/ind05.rar'] = b'rar'
+        poller = make_poller(pipeline=fail_once, sleep=lambda _: None)
+        assert poller.run(max_polls=3) == [(2018, 5)]
+
+    def test_run_prints_repeated_error_once(self, server, make_poller,
+                                            capsys):
+        disk_full, no_word = Exception('Disk full'), Exception('MS Word')
+        errors = [disk_full] * 3 + [no_word]
+
+        def fail(year, month, manifest):
+            raise errors.pop()
+        server.files['/2018/ind05.rar'] = b'rar'
+        poller = make_poller(pipeline=fail, sleep=lambda _: None)
+        assert poller.run(max_polls=4) == []
+        assert capsys.readouterr().out.splitlines() == [
+            '2018-05: ' + repr(no_word), '2018-05: ' + repr(disk_full)]
+
+    def test_process_release_downloads_with_poller_manifest(
+            self, server, make_poller, monkeypatch, tmp_path):
+        manifests = []
+
+        class RemoteFile:
+            def __init__(self, year, month):
+                pass
+
+            def download(self, manifest=None):
+                manifests.append(manifest)
+                raise OSError('Disk full')
+        monkeypatch.setattr(poller_module, 'RemoteFile', RemoteFile)
+        server.files['/2018/ind05.rar'] = b'rar'
+        poller = make_poller(pipeline=poller_module.process_release)
+        assert poller.check() is None
+        assert manifests == [poller.manifest]
+        assert poller.manifest.path == tmp_path / 'manifest.json'
+
+    def test_without_processed_vintages_requires_latest(self, make_poller,
+                                                        monkeypatch):
+        monkeypatch.setattr(poller_module, 'processed_vintages', lambda: [])
+        with pytest.raises(ValueError, match='latest='):
+            make_poller(latest=None)
+
+    def test_run_processes_all_published_and_sleeps(self, server,
+                                                    make_poller):
+        server.files.update({'/2018/ind05.rar': b'rar',
+                             '/2018/ind06.rar': b'rar'})
+        delays = []
+        poller = make_poller(interval=100, jitter=0.1, sleep=delays.append)
+        assert poller.run(max_polls=4) == [(2018, 5), (2018, 6)]
+        # window for 2018-07 starts on 2018-08-20
+        assert delays == [24 * 3600]
+
+    def test_delay_in_release_window_has_jitter(self, make_poller):
+        poller = make_poller(interval=100, jitter=0.1)
+        poller.clock = lambda: datetime(2018, 6, 25)
+        assert all(90 <= poller.delay() <= 110 for _ in range(20))
+
+
+def test_release_window():
+    assert release_window(2018, 11) == (date(2018, 12, 20),
+                                        date(2019, 1, 10))
+
+
+def test_next_month():
+    assert next_month(2018, 12) == (2019, 1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
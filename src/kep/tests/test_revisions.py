@@ -0,0 +1,85 @@
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kep.revisions import RevisionStore, processed_vintages
+
+
+def write_vintage(data_folder, year, month, values):
+    folder = data_folder / 'processed' / str(year) / str(month).zfill(2)
+    folder.mkdir(parents=True)
+    index = pd.date_range('2015-03-31', periods=len(values), freq='Q')
+    df = pd.DataFrame({'year': index.year,
+                       'qtr': index.quarter,
+                       'GDP_yoy': values},
+                      index=index)
+    df.to_csv(folder / 'dfq.csv', float_format='%.2f')
+
+
+@pytest.fixture
+def store(tmp_path):
+    write_vintage(tmp_path, 2015, 6, [100.5])
+    write_vintage(tmp_path, 2015, 9, [100.7, 101.0])
+    store = RevisionStore(tmp_path / 'revisions.sqlite', data_folder=tmp_path)
+    store.update()
+    yield store
+    store.close()
+
+
+class Test_RevisionStore:
+
+    def test_processed_vintages(self, tmp_path, store):
+        assert processed_vintages(tmp_path) == [(2015, 6), (2015, 9)]
+        assert store.vintages() == ['2015-06', '2015-09']
+
+    def test_triangle(self, store):
+        df = store.triangle('GDP_yoy', 'q')
+        assert df.columns.tolist() == ['2015-06', '2015-09']
+        assert df.index.tolist() == [pd.Timestamp('2015-03-31'),
+                                     pd.Timestamp('2015-06-30')]
+        assert df['2015-09'].tolist() == [100.7, 101.0]
+        assert np.isnan(df.loc['2015-06-30', '2015-06'])
+
+    def test_history(self, store):
+        s = store.history('GDP_yoy', 'q', '2015-03-31')
+        assert s.to_dict() == {'2015-06': 100.5, '2015-09': 100.7}
+
+    def test_update_reads_only_new_or_changed_files(self, tmp_path, store):
+        assert store.update() == 0
+        write_vintage(tmp_path, 2015, 12, [100.8, 101.0, 101.2])
+        assert store.update() == 1
+        assert store.history('GDP_yoy', 'q', '2015-03-31').tolist() == \
+            [100.5, 100.7, 100.8]
+
+    def test_ingest_replaces_changed_vintage(self, tmp_path, store):
+        path = tmp_path / 'processed' / '2015' / '06' / 'dfq.csv'
+        path.write_text(path.read_text().replace('100.5', '99.9'))
+        assert store.ingest(2015, 6) == 1
+        assert store.history('GDP_yoy', 'q', '2015-03-31')['2015-06'] == 99.9
+
+    def test_ingest_waits_for_lock_of_other_process(self, tmp_path, store):
+        write_vintage(tmp_path, 2015, 12, [100.8, 101.0, 101.2])
+        locked = threading.Event()
+
+        def hold_lock():
+            # other connection holds write lock for a while
+            connection = sqlite3.connect(str(store.path))
+            connection.execute("BEGIN IMMEDIATE")
+            locked.set()
+            time.sleep(0.2)
+            connection.rollback()
+            connection.close()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        locked.wait()
+        assert store.ingest(2015, 12) == 1
+        thread.join()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
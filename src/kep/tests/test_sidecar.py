@@ -0,0 +1,64 @@
+import os
+
+import pandas as pd
+import pytest
+
+from kep import sidecar
+from kep.sidecar import (load_sidecar, read_csv, read_dataframe,
+                         save_sidecar, sidecar_path)
+
+
+class Test_sidecar:
+
+    def test_load_sidecar_same_as_read_csv(self, df, csv_path):
+        save_sidecar(df, csv_path)
+        pd.testing.assert_frame_equal(load_sidecar(csv_path),
+                                      read_csv(csv_path),
+                                      check_exact=True, check_freq=False)
+
+    def test_on_changed_csv_returns_none(self, df, csv_path):
+        save_sidecar(df, csv_path)
+        df.iloc[0, 2] = 0
+        df.to_csv(csv_path, float_format='%.2f')
+        assert load_sidecar(csv_path) is None
+
+    def test_on_same_size_and_mtime_does_not_hash_csv(self, df, csv_path,
+                                                      monkeypatch):
+        save_sidecar(df, csv_path)
+        monkeypatch.setattr(sidecar, 'file_hash', None)
+        assert load_sidecar(csv_path) is not None
+
+    def test_on_changed_mtime_compares_hash(self, df, csv_path):
+        save_sidecar(df, csv_path)
+        stat = os.stat(str(csv_path))
+        os.utime(str(csv_path), ns=(stat.st_atime_ns,
+                                    stat.st_mtime_ns + 10**9))
+        assert load_sidecar(csv_path) is not None
+        content = csv_path.read_bytes()
+        csv_path.write_bytes(content.replace(b'100.40', b'100.41'))
+        assert load_sidecar(csv_path) is None
+
+    def test_on_missing_sidecar_returns_none(self, csv_path):
+        assert not sidecar_path(csv_path).exists()
+        assert load_sidecar(csv_path) is None
+
+    def test_read_dataframe_falls_back_to_csv(self, df, csv_path):
+        save_sidecar(df, csv_path)
+        sidecar_path(csv_path).write_bytes(b'broken')
+        assert read_dataframe(csv_path).columns.tolist() == \
+            ['year', 'month', 'CPI_rog', 'GDP_bln_rub']
+
+    @pytest.mark.parametrize('labels', [['GDP_bln_rub', 'month'],
+                                        ['CPI_rog', 'NOT_A_LABEL'], []])
+    def test_labels_read_same_columns_from_sidecar_and_csv(self, df, csv_path,
+                                                           labels):
+        save_sidecar(df, csv_path)
+        expected = read_csv(csv_path)[[c for c in df.columns if c in labels]]
+        pd.testing.assert_frame_equal(load_sidecar(csv_path, labels),
+                                      expected, check_freq=False)
+        pd.testing.assert_frame_equal(read_csv(csv_path, labels), expected,
+                                      check_freq=False)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
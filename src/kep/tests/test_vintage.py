@@ -4,6 +4,10 @@ import tempfile
 from pathlib import Path
 
 from kep import FREQUENCIES
+from kep import vintage as vintage_module
+from kep.cache import ParseCache
+from kep.helper.path import ProcessedCSV
+from kep.pipeline.parser.extract_tables import HEADER_CACHE
 from kep.vintage import Vintage
 
 
@@ -31,6 +35,42 @@ class Test_Vintage:
             if f.exists():
                 f.unlink()
 
+
+def test_header_resolutions_are_kept_in_cache_folder(monkeypatch, tmp_path):
+    monkeypatch.setattr(vintage_module, 'PARSE_CACHE', ParseCache(tmp_path))
+    HEADER_CACHE.clear()
+    Vintage(2017, 10)
+    assert (tmp_path / vintage_module.HEADERS_FILENAME).exists()
+    count = len(HEADER_CACHE)
+    HEADER_CACHE.clear()
+    Vintage(2017, 10)
+    assert len(HEADER_CACHE) == count > 0
+
+
+@pytest.mark.parametrize('kwargs, ingested', [({}, [(2017, 10)]),
+                                              ({'revisions': False}, [])])
+def test_save_adds_vintage_to_revision_store(monkeypatch, tmp_path, kwargs,
+                                             ingested):
+    stores = []
+
+    class RevisionStore:
+        def __init__(self):
+            self.ingested = []
+            stores.append(self)
+
+        def ingest(self, year, month):
+            self.ingested.append((year, month))
+
+        def close(self):
+            pass
+    monkeypatch.setattr(vintage_module, 'RevisionStore', RevisionStore)
+    monkeypatch.setattr(vintage_module, 'ProcessedCSV',
+                        lambda year, month: ProcessedCSV(year, month,
+                                                         tmp_path))
+    Vintage(2017, 10).save(**kwargs)
+    assert [x for store in stores for x in store.ingested] == ingested
+    assert (tmp_path / 'processed' / '2017' / '10' / 'dfm.csv').exists()
+
 #EP: Latest removed in code
 
 #class Test_Latest:
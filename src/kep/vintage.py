@@ -8,23 +8,74 @@ Dataflow:
 
 """
 
+from kep.cache import ParseCache
+from kep.helper.timing import collect
 from kep.helper.path import InterimCSV, ProcessedCSV, copy_to_latest
 from kep.pipeline import create_parser, create_dataframe
+from kep.pipeline.parser.extract_tables import HEADER_CACHE
+from kep.revisions import RevisionStore
+from kep.sidecar import FLOAT_FORMAT, save_sidecar
 from kep.parsing_definition import (DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT, 
                                     verify)
 
+PARSE_CACHE = ParseCache()
+# header line resolutions file in PARSE_CACHE folder
+HEADERS_FILENAME = 'headers.json'
+
+
 class Vintage:
-    def __init__(self, year: int, month: int):
+    def __init__(self, year: int, month: int, definitions=None,
+                 use_cache: bool = True, timings: bool = False):
+        """
+        Args:
+            definitions - (definition_default, definitions_by_segment)
+                          tuple, defaults to DEFINITION_DEFAULT and 
+                          DEFINITIONS_BY_SEGMENT
+            use_cache - read parsing result from PARSE_CACHE if CSV file 
+                        and definitions did not change since last parse,
+                        keep header line resolutions in PARSE_CACHE folder
+            timings - record time by parsing stage to .timings, see
+                      kep.helper.timing, result read from PARSE_CACHE
+                      is recorded as 'cache' stage
+        """
         self.year, self.month = year, month
+        self.definitions = definitions or (DEFINITION_DEFAULT, 
+                                           DEFINITIONS_BY_SEGMENT)
+        self.use_cache = use_cache
+        self.timings = None
+        if timings:
+            with collect() as self.timings:
+                self._parse()
+        else:
+            self._parse()
+
+    def _parse(self):
         self.values = self._values()     
         self.dfs = self._dataframes(self.values)
         self.validate()
         
     def _values(self):    
-        csv_text = InterimCSV(self.year, self.month).text()
-        parser = create_parser(DEFINITION_DEFAULT, DEFINITIONS_BY_SEGMENT)
-        return list(parser(csv_text))
+        """Return Datapoints() buffer, iterating it yields dictionaries."""
+        # rows are streamed from file, CSV text is not read as whole
+        path = InterimCSV(self.year, self.month).path
+        if self.use_cache:
+            return self._cached_values(path)
+        parser = create_parser(*self.definitions)
+        return parser(path)
     
+    def _cached_values(self, path):
+        """Parse *path* through PARSE_CACHE. Header line resolutions are
+           read from cache folder once per process and written back when
+           new header lines were resolved.
+        """
+        headers_path = PARSE_CACHE.folder / HEADERS_FILENAME
+        if not len(HEADER_CACHE):
+            HEADER_CACHE.load(headers_path)
+        values = PARSE_CACHE.parse(path, self.definitions)
+        if HEADER_CACHE.changed:
+            HEADER_CACHE.save(headers_path)
+        return values
+
     @staticmethod
     def _dataframes(values):
         dfs = {}
@@ -32,7 +83,13 @@ class Vintage:
             dfs[freq] = create_dataframe(values, freq) 
         return dfs
 
-    def save(self):
+    def save(self, revisions: bool = True):
+        """Write dataframes to processed CSV files and their sidecars.
+
+           Args:
+               revisions - also add this vintage to store of all
+                           vintages, see kep.revisions
+        """
         csv_processed = ProcessedCSV(self.year, self.month)
         for freq, df in self.dfs.items():
             path = csv_processed.path(freq)
@@ -42,12 +99,17 @@ class Vintage:
             # WONTFIX: the risk is loss of data for exchange rate, 
             #          may need fomatter by column. annual values can be
             #          a guidance for a number of decimal positions.
-            df.to_csv(path, float_format='%.2f')
+            df.to_csv(path, float_format=FLOAT_FORMAT)
             print("Saved dataframe to", path)
+            save_sidecar(df, path)
+        if revisions:
+            store = RevisionStore()
+            store.ingest(self.year, self.month)
+            store.close()
             
     def validate(self):
         print('Started validation...')
-        verify(**self.dfs) 
+        self.report = verify(**self.dfs)
         print('All required checkpoints found in dataset, validation passed') 
             
     def to_latest(self):
@@ -1,26 +1,22 @@
 """Run full cycle of data processing from download to saving dataframe."""
 
-from kep.download import RemoteFile, word2csv
-from kep.vintage import Vintage
+import sys
 
+from kep.poller import ReleasePoller, process_release
 
-def run(year, month): # pragma: no cover
-    #download and unpack
-    remote = RemoteFile(year, month)
-    remote.download()
-    remote.unrar()
-
-    # convert Word files to interim csv files
-    word2csv(year, month)
 
-    # parse interim csv, validate, save to processed foolder
-    vint = Vintage(year, month)
-    vint.validate()
-    vint.save()
+def run(year, month): # pragma: no cover
+    """Download, convert, parse, validate and save KEP for *year* and
+       *month*, skip steps after download if archive did not change."""
+    process_release(year, month)
 
 if __name__ == '__main__':
-    # next call:
-    run(2018, 5)
+    # python manage.py 2018 5 - process given month
+    # python manage.py        - wait for next publications and process them
+    if len(sys.argv) == 3:
+        run(int(sys.argv[1]), int(sys.argv[2]))
+    else:
+        ReleasePoller().run()
 
 # Workflow
 # --------    
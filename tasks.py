@@ -130,6 +130,49 @@ def add(ctx, year, month):
         manage.run(year, month)
 
 
+@task
+def bench(ctx, only='', output=''):
+    """Run benchmarks on interim CSV files, save results to JSON"""
+    args = ['run']
+    for name in filter(None, only.split(',')):
+        args.extend(['--only', name])
+    if output:
+        args.extend(['--output', output])
+    with PathContext():
+        from benchmarks import suite
+        suite.main(args)
+
+
+@task
+def bench_compare(ctx, old, new, threshold=0.1):
+    """Compare two benchmark runs, fail on regression above threshold"""
+    with PathContext():
+        from benchmarks import suite
+        code = suite.main(['compare', old, new,
+                           '--threshold', str(threshold)])
+    if code:
+        sys.exit(code)
+
+
+@task
+def purge_cache(ctx):
+    """Delete cached parsing results in data/cache"""
+    with PathContext():
+        from kep.cache import ParseCache
+        cache = ParseCache()
+        print("Deleting", len(cache.entries()), "files in", cache.folder)
+        cache.purge()
+
+
+@task
+def snapshot(ctx):
+    """Save parsed YAML parameters to kep/parsing_definition/definitions.json"""
+    with PathContext():
+        from kep.parsing_definition import snapshot
+        snapshot.rebuild()
+        print("Saved", snapshot.SNAPSHOT_PATH)
+
+
 class PathContext():    
     path=str(Path(__file__).parent / 'src')
     
@@ -149,7 +192,8 @@ for t in [ls, clean,
           test, cov,
           doc, rst,
           find,
-          add]:
+          add, purge_cache, snapshot,
+          bench, bench_compare]:
     ns.add_task(t)
 
 